@@ -0,0 +1,3 @@
+from ml.backfill import core
+
+__all__ = ["core"]
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+import os
+from pathlib import Path
+
+from pydantic_settings import BaseSettings
+
+from ml import config, logging
+from ml.hate_classification import core as hate_classification
+from ml.hate_llm_labeling import core as hate_llm_labeling
+from ml.ingest_dcinside import core as ingest_dcinside
+from ml.json.partition import is_complete
+from ml.upload_hf_dataset import core as upload_hf_dataset
+from ml.utils.dates import date_range, yesterday
+
+logger = logging.get_logger("backfill")
+
+STAGES = ["ingest", "clean", "classify", "label", "upload"]
+
+
+class Settings(BaseSettings):
+    START_DATE: str = ""
+    END_DATE: str = ""
+    STAGES: list[str] = STAGES
+    FORCE: bool = False
+    # Dates processed at once; each stage is further bounded by its own limit below
+    MAX_PARALLEL_DATES: int = 4
+    # Crawling shares the gallery rate limit, so dates are ingested one at a time by default
+    INGEST_CONCURRENCY: int = 1
+    CLASSIFY_CONCURRENCY: int = max(1, (os.cpu_count() or 1) // 4)
+    LABEL_CONCURRENCY: int = 2
+    UPLOAD_CONCURRENCY: int = 1
+
+
+class Backfill:
+    """Run pipeline stages over a date range, dates in parallel, stages in order per date.
+
+    Stage settings and the classifier are created once, so the model stays loaded across dates.
+    A stage is skipped when its output partition manifest already marks it complete.
+    """
+
+    def __init__(self, settings: Settings):
+        self._settings = settings
+        self._global = config.get_settings()
+        self._ingest = ingest_dcinside.Settings()
+        self._classification = hate_classification.Settings()
+        self._labeling = hate_llm_labeling.Settings()
+        self._upload = upload_hf_dataset.Settings()
+        self._dates = asyncio.Semaphore(settings.MAX_PARALLEL_DATES)
+        self._limits = {
+            "ingest": asyncio.Semaphore(settings.INGEST_CONCURRENCY),
+            "clean": asyncio.Semaphore(settings.MAX_PARALLEL_DATES),
+            "classify": asyncio.Semaphore(settings.CLASSIFY_CONCURRENCY),
+            "label": asyncio.Semaphore(settings.LABEL_CONCURRENCY),
+            "upload": asyncio.Semaphore(settings.UPLOAD_CONCURRENCY),
+        }
+
+    def is_done(self, stage: str, today: str) -> bool:
+        raw = Path(self._ingest.RAW_DIR) / f"dt={today}"
+        clean = Path(self._ingest.CLEAN_DIR) / f"dt={today}"
+        classified = Path(self._classification.CLASSIFIED_DIR) / f"dt={today}"
+        labeled = Path(self._labeling.LABELED_DIR) / f"dt={today}"
+        if stage == "ingest":
+            # A complete clean partition implies ingest ran, also for dates crawled before raw
+            # partitions were marked; a failed clean alone does not crawl the date again
+            return is_complete(raw) or is_complete(clean)
+        if stage == "clean":
+            return is_complete(clean)
+        if stage == "classify":
+            return is_complete(classified)
+        if stage == "label":
+            return is_complete(labeled)
+        return is_complete(labeled, "uploaded")
+
+    async def run_stage(self, stage: str, today: str) -> None:
+        if stage == "ingest":
+            await ingest_dcinside.collect_raw(self._global.crawl_galleries, today, self._ingest)
+        elif stage == "clean":
+            await ingest_dcinside.clean_data(today, self._ingest)
+        elif stage == "classify":
+            # Torch releases the GIL during inference, so the shared model serves several dates
+            await asyncio.to_thread(hate_classification.classify_data, today, self._classification)
+        elif stage == "label":
+            await hate_llm_labeling.label_data(today, self._global, self._labeling)
+        elif stage == "upload":
+            await upload_hf_dataset.upload_data(today, self._global, self._upload)
+
+    async def run_date(self, today: str) -> None:
+        async with self._dates:
+            for stage in STAGES:
+                if stage not in self._settings.STAGES:
+                    continue
+                if not self._settings.FORCE and self.is_done(stage, today):
+                    logger.info("[%s] %s: already complete, skipping", today, stage)
+                    continue
+                async with self._limits[stage]:
+                    logger.info("[%s] %s: started", today, stage)
+                    await self.run_stage(stage, today)
+                    logger.info("[%s] %s: finished", today, stage)
+
+    async def run(self, dates: list[str]) -> None:
+        if "classify" in self._settings.STAGES:
+            from ml.classifier.core import Classifier
+
+            Classifier(self._classification.MODEL_NAME)  # load the model once before fanning out
+        results = await asyncio.gather(*(self.run_date(today) for today in dates), return_exceptions=True)
+        failed = {today: result for today, result in zip(dates, results) if isinstance(result, Exception)}
+        for today, error in failed.items():
+            logger.error("[%s] failed: %s: %s", today, type(error).__name__, error)
+        if failed:
+            raise RuntimeError(f"Backfill failed for {len(failed)} of {len(dates)} dates")
+
+
+def parse_args(argv: list[str] | None = None) -> Settings:
+    parser = argparse.ArgumentParser(description="Backfill datalake stages over a date range")
+    parser.add_argument("--start", help="first date (YYYY-MM-DD), defaults to yesterday in KST")
+    parser.add_argument("--end", help="last date (YYYY-MM-DD), defaults to --start")
+    parser.add_argument("--stages", help=f"comma separated subset of {','.join(STAGES)}")
+    parser.add_argument("--parallel-dates", type=int)
+    parser.add_argument("--force", action="store_true", help="rerun stages even if marked complete")
+    args = parser.parse_args(argv)
+    overrides = {}
+    if args.start:
+        overrides["START_DATE"] = args.start
+    if args.end:
+        overrides["END_DATE"] = args.end
+    if args.stages:
+        stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+        overrides["STAGES"] = stages
+    if args.parallel_dates:
+        overrides["MAX_PARALLEL_DATES"] = args.parallel_dates
+    if args.force:
+        overrides["FORCE"] = True
+    return Settings(**overrides)
+
+
+async def main(settings: Settings) -> None:
+    start = settings.START_DATE or yesterday()
+    end = settings.END_DATE or start
+    dates = date_range(start, end)
+    logger.info("Backfill %s..%s (%d dates), stages=%s", start, end, len(dates), settings.STAGES)
+    await Backfill(settings).run(dates)
+
+
+def run() -> None:
+    logging.configure_logging("structured")
+    asyncio.run(main(parse_args()))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,3 @@
+from ml.datalake_convert import core
+
+__all__ = ["core"]
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from pydantic_settings import BaseSettings
+
+from ml import logging
+from ml.extractor.schema import ClassifiedRecord, CleanRecord, LabeledRecord
+from ml.parquet.core import convert_layer
+
+logger = logging.get_logger("datalake_convert")
+
+
+class Settings(BaseSettings):
+    CLEAN_DIR: str = "out/datalake/clean/dcinside/v1"
+    CLASSIFIED_DIR: str = "out/datalake/classified/hate_speech/model=kcelectra"
+    LABELED_DIR: str = "out/datalake/labeled/hate_speech/llm=qwen3"
+    OVERWRITE: bool = False
+
+
+def convert_datalake(settings: Settings) -> dict[str, int]:
+    layers = {
+        "clean": (settings.CLEAN_DIR, CleanRecord),
+        "classified": (settings.CLASSIFIED_DIR, ClassifiedRecord),
+        "labeled": (settings.LABELED_DIR, LabeledRecord),
+    }
+    converted = {}
+    for name, (layer_dir, record_type) in layers.items():
+        converted[name] = convert_layer(Path(layer_dir), record_type, overwrite=settings.OVERWRITE)
+        logger.info("Converted %d %s partitions to Parquet", converted[name], name)
+    return converted
+
+
+def run() -> None:
+    logging.configure_logging("structured")
+    convert_datalake(Settings())
+
+
+if __name__ == "__main__":
+    run()
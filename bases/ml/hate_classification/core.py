@@ -1,57 +1,77 @@
-import json
-from datetime import datetime, timedelta, timezone
+import time
 from pathlib import Path
-from ml.classifier.core import Classifier
-from ml.extractor.schema import CleanRecord, ClassifiedRecord
-from ml.json.core import Json
+
 from pydantic_settings import BaseSettings
 
+from ml import config, logging, metrics
+from ml.classifier.core import Classifier
+from ml.extractor.schema import ClassifiedRecord, CleanRecord
+from ml.json.partition import PartitionWriter, iter_partition, list_parts, mark_complete
+from ml.metrics import pipeline as pipeline_metrics
+from ml.utils.dates import yesterday
+
+logger = logging.get_logger("hate_classification")
+
 
 class Settings(BaseSettings):
     MODEL_NAME: str = "beomi/KcELECTRA-base"
     THRESHOLD: float = 0.3
     CLEAN_DIR: str = "out/datalake/clean/dcinside/v1"
     CLASSIFIED_DIR: str = "out/datalake/classified/hate_speech/model=kcelectra"
+    WRITE_PARQUET: bool = False
+    PART_MAX_RECORDS: int = 100_000
+    PART_MAX_BYTES: int = 128 * 1024 * 1024
+
+
+def classify_record(classifier: Classifier, clean_record: CleanRecord, threshold: float) -> ClassifiedRecord | None:
+    with pipeline_metrics.inference_seconds.time():
+        score = classifier.score(clean_record["text"])
+        if score < threshold:
+            return None
+        return classifier.classify(clean_record["id"], clean_record["text"])
 
 
 def classify_data(today: str, settings: Settings) -> int:
-    print(f"Starting classification for date: {today}")
+    logger.info("Starting classification for date: %s", today)
     classified_dir = Path(settings.CLASSIFIED_DIR)
     classified_dir.mkdir(parents=True, exist_ok=True)
     classifier = Classifier(settings.MODEL_NAME)
-    clean_path = Path(settings.CLEAN_DIR) / f"dt={today}" / "part-0001.jsonl"
-    classified_path = classified_dir / f"dt={today}" / "part-0001.jsonl"
-    classified_store = Json(classified_path)
+    clean_partition = Path(settings.CLEAN_DIR) / f"dt={today}"
+    classified_partition = classified_dir / f"dt={today}"
     count = 0
-    if not clean_path.exists():
-        print(f"Clean data file does not exist: {clean_path}")
+    if not list_parts(clean_partition):
+        logger.warning("Clean data partition does not exist: %s", clean_partition)
         return 0
-    with clean_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            clean_record: CleanRecord = json.loads(line)
-            score = classifier.score(clean_record["text"])
-            if score < settings.THRESHOLD:
+    started = time.perf_counter()
+    with PartitionWriter(classified_partition, settings.PART_MAX_RECORDS, settings.PART_MAX_BYTES) as writer:
+        clean_record: CleanRecord
+        for clean_record in iter_partition(clean_partition):
+            classified_record = classify_record(classifier, clean_record, settings.THRESHOLD)
+            if classified_record is None:
                 continue
-            classified_record = classifier.classify(clean_record["id"], clean_record["text"])
-            classified_store.append(classified_record)
+            writer.append(classified_record)
+            pipeline_metrics.records_total.inc(stage="classify")
             count += 1
-    print(f"Classified {count} records for date {today}")
+    mark_complete(classified_partition)
+    pipeline_metrics.record_batch("classify", count, time.perf_counter() - started)
+    if settings.WRITE_PARQUET:
+        from ml.parquet.core import convert_jsonl  # not all projects ship pyarrow
+
+        for part in writer.paths:
+            convert_jsonl(part, ClassifiedRecord)
+    logger.info("Classified %d records for date %s", count, today)
     return count
 
 
 def run() -> None:
+    logging.configure_logging("structured")
     settings = Settings()
-    
-    # Use Korea Standard Time (KST, UTC+9) for date calculation
-    kst = timezone(timedelta(hours=9))
-    now_kst = datetime.now(kst)
-    target_date = (now_kst - timedelta(days=1)).strftime("%Y-%m-%d")  # yesterday in KST
-    
-    print(f"Current time (KST): {now_kst.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Target date: {target_date}")
-    
+    target_date = yesterday()
+    logger.info("Target date: %s", target_date)
+
     count = classify_data(target_date, settings)
-    print(f"Classification completed: {count} records")
+    logger.info("Classification completed: %d records", count)
+    metrics.push_textfile(config.get_settings().metrics_textfile)
 
 
 if __name__ == "__main__":
@@ -1,13 +1,19 @@
 import asyncio
-import json
+import time
+from itertools import batched
 from pathlib import Path
 
-from ml import config
+from pydantic_settings import BaseSettings
+
+from ml import config, logging, metrics
 from ml.extractor.schema import ClassifiedRecord, LabeledRecord
-from ml.json.core import Json
+from ml.json.partition import PartitionWriter, iter_partition, list_parts, mark_complete
 from ml.llm.ollama_client import OllamaClient
-from ml.llm_labeler.core import LLMLabeler
-from pydantic_settings import BaseSettings
+from ml.llm_labeler.core import LLMLabeler, default_prompts
+from ml.metrics import pipeline as pipeline_metrics
+from ml.utils.dates import yesterday
+
+logger = logging.get_logger("hate_llm_labeling")
 
 
 class Settings(BaseSettings):
@@ -15,42 +21,66 @@ class Settings(BaseSettings):
     CLASSIFIED_DIR: str = "out/datalake/classified/hate_speech/model=kcelectra"
     LABELED_DIR: str = "out/datalake/labeled/hate_speech/llm=qwen3"
     OLLAMA_BASE_URL: str = "http://localhost:11434/v1"
+    WRITE_PARQUET: bool = False
+    PART_MAX_RECORDS: int = 100_000
+    PART_MAX_BYTES: int = 128 * 1024 * 1024
+    # Records whose prompts are rendered together
+    BATCH_SIZE: int = 64
+    # LLM calls of a batch in flight at once
+    LLM_CONCURRENCY: int = 4
 
 
 async def label_data(today: str, global_settings: config.Settings, local_settings: Settings) -> int:
     labeled_dir = Path(local_settings.LABELED_DIR)
     labeled_dir.mkdir(parents=True, exist_ok=True)
-    classified_path = Path(local_settings.CLASSIFIED_DIR) / f"dt={today}" / "part-0001.jsonl"
-    labeled_path = labeled_dir / f"dt={today}" / "part-0001.jsonl"
-    labeled_store = Json(labeled_path)
+    classified_partition = Path(local_settings.CLASSIFIED_DIR) / f"dt={today}"
+    labeled_partition = labeled_dir / f"dt={today}"
     count = 0
-    if not classified_path.exists():
+    if not list_parts(classified_partition):
+        logger.warning("Classified data partition does not exist: %s", classified_partition)
         return 0
+    started = time.perf_counter()
 
     async with OllamaClient(
         base_url=local_settings.OLLAMA_BASE_URL,
         model=local_settings.LLM_MODEL,
     ) as llm:
-        labeler = LLMLabeler(llm, local_settings.LLM_MODEL)
-        with classified_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                classified_record: ClassifiedRecord = json.loads(line)
-                labeled_record = await labeler.label(classified_record["id"], classified_record["text"])
-                labeled_store.append(labeled_record)
-                count += 1
+        labeler = LLMLabeler(
+            llm, local_settings.LLM_MODEL, prompts=default_prompts(), concurrency=local_settings.LLM_CONCURRENCY
+        )
+        with PartitionWriter(
+            labeled_partition, local_settings.PART_MAX_RECORDS, local_settings.PART_MAX_BYTES
+        ) as writer:
+            batch: tuple[ClassifiedRecord, ...]
+            for batch in batched(iter_partition(classified_partition), local_settings.BATCH_SIZE):
+                # The labeler observes the latency of each LLM call
+                labeled_records = await labeler.label_batch([(record["id"], record["text"]) for record in batch])
+                for labeled_record in labeled_records:
+                    writer.append(labeled_record)
+                    pipeline_metrics.records_total.inc(stage="label")
+                    count += 1
+                    logger.debug("Labeled %s", labeled_record["id"])
+    mark_complete(labeled_partition)
+    pipeline_metrics.record_batch("label", count, time.perf_counter() - started)
+    if local_settings.WRITE_PARQUET:
+        from ml.parquet.core import convert_jsonl  # not all projects ship pyarrow
+
+        for part in writer.paths:
+            convert_jsonl(part, LabeledRecord)
+    logger.info("Labeled %d records for date %s", count, today)
     return count
 
 
 async def main() -> None:
     global_settings = config.get_settings()
     local_settings = Settings()
-    from datetime import datetime, timedelta
-
-    target_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")  # yesterday
+    target_date = yesterday()
     await label_data(target_date, global_settings, local_settings)
+    metrics.push_textfile(global_settings.metrics_textfile)
 
 
 def run() -> None:
+    logging.configure_logging("structured")
     asyncio.run(main())
 
 
@@ -1,27 +1,31 @@
 import asyncio
 import json
 from datetime import date, datetime
+from itertools import batched
 from pathlib import Path
-from ml import config
+from ml import config, logging
 from ml.hate_speech import InstructionData, RawPost
 from ml.formatter.core import Formatter
 from ml.hf.core import Client as HfClient
 from ml.http.core import Client as HttpClient
 from ml.json.core import Json
 from ml.labeler.classifier import Classifier
-from ml.labeler.core import Labeler
+from ml.labeler.core import Labeler, default_prompts
 from ml.scraper.dcinside import DcinsideScraper
 
+logger = logging.get_logger("hate_speech_pipeline")
+
 RAW_DIR = Path("out/data/raw")
 LABELED_DIR = Path("out/data/labeled")
 CHECKPOINT_PATH = Path("out/data/checkpoints/progress.json")
 COLLECT_BATCH_SIZE = 100
+LABEL_BATCH_SIZE = 32
 
 async def collect_raw_posts(today: str, settings: config.Settings) -> int:
     RAW_DIR.mkdir(parents=True, exist_ok=True)
     galleries = settings.crawl_galleries
     classifier = Classifier(settings.classifier_model) if settings.enable_classifier else None
-    print(f"Collecting: galleries={galleries}, date={date.today()}, batch_size={COLLECT_BATCH_SIZE}")
+    logger.info("Collecting: galleries=%s, date=%s, batch_size=%d", galleries, date.today(), COLLECT_BATCH_SIZE)
     count = 0
     async with HttpClient("https://gall.dcinside.com") as http:
         scraper = DcinsideScraper(http, galleries, COLLECT_BATCH_SIZE, CHECKPOINT_PATH, settings.crawl_rate_limit)
@@ -33,8 +37,8 @@ async def collect_raw_posts(today: str, settings: config.Settings) -> int:
             raw_path = RAW_DIR / f"{today}_{post.gallery}.jsonl"
             Json(raw_path).append(post.model_dump())
             count += 1
-            print(f"[{count}] {post.gallery}/{post.post_id}: {post.title[:30]}")
-    print(f"Collected: {count} posts")
+            logger.info("[%d] %s/%s: %s", count, post.gallery, post.post_id, post.title[:30])
+    logger.info("Collected: %d posts", count)
     return count
 
 async def label_and_upload(today: str, settings: config.Settings) -> int:
@@ -42,7 +46,7 @@ async def label_and_upload(today: str, settings: config.Settings) -> int:
     formatter = Formatter()
     labeled_count = 0
     async with HfClient(settings.hf_token, settings.hf_inference_model, settings.hf_dataset_repo_id) as hf:
-        labeler = Labeler(hf, None, settings.classifier_threshold)
+        labeler = Labeler(hf, None, settings.classifier_threshold, prompts=default_prompts())
         for gallery in settings.crawl_galleries:
             raw_path = RAW_DIR / f"{today}_{gallery}.jsonl"
             if not raw_path.exists():
@@ -50,15 +54,15 @@ async def label_and_upload(today: str, settings: config.Settings) -> int:
             labeled_path = LABELED_DIR / f"{today}_{gallery}.jsonl"
             labeled_store = Json(labeled_path)
             with raw_path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    post = RawPost.model_validate(json.loads(line))
-                    label = await labeler.label(post)
-                    if not label:
-                        continue
-                    instruction = formatter.transform(post, label)
-                    labeled_store.append(instruction.model_dump())
-                    labeled_count += 1
-                    print(f"Labeled: {post.post_id} -> {label.hate_speech_type}")
+                for lines in batched(f, LABEL_BATCH_SIZE):
+                    posts = [RawPost.model_validate(json.loads(line)) for line in lines]
+                    for post, label in zip(posts, await labeler.label_batch(posts)):
+                        if not label:
+                            continue
+                        instruction = formatter.transform(post, label)
+                        labeled_store.append(instruction.model_dump())
+                        labeled_count += 1
+                        logger.info("Labeled: %s -> %s", post.post_id, label.hate_speech_type)
         all_data = []
         for gallery in settings.crawl_galleries:
             labeled_path = LABELED_DIR / f"{today}_{gallery}.jsonl"
@@ -67,18 +71,19 @@ async def label_and_upload(today: str, settings: config.Settings) -> int:
             with labeled_path.open("r", encoding="utf-8") as f:
                 all_data.extend([InstructionData(**json.loads(line)) for line in f])
         if all_data:
-            print(f"Uploading: {len(all_data)} items")
+            logger.info("Uploading: %d items", len(all_data))
             await hf.upload(all_data)
-            print("Upload completed")
+            logger.info("Upload completed")
     return labeled_count
 
 async def run_pipeline() -> None:
     settings = config.get_settings()
     today = datetime.now().strftime("%Y-%m-%d")
-    print(f"Pipeline started: {today}")
+    logger.info("Pipeline started: %s", today)
     await collect_raw_posts(today, settings)
     await label_and_upload(today, settings)
-    print("Pipeline finished")
+    logger.info("Pipeline finished")
 
 def main() -> None:
+    logging.configure_logging("structured")
     asyncio.run(run_pipeline())
@@ -1,13 +1,22 @@
 import asyncio
-import json
-from datetime import date, datetime, timedelta, timezone
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
-from ml import config
+
+from pydantic_settings import BaseSettings
+
+from ml import config, logging, metrics
 from ml.dcinside_extractor.extractor import DCInsideExtractor
+from ml.extractor.schema import CleanRecord
 from ml.http.core import Client as HttpClient
 from ml.json.core import Json
+from ml.json.partition import PartitionWriter, mark_complete
+from ml.json.reader import JsonlReader
+from ml.metrics import pipeline as pipeline_metrics
 from ml.scraper.parser import parse_gallery_page, parse_post_detail
-from pydantic_settings import BaseSettings
+from ml.utils.dates import yesterday
+
+logger = logging.get_logger("ingest_dcinside")
 
 
 class Settings(BaseSettings):
@@ -17,10 +26,19 @@ class Settings(BaseSettings):
     CLEAN_DIR: str = "out/datalake/clean/dcinside/v1"
     CHECKPOINT_PATH: str = "out/datalake/checkpoints/ingest_dcinside.json"
     DCINSIDE_BASE_URL: str = "https://gall.dcinside.com"
+    WRITE_PARQUET: bool = False
+    PART_MAX_RECORDS: int = 100_000
+    PART_MAX_BYTES: int = 128 * 1024 * 1024
 
 
-async def collect_raw(galleries: list[str], today: str, settings: Settings) -> int:
-    print(f"Starting raw data collection for date: {today}, galleries: {galleries}")
+async def collect_raw(
+    galleries: list[str],
+    today: str,
+    settings: Settings,
+    on_post: Callable[[dict], Awaitable[None]] | None = None,
+) -> int:
+    logger.info("Starting raw data collection for date: %s, galleries: %s", today, galleries)
+    started = time.perf_counter()
     try:
         raw_dir = Path(settings.RAW_DIR)
         raw_dir.mkdir(parents=True, exist_ok=True)
@@ -28,16 +46,16 @@ async def collect_raw(galleries: list[str], today: str, settings: Settings) -> i
         checkpoint = Json(checkpoint_path)
         progress = checkpoint.get_all()
         count = 0
-        print(f"Initializing HTTP client for {settings.DCINSIDE_BASE_URL}")
+        logger.info("Initializing HTTP client for %s", settings.DCINSIDE_BASE_URL)
         async with HttpClient(settings.DCINSIDE_BASE_URL) as http:
-            print(f"HTTP client initialized, processing {len(galleries)} galleries")
+            logger.info("HTTP client initialized, processing %d galleries", len(galleries))
             for gallery in galleries:
                 # Use date-specific checkpoint key to avoid conflicts between dates
                 gallery_key = f"{gallery}_{today}"
                 gp = progress.get(gallery_key, {"count": 0, "last_page": 1})
                 page = gp.get("last_page", 1)
                 collected = gp.get("count", 0)
-                print(f"Gallery {gallery}: starting from page {page}, already collected {collected} posts")
+                logger.info("Gallery %s: starting from page %d, already collected %d posts", gallery, page, collected)
                 raw_path = raw_dir / f"dt={today}" / f"{gallery}.jsonl"
                 raw_store = Json(raw_path)
                 consecutive_old_posts = 0
@@ -45,15 +63,15 @@ async def collect_raw(galleries: list[str], today: str, settings: Settings) -> i
                 while collected < settings.BATCH_SIZE:
                     try:
                         resp = await http.get("/board/lists", {"id": gallery, "page": page})
-                        print(f"Gallery {gallery}: HTTP GET /board/lists page={page}, status={resp.status_code}")
+                        logger.debug("Gallery %s: HTTP GET /board/lists page=%d, status=%d", gallery, page, resp.status_code)
                     except Exception as e:
-                        print(f"Gallery {gallery}: HTTP request failed on page {page}: {e}")
+                        logger.warning("Gallery %s: HTTP request failed on page %d: %s", gallery, page, e)
                         break
                     
                     posts = parse_gallery_page(resp.text)
-                    print(f"Gallery {gallery}: Parsed {len(posts)} posts from page {page}")
+                    logger.debug("Gallery %s: Parsed %d posts from page %d", gallery, len(posts), page)
                     if not posts:
-                        print(f"Gallery {gallery}: No posts found on page {page}, stopping")
+                        logger.info("Gallery %s: No posts found on page %d, stopping", gallery, page)
                         break
                     pages_processed += 1
                     posts_on_target_date = 0
@@ -75,13 +93,13 @@ async def collect_raw(galleries: list[str], today: str, settings: Settings) -> i
                             if not post.dt:
                                 posts_skipped_no_date += 1
                                 if posts_skipped_no_date <= 3:  # Log first few
-                                    print(f"Gallery {gallery}: Post {post_id} has no date")
+                                    logger.info("Gallery %s: Post %s has no date", gallery, post_id)
                                 continue
                             if post.dt < today:
                                 consecutive_old_posts += 1
                                 posts_skipped_old += 1
                                 if consecutive_old_posts >= 10:
-                                    print(f"Gallery {gallery}: Found 10 consecutive old posts (last date: {post.dt}), stopping collection")
+                                    logger.info("Gallery %s: Found 10 consecutive old posts (last date: %s), stopping collection", gallery, post.dt)
                                     break
                                 continue
                             if post.dt > today:
@@ -89,26 +107,37 @@ async def collect_raw(galleries: list[str], today: str, settings: Settings) -> i
                                 continue
                             if post.dt == today:
                                 consecutive_old_posts = 0
-                                raw_store.append(post.model_dump())
+                                raw = post.model_dump()
+                                raw_store.append(raw)
+                                pipeline_metrics.records_total.inc(stage="ingest")
+                                if on_post:
+                                    await on_post(raw)
                                 count += 1
                                 collected += 1
                                 posts_on_target_date += 1
                                 if posts_on_target_date <= 5:  # Log first few
-                                    print(f"Gallery {gallery}: Collected post {post_id} (date: {post.dt}, title: {title[:30]})")
+                                    logger.info("Gallery %s: Collected post %s (date: %s, title: %s)", gallery, post_id, post.dt, title[:30])
                                 if collected >= settings.BATCH_SIZE:
                                     break
                         except Exception as e:
-                            print(f"Gallery {gallery}: Error processing post {post_id}: {e}")
+                            logger.warning("Gallery %s: Error processing post %s: %s", gallery, post_id, e)
                             continue
                     
                     if posts_on_target_date > 0 or pages_processed == 1:
-                        print(f"Gallery {gallery}: Page {page} - target_date: {posts_on_target_date}, "
-                              f"old: {posts_skipped_old}, future: {posts_skipped_future}, "
-                              f"no_date: {posts_skipped_no_date}, no_content: {posts_skipped_no_content}")
+                        logger.info(
+                            "Gallery %s: Page %d - target_date: %d, old: %d, future: %d, no_date: %d, no_content: %d",
+                            gallery,
+                            page,
+                            posts_on_target_date,
+                            posts_skipped_old,
+                            posts_skipped_future,
+                            posts_skipped_no_date,
+                            posts_skipped_no_content,
+                        )
                     if consecutive_old_posts >= 10:
                         break
                     if pages_processed % 5 == 0:
-                        print(f"Gallery {gallery}: Processed {pages_processed} pages, collected {collected} posts for date {today}")
+                        logger.info("Gallery %s: Processed %d pages, collected %d posts for date %s", gallery, pages_processed, collected, today)
                     page += 1
                     gp["count"] = collected
                     gp["last_page"] = page
@@ -117,63 +146,75 @@ async def collect_raw(galleries: list[str], today: str, settings: Settings) -> i
                     await asyncio.sleep(1.0 / settings.RATE_LIMIT)
                     if collected >= settings.BATCH_SIZE:
                         break
-                print(f"Gallery {gallery}: Finished with {collected} posts collected for date {today}")
-            print(f"HTTP client context exited, total collected: {count}")
+                logger.info("Gallery %s: Finished with %d posts collected for date %s", gallery, collected, today)
+            logger.info("HTTP client context exited, total collected: %d", count)
     except Exception as e:
-        print(f"ERROR in collect_raw: {type(e).__name__}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("ERROR in collect_raw: %s: %s", type(e).__name__, e)
         raise
-    print(f"Collected {count} raw posts for date {today}")
+    # Only a collection that ran to the end marks the raw partition, so backfill can skip it
+    mark_complete(Path(settings.RAW_DIR) / f"dt={today}")
+    pipeline_metrics.record_batch("ingest", count, time.perf_counter() - started)
+    logger.info("Collected %d raw posts for date %s", count, today)
     return count
 
 
+def clean_raw(extractor: DCInsideExtractor, raw: dict) -> CleanRecord | None:
+    try:
+        clean_record = extractor.extract(raw)
+        extractor.validate(clean_record)
+    except (ValueError, KeyError):
+        return None
+    return clean_record
+
+
 async def clean_data(today: str, settings: Settings) -> int:
-    print(f"Starting data cleaning for date: {today}")
+    logger.info("Starting data cleaning for date: %s", today)
     clean_dir = Path(settings.CLEAN_DIR)
     clean_dir.mkdir(parents=True, exist_ok=True)
     extractor = DCInsideExtractor()
-    clean_path = clean_dir / f"dt={today}" / "part-0001.jsonl"
-    clean_store = Json(clean_path)
+    clean_partition = clean_dir / f"dt={today}"
     count = 0
+    started = time.perf_counter()
     raw_dir = Path(settings.RAW_DIR) / f"dt={today}"
     if not raw_dir.exists():
-        print(f"Raw directory does not exist: {raw_dir}")
+        logger.warning("Raw directory does not exist: %s", raw_dir)
         return 0
-    for raw_file in raw_dir.glob("*.jsonl"):
-        with raw_file.open("r", encoding="utf-8") as f:
-            for line in f:
-                raw = json.loads(line)
-                try:
-                    clean_record = extractor.extract(raw)
-                    extractor.validate(clean_record)
-                    clean_store.append(clean_record)
+    with PartitionWriter(clean_partition, settings.PART_MAX_RECORDS, settings.PART_MAX_BYTES) as writer:
+        for raw_file in raw_dir.glob("*.jsonl"):
+            with JsonlReader(raw_file) as reader:
+                for raw in reader:
+                    clean_record = clean_raw(extractor, raw)
+                    if clean_record is None:
+                        continue
+                    writer.append(clean_record)
+                    pipeline_metrics.records_total.inc(stage="clean")
                     count += 1
-                except (ValueError, KeyError):
-                    continue
-    print(f"Cleaned {count} records for date {today}")
+    mark_complete(clean_partition)
+    pipeline_metrics.record_batch("clean", count, time.perf_counter() - started)
+    if settings.WRITE_PARQUET:
+        from ml.parquet.core import convert_jsonl  # not all projects ship pyarrow
+
+        for part in writer.paths:
+            convert_jsonl(part, CleanRecord)
+    logger.info("Cleaned %d records for date %s", count, today)
     return count
 
 
 async def main() -> None:
     global_settings = config.get_settings()
     local_settings = Settings()
-    
-    # Use Korea Standard Time (KST, UTC+9) for date calculation
-    kst = timezone(timedelta(hours=9))
-    now_kst = datetime.now(kst)
-    target_date = (now_kst - timedelta(days=1)).strftime("%Y-%m-%d")  # yesterday in KST
-    
-    print(f"Current time (KST): {now_kst.strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Target date: {target_date}")
-    
+    target_date = yesterday()
+    logger.info("Target date: %s", target_date)
+
     raw_count = await collect_raw(global_settings.crawl_galleries, target_date, local_settings)
     clean_count = await clean_data(target_date, local_settings)
     
-    print(f"Pipeline completed: raw={raw_count}, clean={clean_count}")
+    logger.info("Pipeline completed: raw=%d, clean=%d", raw_count, clean_count)
+    metrics.push_textfile(global_settings.metrics_textfile)
 
 
 def run() -> None:
+    logging.configure_logging("structured")
     asyncio.run(main())
 
 
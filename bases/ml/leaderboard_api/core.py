@@ -1,14 +1,25 @@
 """Leaderboard API base."""
+import asyncio
+import hashlib
+import json
 from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Annotated
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, Request, Response
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
 
 from ml import auth, config, leaderboard, logging, middleware
 from ml.fastapilite import create_app
-from ml.schema import LeaderboardEntry
+from ml.health import HealthCheck
+from ml.schema import BulkEntryResult, LeaderboardEntry
 
 settings = config.get_settings()
+MAX_BULK_ENTRIES = 10_000
+# Bodies are refused above this size before they are parsed; ~800 bytes per entry at the item cap
+MAX_BULK_BYTES = 8 * 1024 * 1024
 logger = logging.get_logger("leaderboard-FastAPI-logger")
 
 
@@ -24,9 +35,14 @@ app = create_app(
     title="ml Leaderboard API",
     description="A Python Polylith project template",
     version="0.1.0",
+    cors_override=middleware.cors_settings,
+    health_check=HealthCheck.get_instance(),
+    lifespan=lifespan,
 )
-app.router.lifespan_context = lifespan
 middleware.setup_middleware(app)
+leaderboard.set_policy(settings.leaderboard_policy)
+if settings.leaderboard_db_path:
+    leaderboard.set_storage(leaderboard.SQLiteStorage(Path(settings.leaderboard_db_path)))
 
 
 def _to_domain_entry(entry: LeaderboardEntry) -> leaderboard.Entry:
@@ -51,12 +67,67 @@ def _to_schema_entry(entry: leaderboard.Entry) -> LeaderboardEntry:
     )
 
 
+_entries_adapter = TypeAdapter(list[LeaderboardEntry])
+
+
+class ResponseCache:
+    """Ready-to-send JSON bodies for GET /leaderboard, keyed by (limit, snapshot version).
+
+    A write that changes the top of the board bumps the snapshot version, so stale bodies
+    are simply never matched again and get replaced on the next read of that limit.
+    """
+
+    def __init__(self):
+        self._bodies: dict[int, tuple[int, bytes, str]] = {}
+
+    def get(self, limit: int) -> tuple[bytes, str]:
+        """JSON body and strong ETag of the top `limit` entries."""
+        snapshot = leaderboard.get_snapshot()
+        cached = self._bodies.get(limit)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1], cached[2]
+        # The limit query is capped at 100, which the snapshot always covers
+        body = _entries_adapter.dump_json([_to_schema_entry(entry) for entry in snapshot.entries[:limit]])
+        etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        self._bodies[limit] = (snapshot.version, body, etag)
+        return body, etag
+
+    def clear(self) -> None:
+        self._bodies.clear()
+
+
+response_cache = ResponseCache()
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @app.get("/leaderboard", response_model=list[LeaderboardEntry])
 async def get_leaderboard(
+    request: Request,
     limit: Annotated[int, Query(ge=1, le=100, description="Number of entries to return")] = 10,
+) -> Response:
+    """Get top leaderboard entries from the pre-serialized cache, or 304 if the client copy is current."""
+    body, etag = response_cache.get(limit)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@app.get("/leaderboard/users/{user_id}", response_model=list[LeaderboardEntry])
+async def get_user_neighbors(
+    user_id: str,
+    around: Annotated[int, Query(ge=0, le=50, description="Entries to return above and below the user")] = 5,
 ) -> list[LeaderboardEntry]:
-    """Get top leaderboard entries (async for better concurrency)."""
-    entries = leaderboard.get_top_entries(limit=limit)
+    """Get the user's best entry with the entries ranked around it."""
+    entries = await asyncio.to_thread(leaderboard.get_neighbors, user_id, around)
+    if not entries:
+        raise HTTPException(status_code=404, detail=f"No leaderboard entry for user {user_id}")
     return [_to_schema_entry(entry) for entry in entries]
 
 
@@ -65,8 +136,115 @@ async def add_entry(
     entry: LeaderboardEntry,
     current_user: Annotated[dict[str, str], Depends(auth.get_current_user)],
 ) -> LeaderboardEntry:
-    """Add a new leaderboard entry (requires authentication)."""
+    """Submit a score; the user's single record is updated by the configured policy (requires authentication)."""
     logger.info("Adding leaderboard entry for user=%s", entry.user_id)
-    domain_entry = _to_domain_entry(entry)
-    leaderboard.add_entry(domain_entry)
-    return entry
+    # The write waits on the board lock and a storage transaction, so it runs off the event loop
+    stored = await asyncio.to_thread(leaderboard.add_entry, _to_domain_entry(entry))
+    return _to_schema_entry(stored)
+
+
+@app.post("/auth/revoke", status_code=204)
+async def revoke_token(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(auth.security)],
+    current_user: Annotated[dict[str, str], Depends(auth.get_current_user)],
+) -> Response:
+    """Revoke the caller's own bearer token, e.g. on logout; every worker rejects it from then on."""
+    logger.info("Revoking token of user=%s", current_user.get("sub"))
+    await asyncio.to_thread(auth.revoke_token, credentials.credentials)
+    return Response(status_code=204)
+
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+
+async def _read_bulk_body(request: Request) -> bytes:
+    """The request body, refused with 413 as soon as it exceeds MAX_BULK_BYTES."""
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_BULK_BYTES:
+        raise _too_large(f"At most {MAX_BULK_BYTES} bytes per request")
+    chunks = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_BULK_BYTES:
+            raise _too_large(f"At most {MAX_BULK_BYTES} bytes per request")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _parse_bulk(body: bytes, content_type: str) -> list[LeaderboardEntry | str]:
+    """Validate every item of a JSON array or NDJSON body; invalid items become error messages.
+
+    The items are counted before any of them is validated, so an oversized request is
+    refused with 413 without paying for validation.
+    """
+
+    def error(e: ValidationError) -> str:
+        first = e.errors()[0]
+        location = ".".join(str(part) for part in first["loc"])
+        return f"{location}: {first['msg']}" if location else first["msg"]
+
+    items: list[LeaderboardEntry | str] = []
+    if content_type.startswith(("application/x-ndjson", "application/jsonl")):
+        lines = [line for line in body.splitlines() if line.strip()]
+        if len(lines) > MAX_BULK_ENTRIES:
+            raise _too_large(f"At most {MAX_BULK_ENTRIES} entries per request")
+        for line in lines:
+            try:
+                items.append(LeaderboardEntry.model_validate_json(line))
+            except ValidationError as e:
+                items.append(error(e))
+        return items
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of entries")
+    if len(payload) > MAX_BULK_ENTRIES:
+        raise _too_large(f"At most {MAX_BULK_ENTRIES} entries per request")
+    for item in payload:
+        try:
+            items.append(LeaderboardEntry.model_validate(item))
+        except ValidationError as e:
+            items.append(error(e))
+    return items
+
+
+@app.post("/leaderboard/bulk", response_model=list[BulkEntryResult])
+async def add_entries(
+    request: Request,
+    current_user: Annotated[dict[str, str], Depends(auth.get_current_user)],
+) -> Response:
+    """Submit many scores as a JSON array or NDJSON (application/x-ndjson), authenticated once.
+
+    Valid items are applied in one pass under a single lock; the result lists every item
+    in request order with its status and the user's stored record after it (without rank).
+    """
+    items = _parse_bulk(await _read_bulk_body(request), request.headers.get("content-type", ""))
+    valid = [_to_domain_entry(item) for item in items if isinstance(item, LeaderboardEntry)]
+    logger.info("Adding %d leaderboard entries (%d invalid)", len(valid), len(items) - len(valid))
+    stored = iter(await asyncio.to_thread(leaderboard.add_entries, valid))
+
+    results = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            results.append({"index": index, "status": "invalid", "entry": None, "error": item})
+            continue
+        entry = next(stored)
+        results.append(
+            {
+                "index": index,
+                "status": "ok",
+                "entry": {
+                    "user_id": entry.user_id,
+                    "username": entry.username,
+                    "score": entry.score,
+                    "rank": None,
+                    "created_at": entry.created_at,
+                },
+                "error": None,
+            }
+        )
+    return Response(content=to_json(results), media_type="application/json")
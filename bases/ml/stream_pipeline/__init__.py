@@ -0,0 +1,3 @@
+from ml.stream_pipeline import core
+
+__all__ = ["core"]
@@ -0,0 +1,183 @@
+import asyncio
+from pathlib import Path
+
+from pydantic_settings import BaseSettings
+
+from ml import config, logging, metrics
+from ml.classifier.core import Classifier
+from ml.dcinside_extractor.extractor import DCInsideExtractor
+from ml.extractor.schema import ClassifiedRecord, CleanRecord
+from ml.hate_classification import core as hate_classification
+from ml.hate_llm_labeling import core as hate_llm_labeling
+from ml.ingest_dcinside import core as ingest_dcinside
+from ml.json.partition import PartitionWriter, is_complete, mark_complete
+from ml.json.reader import JsonlReader
+from ml.llm.ollama_client import OllamaClient
+from ml.llm_labeler.core import LLMLabeler, default_prompts
+from ml.metrics import pipeline as pipeline_metrics
+from ml.stream.core import Pipeline, Stage
+from ml.utils.dates import yesterday
+
+logger = logging.get_logger("stream_pipeline")
+
+
+class Settings(BaseSettings):
+    QUEUE_SIZE: int = 100
+    CLASSIFY_CONCURRENCY: int = 1
+    LABEL_CONCURRENCY: int = 4
+    STATS_INTERVAL: float = 30.0
+
+
+async def _report(pipeline: Pipeline, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        stats = pipeline.stats()
+        for stage, stage_stats in stats.items():
+            pipeline_metrics.queue_depth.set(stage_stats["queue_depth"], stage=stage)
+            pipeline_metrics.records_per_second.set(stage_stats["throughput"], stage=stage)
+        logger.info("Stream stats", extra={"stats": stats})
+
+
+async def stream_data(
+    today: str,
+    global_settings: config.Settings,
+    settings: Settings,
+    ingest_settings: ingest_dcinside.Settings,
+    classification_settings: hate_classification.Settings,
+    labeling_settings: hate_llm_labeling.Settings,
+) -> dict[str, dict]:
+    """Crawl, clean, classify and label one date in a single process with overlapping stages.
+
+    Every stage still writes its own datalake partition, so the output can be replayed by the
+    batch stages. Once the stream drains, a partition is committed and marked complete unless its
+    stage or an earlier one failed on a record; those parts are discarded so backfill reruns the
+    stage from scratch.
+
+    The crawl checkpoint advances before downstream parts are committed, so a rerun first replays
+    the posts already in the raw partition and then resumes the crawl. Partitions that are already
+    complete are not written again.
+    """
+    extractor = DCInsideExtractor()
+    classifier = Classifier(classification_settings.MODEL_NAME)
+    partitions = {
+        "clean": Path(ingest_settings.CLEAN_DIR) / f"dt={today}",
+        "classify": Path(classification_settings.CLASSIFIED_DIR) / f"dt={today}",
+        "label": Path(labeling_settings.LABELED_DIR) / f"dt={today}",
+    }
+    limits = {
+        "clean": (ingest_settings.PART_MAX_RECORDS, ingest_settings.PART_MAX_BYTES),
+        "classify": (classification_settings.PART_MAX_RECORDS, classification_settings.PART_MAX_BYTES),
+        "label": (labeling_settings.PART_MAX_RECORDS, labeling_settings.PART_MAX_BYTES),
+    }
+    writers = {
+        stage: PartitionWriter(partition, *limits[stage])
+        for stage, partition in partitions.items()
+        if not is_complete(partition)
+    }
+    raw_partition = Path(ingest_settings.RAW_DIR) / f"dt={today}"
+
+    async with OllamaClient(base_url=labeling_settings.OLLAMA_BASE_URL, model=labeling_settings.LLM_MODEL) as llm:
+        labeler = LLMLabeler(llm, labeling_settings.LLM_MODEL, prompts=default_prompts())
+
+        async def clean(raw: dict) -> CleanRecord | None:
+            clean_record = ingest_dcinside.clean_raw(extractor, raw)
+            if clean_record is not None:
+                if "clean" in writers:
+                    writers["clean"].append(clean_record)
+                pipeline_metrics.records_total.inc(stage="clean")
+            return clean_record
+
+        async def classify(clean_record: CleanRecord) -> ClassifiedRecord | None:
+            classified_record = await asyncio.to_thread(
+                hate_classification.classify_record, classifier, clean_record, classification_settings.THRESHOLD
+            )
+            if classified_record is not None:
+                if "classify" in writers:
+                    writers["classify"].append(classified_record)
+                pipeline_metrics.records_total.inc(stage="classify")
+            return classified_record
+
+        async def label(classified_record: ClassifiedRecord) -> None:
+            labeled_record = await labeler.label(classified_record["id"], classified_record["text"])
+            if "label" in writers:
+                writers["label"].append(labeled_record)
+            pipeline_metrics.records_total.inc(stage="label")
+
+        pipeline = Pipeline(
+            [
+                Stage("clean", clean),
+                Stage("classify", classify, concurrency=settings.CLASSIFY_CONCURRENCY),
+                Stage("label", label, concurrency=settings.LABEL_CONCURRENCY),
+            ],
+            maxsize=settings.QUEUE_SIZE,
+        )
+
+        async def crawl() -> None:
+            try:
+                # Posts crawled by an earlier, failed run are past the checkpoint but never reached
+                # the downstream partitions, so they are fed through the stages again
+                for raw_file in sorted(raw_partition.glob("*.jsonl")):
+                    with JsonlReader(raw_file) as reader:
+                        for raw in reader:
+                            await pipeline.put(raw)
+                if not is_complete(raw_partition):
+                    await ingest_dcinside.collect_raw(
+                        global_settings.crawl_galleries, today, ingest_settings, on_post=pipeline.put
+                    )
+            finally:
+                await pipeline.close()
+
+        reporter = asyncio.create_task(_report(pipeline, settings.STATS_INTERVAL))
+        try:
+            # A failing crawl or pipeline cancels the other instead of leaving it running
+            async with asyncio.TaskGroup() as group:
+                group.create_task(crawl())
+                group.create_task(pipeline.run())
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        finally:
+            reporter.cancel()
+
+    stats = pipeline.stats()
+    # Records a stage failed on are missing from its partition and from every later one, so those
+    # parts are discarded and the batch stages rebuild the partitions instead of adding to them
+    dropped = False
+    for stage, partition in partitions.items():
+        dropped = dropped or stats[stage]["errors"] > 0
+        if stage not in writers:
+            continue
+        if dropped:
+            writers[stage].abort()
+            logger.warning("Discarding %s: records were dropped after stage errors", partition)
+        else:
+            writers[stage].close()
+            mark_complete(partition)
+    for stage, stage_stats in stats.items():
+        pipeline_metrics.records_per_second.set(stage_stats["throughput"], stage=stage)
+    metrics.push_textfile(global_settings.metrics_textfile)
+    logger.info("Stream finished for %s", today, extra={"stats": stats})
+    return stats
+
+
+async def main() -> None:
+    target_date = yesterday()
+    logger.info("Target date: %s", target_date)
+    await stream_data(
+        target_date,
+        config.get_settings(),
+        Settings(),
+        ingest_dcinside.Settings(),
+        hate_classification.Settings(),
+        hate_llm_labeling.Settings(),
+    )
+
+
+def run() -> None:
+    logging.configure_logging("structured")
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run()
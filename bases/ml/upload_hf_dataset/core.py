@@ -1,51 +1,63 @@
 import asyncio
-import json
 from pathlib import Path
+from typing import Literal
+
+from pydantic_settings import BaseSettings
+
 from ml import config
 from ml.extractor.schema import LabeledRecord
 from ml.hate_speech import InstructionData
 from ml.hf.core import Client as HfClient
-from pydantic_settings import BaseSettings
+from ml.hf.dedup import DedupIndex
+from ml.json.partition import iter_partition, list_parts, mark_complete
+from ml.utils.dates import yesterday
 
 
 class Settings(BaseSettings):
     LLM_MODEL: str = "OxW/Qwen3-0.6B-GGUF"
     LABELED_DIR: str = "out/datalake/labeled/hate_speech/llm=qwen3"
+    # "incremental" (the default since shard uploads were added) appends the day's rows as new shards;
+    # "full" re-splits and re-pushes the whole dataset, as every upload did before
+    UPLOAD_MODE: Literal["full", "incremental"] = "incremental"
+    UPLOAD_BATCH_SIZE: int = 1_000
+    # Row keys already on the Hub, synced from the shard key files; empty disables dedup
+    DEDUP_DIR: str = "out/datalake/checkpoints/hf_dedup"
 
 
-def format_instruction(labeled: LabeledRecord) -> InstructionData:
-    instruction = "다음 텍스트를 분석하여 혐오표현 유형을 분류하세요. 혐오표현이 없다면 '없음'으로 표시하세요."
+INSTRUCTION = "다음 텍스트를 분석하여 혐오표현 유형을 분류하세요. 혐오표현이 없다면 '없음'으로 표시하세요."
+
+
+def format_instruction_row(labeled: LabeledRecord) -> dict:
     hate_types_str = ", ".join(labeled["hate_type"]) if labeled["hate_type"] else "없음"
-    output = f"혐오표현 유형: {hate_types_str}"
-    return InstructionData(
-        instruction=instruction,
-        input=labeled["text"],
-        output=output,
-    )
+    return {"instruction": INSTRUCTION, "input": labeled["text"], "output": f"혐오표현 유형: {hate_types_str}"}
+
+
+def format_instruction(labeled: LabeledRecord) -> InstructionData:
+    return InstructionData(**format_instruction_row(labeled))
 
 
 async def upload_data(today: str, global_settings: config.Settings, local_settings: Settings) -> None:
-    labeled_path = Path(local_settings.LABELED_DIR) / f"dt={today}" / "part-0001.jsonl"
-    if not labeled_path.exists():
-        return
-    all_data = []
-    with labeled_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            labeled_record: LabeledRecord = json.loads(line)
-            instruction = format_instruction(labeled_record)
-            all_data.append(instruction)
-    if not all_data:
+    labeled_partition = Path(local_settings.LABELED_DIR) / f"dt={today}"
+    if not list_parts(labeled_partition):
         return
     async with HfClient(global_settings.hf_token, local_settings.LLM_MODEL, global_settings.hf_dataset_repo_id) as hf:
-        await hf.upload(all_data)
+        if local_settings.UPLOAD_MODE == "full":
+            all_data = [format_instruction(labeled_record) for labeled_record in iter_partition(labeled_partition)]
+            if not all_data:
+                return
+            await hf.upload(all_data)
+        else:
+            # Plain dicts straight into Arrow batches: no pydantic models, no partition-sized lists
+            rows = (format_instruction_row(labeled_record) for labeled_record in iter_partition(labeled_partition))
+            dedup = DedupIndex(Path(local_settings.DEDUP_DIR)) if local_settings.DEDUP_DIR else None
+            await hf.upload_stream(rows, local_settings.UPLOAD_BATCH_SIZE, dedup=dedup)
+    mark_complete(labeled_partition, "uploaded")
 
 
 async def main() -> None:
     global_settings = config.get_settings()
     local_settings = Settings()
-    from datetime import datetime, timedelta
-
-    target_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")  # yesterday
+    target_date = yesterday()
     await upload_data(target_date, global_settings, local_settings)
 
 
@@ -1,4 +1,13 @@
-from ml.auth.core import get_current_user
-
-__all__ = ["get_current_user"]
+from ml.auth.cache import TokenCache
+from ml.auth.core import get_current_user, revoke_token, security, token_cache
+from ml.auth.revocation import RevocationStore, SQLiteRevocations
 
+__all__ = [
+    "RevocationStore",
+    "SQLiteRevocations",
+    "TokenCache",
+    "get_current_user",
+    "revoke_token",
+    "security",
+    "token_cache",
+]
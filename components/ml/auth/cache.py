@@ -0,0 +1,159 @@
+"""Cache of verified JWT payloads, so a reused token is only verified once."""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from ml import metrics
+
+if TYPE_CHECKING:
+    from ml.auth.revocation import RevocationStore
+
+# Seconds between checks for tokens other workers revoked in the shared store
+SYNC_INTERVAL = 1.0
+
+lookups_total = metrics.counter(
+    "auth_token_cache_lookups_total", "Verified-token cache lookups; hit rate = hit / (hit + miss)", ("result",)
+)
+
+
+def _token_key(token: str) -> bytes:
+    # Tokens are credentials: keep only their hash in memory
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """Bounded LRU of verified token payloads with a TTL capped at each token's `exp`.
+
+    Revoked tokens are remembered until they expire, so a revoked token is rejected
+    even though its signature still verifies. With a shared `store`, revocations reach every
+    worker process within `sync_interval` seconds; without one they only apply to this process.
+    Hits and misses are counted in `auth_token_cache_lookups_total` as well as in `stats()`.
+
+    Usage:
+        payload = cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, ...)
+            cache.put(token, payload)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl: float = 300.0,
+        store: RevocationStore | None = None,
+        sync_interval: float = SYNC_INTERVAL,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._store = store
+        self._sync_interval = sync_interval
+        self._checked_at = 0.0
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self._revoked: dict[bytes, float] = {}
+        # (until, key) per revocation, soonest first, so expired ones are dropped without a scan
+        self._revoked_order: list[tuple[float, bytes]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """The cached payload, or None if the token must be (re)verified."""
+        key = _token_key(token)
+        now = time.time()
+        with self._lock:
+            self._sync()
+            cached = self._entries.get(key)
+            if cached is None or cached[1] <= now:
+                if cached is not None:
+                    del self._entries[key]
+                self.misses += 1
+                lookups_total.inc(result="miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            lookups_total.inc(result="hit")
+            return cached[0]
+
+    def put(self, token: str, payload: dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        if isinstance(payload.get("exp"), (int, float)):
+            expires_at = min(expires_at, payload["exp"])
+        if expires_at <= now:
+            return
+        key = _token_key(token)
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._entries[key] = (payload, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revoke(self, token: str, expires_at: float | None = None) -> None:
+        """Reject `token` from now on, until `expires_at` (default: its `exp` if cached, else the TTL)."""
+        key = _token_key(token)
+        now = time.time()
+        with self._lock:
+            cached = self._entries.get(key)
+            if expires_at is None:
+                exp = cached[0].get("exp") if cached is not None else None
+                expires_at = exp if isinstance(exp, (int, float)) else now + self.ttl
+            if self._store is not None:
+                self._store.add(key, expires_at)
+            self._add_revocation(key, expires_at, now)
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            self._sync()
+            until = self._revoked.get(_token_key(token))
+        return until is not None and until > time.time()
+
+    def _add_revocation(self, key: bytes, until: float, now: float) -> None:
+        """Caller holds _lock."""
+        self._entries.pop(key, None)
+        if until <= self._revoked.get(key, 0.0):
+            return
+        self._revoked[key] = until
+        heapq.heappush(self._revoked_order, (until, key))
+        # Drop revocations of tokens that have expired anyway
+        while self._revoked_order and self._revoked_order[0][0] <= now:
+            expired_until, expired = heapq.heappop(self._revoked_order)
+            if self._revoked.get(expired) == expired_until:
+                del self._revoked[expired]
+
+    def _sync(self) -> None:
+        """Apply revocations other workers wrote to the shared store. Caller holds _lock."""
+        if self._store is None or time.monotonic() - self._checked_at < self._sync_interval:
+            return
+        self._checked_at = time.monotonic()
+        if not self._store.changed():
+            return
+        now = time.time()
+        for key, until in self._store.load():
+            self._add_revocation(key, until, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._revoked_order.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "revoked": len(self._revoked),
+        }
@@ -1,4 +1,5 @@
 """JWT authentication utilities."""
+from pathlib import Path
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
@@ -6,9 +7,16 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
 
 from ml import config
+from ml.auth.cache import TokenCache
+from ml.auth.revocation import SQLiteRevocations
 
 settings = config.get_settings()
 security = HTTPBearer(auto_error=False)
+token_cache = TokenCache(
+    maxsize=settings.jwt_cache_size,
+    ttl=settings.jwt_cache_ttl,
+    store=SQLiteRevocations(Path(settings.jwt_revocation_db_path)) if settings.jwt_revocation_db_path else None,
+)
 
 
 async def get_current_user(
@@ -22,12 +30,24 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+    if token_cache.is_revoked(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     try:
         payload = jwt.decode(
-            credentials.credentials,
+            token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm],
         )
+        token_cache.put(token, payload)
         return payload
     except JWTError as e:
         raise HTTPException(
@@ -36,3 +56,11 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+
+def revoke_token(token: str) -> None:
+    """Reject `token` until it expires, even though its signature still verifies."""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    token_cache.revoke(token, exp if isinstance(exp, (int, float)) else None)
@@ -0,0 +1,74 @@
+"""Token revocations shared by every worker process."""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+
+class RevocationStore(Protocol):
+    """Backend holding revoked token hashes until they expire."""
+
+    def add(self, key: bytes, until: float) -> None:
+        ...
+
+    def changed(self) -> bool:
+        """Cheap check whether another connection wrote since the last call."""
+        ...
+
+    def load(self) -> list[tuple[bytes, float]]:
+        """Every revocation that has not expired yet."""
+        ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revoked (
+    key BLOB PRIMARY KEY,
+    until REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revoked_until ON revoked (until);
+"""
+
+
+class SQLiteRevocations:
+    """Revocations in an SQLite file in WAL mode, so a token revoked by one worker is rejected by all.
+
+    Usage:
+        cache = TokenCache(store=SQLiteRevocations(Path("out/revocations.db")))
+    """
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def add(self, key: bytes, until: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO revoked VALUES (?, ?) ON CONFLICT (key) DO UPDATE SET until = MAX(until, excluded.until)",
+                (key, until),
+            )
+            self._conn.execute("DELETE FROM revoked WHERE until <= ?", (time.time(),))
+
+    def changed(self) -> bool:
+        with self._lock:
+            data_version = self._read_data_version()
+            if data_version == self._data_version:
+                return False
+            self._data_version = data_version
+            return True
+
+    def load(self) -> list[tuple[bytes, float]]:
+        with self._lock:
+            return self._conn.execute("SELECT key, until FROM revoked WHERE until > ?", (time.time(),)).fetchall()
+
+    def close(self) -> None:
+        self._conn.close()
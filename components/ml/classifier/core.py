@@ -1,6 +1,4 @@
 from __future__ import annotations
-import torch
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
 from ml.extractor.schema import ClassifiedRecord
 
 HATE_SPEECH_CLASS_INDEX = 1
@@ -20,12 +18,17 @@ class Classifier:
     def __init__(self, model_name: str = MODEL_NAME):
         if hasattr(self, "_initialized"):
             return
+        # Imported on first use: torch and transformers take seconds to import
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
         self.tokenizer = AutoTokenizer.from_pretrained(self._model_name)
         self.model = AutoModelForSequenceClassification.from_pretrained(self._model_name)
         self.model.eval()
         self._initialized = True
 
     def score(self, text: str) -> float:
+        import torch  # already loaded by transformers in __init__
+
         inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
         with torch.no_grad():
             outputs = self.model(**inputs)
@@ -1,9 +1,11 @@
 from ml.config.core import (
     AppEnvironment,
     BaseConfig,
+    ConfigRegistry,
     ServiceInfo,
     Settings,
     YamlConfig,
+    config_registry,
     create_config,
     env,
     get_settings,
@@ -14,6 +16,8 @@ __all__ = [
     "YamlConfig",
     "env",
     "create_config",
+    "ConfigRegistry",
+    "config_registry",
     "ServiceInfo",
     "AppEnvironment",
     "Settings",
@@ -1,8 +1,11 @@
 import logging
 import os
+import threading
+import time
 from abc import ABC
+from collections.abc import Callable
 from functools import lru_cache
-from typing import ClassVar, Literal, Optional
+from typing import Any, ClassVar, Literal, Optional, TypeVar
 
 import yaml
 from pydantic import BaseModel, Field, model_validator
@@ -13,6 +16,9 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONFIG_FOLDER = "config"
 env = os.getenv("ENVIRONMENT", "dev")
 
+T = TypeVar("T")
+_MISSING = object()
+
 
 class BaseConfig(ABC):
     def __init__(self, data):
@@ -22,6 +28,24 @@ class BaseConfig(ABC):
     def __getattr__(self, name):
         return None
 
+    def get(self, key: str, default: Any = None, type_: type[T] | None = None) -> T | None:
+        """Value of `key`, or `default` if it is missing; raises TypeError if it is not a `type_`."""
+        value = self.__dict__.get(key, _MISSING)
+        if value is _MISSING or value is None:
+            return default
+        if type_ is not None and not isinstance(value, type_):
+            if type_ is float and isinstance(value, int) and not isinstance(value, bool):
+                return float(value)
+            raise TypeError(f"Config key '{key}' must be {type_.__name__}, got {type(value).__name__}")
+        return value
+
+    def require(self, key: str, type_: type[T] | None = None) -> T:
+        """Like `get`, but raises KeyError if `key` is missing instead of returning None."""
+        value = self.get(key, _MISSING, type_)
+        if value is _MISSING:
+            raise KeyError(f"Config doesn't contain attribute {key}.")
+        return value
+
 
 class ServiceInfo(BaseModel):
     name: str
@@ -31,7 +55,7 @@ class ServiceInfo(BaseModel):
 class YamlConfig(BaseConfig):
     def __init__(self, yaml_path):
         with open(yaml_path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.safe_load(f) or {}
 
         # Handle ServiceInfo if present
         if "service_info" in data:
@@ -44,11 +68,104 @@ class YamlConfig(BaseConfig):
         super().__init__(data)
 
 
+class ConfigRegistry:
+    """YAML configs parsed once and cached by path, re-parsed only when the file changes.
+
+    A cached config is returned without touching the file system for `check_interval`
+    seconds; after that a `stat` decides whether the file changed (mtime and size). A
+    config is shared by all callers, so it must be treated as read-only.
+
+    Usage:
+        registry = ConfigRegistry()
+        config = registry.get("config/config.dev.yml")
+        registry.on_change(lambda path, config: ...)
+        registry.watch(interval=5.0)
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        # Per absolute path: parsed config, file signature, monotonic time of the last check
+        self._entries: dict[str, tuple[YamlConfig, tuple[int, int], float]] = {}
+        self._callbacks: list[Callable[[str, YamlConfig], None]] = []
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _signature(path: str) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str) -> YamlConfig:
+        key = os.path.abspath(path)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now - entry[2] < self.check_interval:
+            return entry[0]
+        return self._load(key, now)
+
+    def _load(self, key: str, now: float, force: bool = False) -> YamlConfig:
+        signature = self._signature(key)
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None and previous[1] == signature and not force:
+                self._entries[key] = (previous[0], signature, now)
+                return previous[0]
+            config = YamlConfig(yaml_path=key)
+            self._entries[key] = (config, signature, now)
+        if previous is not None:
+            logger.info("Reloaded config %s", key)
+            for callback in self._callbacks:
+                callback(key, config)
+        return config
+
+    def reload(self, path: Optional[str] = None) -> None:
+        """Re-parse `path`, or every cached config, even if the file looks unchanged."""
+        keys = [os.path.abspath(path)] if path is not None else list(self._entries)
+        for key in keys:
+            self._load(key, time.monotonic(), force=True)
+
+    def on_change(self, callback: Callable[[str, YamlConfig], None]) -> None:
+        """Call `callback(path, config)` whenever a cached config is re-parsed."""
+        self._callbacks.append(callback)
+
+    def watch(self, interval: float = 5.0) -> None:
+        """Check cached configs for changes every `interval` seconds in a daemon thread."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            for key in list(self._entries):
+                try:
+                    self._load(key, time.monotonic())
+                except Exception as e:
+                    # Keep serving the last good config while the file is missing or invalid
+                    logger.warning("Failed to reload config %s: %s", key, e)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+config_registry = ConfigRegistry()
+
+
 def create_config(env_name=env, custom_path=None):
     """Create a config instance by loading YAML configuration.
 
     Loads configuration from either a custom path, or a default filepath
-    based on the environment name.
+    based on the environment name. Each file is parsed once and served from
+    `config_registry` until it changes on disk.
 
     Args:
         env_name (str): The environment name, used to load default config file.
@@ -60,10 +177,10 @@ def create_config(env_name=env, custom_path=None):
     custom_path = custom_path or os.environ.get("CUSTOM_CONFIG_PATH")
 
     if custom_path is not None:
-        return YamlConfig(yaml_path=custom_path)
+        return config_registry.get(custom_path)
     else:
         file_path = os.path.join(DEFAULT_CONFIG_FOLDER, f"config.{env_name}.yml")
-        return YamlConfig(yaml_path=file_path)
+        return config_registry.get(file_path)
 
 
 EnvironmentType = Literal["dev", "nonprod", "prod", "local"]
@@ -98,6 +215,18 @@ class Settings(BaseSettings):
     hf_token: str = ""
     hf_dataset_repo_id: str = ""
     crawl_galleries: list[str] = ["dcbest", "baseball_new11"]
+    jwt_secret_key: str = ""
+    jwt_algorithm: str = "HS256"
+    # Verified tokens are reused for at most this many seconds (and never past their exp)
+    jwt_cache_ttl: float = 300.0
+    jwt_cache_size: int = 10_000
+    # SQLite file through which API workers share revoked tokens; empty keeps revocations per process
+    jwt_revocation_db_path: str = ""
+    # node_exporter textfile collector target for batch jobs; empty disables the push
+    metrics_textfile: str = ""
+    leaderboard_policy: Literal["best", "latest", "cumulative"] = "best"
+    # SQLite file shared by every API worker; empty keeps the leaderboard in memory
+    leaderboard_db_path: str = ""
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,9 +1,16 @@
 import os
-from typing import Any, Dict, List, Optional
+from collections.abc import AsyncIterator, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response
+
+from ml import metrics
+
+if TYPE_CHECKING:
+    from ml.health import HealthCheck
 
 cors_settings = {
     "allow_origins": [
@@ -26,6 +33,9 @@ def create_app(
     openapi_tags: Optional[List[Dict[str, Any]]] = None,
     cors_override: Optional[Dict] = None,
     redirect_slashes: bool = True,
+    health_check: Optional["HealthCheck"] = None,
+    health_interval: float = 30.0,
+    lifespan: Optional[Callable[[FastAPI], AbstractAsyncContextManager[None]]] = None,
 ) -> FastAPI:
     """
     Create a FastAPI application instance
@@ -37,12 +47,32 @@ def create_app(
     - docs_route: The route for the documentation
     - openapi_tags: List of tags for OpenAPI schema
     - cors_override: Optional dictionary with CORS configuration to override default cors_settings
+    - health_check: Optional HealthCheck whose cached snapshot backs /readyz
+    - health_interval: Seconds between background refreshes of the health checks
+    - lifespan: Optional lifespan of the service; the health refresher runs around it
 
     Returns:
     A FastAPI app instance
     """
     virtual_path = os.environ.get("VIRTUAL_PATH", None)
+
+    @asynccontextmanager
+    async def app_lifespan(app: FastAPI) -> AsyncIterator[None]:
+        # The refresher and its HTTP client live exactly as long as the app
+        if health_check is not None:
+            health_check.start(health_interval)
+        try:
+            if lifespan is None:
+                yield
+            else:
+                async with lifespan(app):
+                    yield
+        finally:
+            if health_check is not None:
+                await health_check.stop()
+
     app = FastAPI(
+        lifespan=app_lifespan,
         title=title,
         version=version or os.getenv("APP_VERSION", "1.0"),
         description=description or f"API for {title}",
@@ -64,11 +94,27 @@ def create_app(
         """Check if the app is healthy"""
         return JSONResponse(content={"status": "healthy"}, status_code=200)
 
-    def readyz():
+    async def readyz():
         """Check if the app is ready to serve traffic"""
-        return JSONResponse(content={"status": "ready"}, status_code=200)
+        if health_check is None:
+            return JSONResponse(content={"status": "ready"}, status_code=200)
+        if not health_check.checked:
+            # Only the first probe waits, sharing the refresher's first run; later ones read the
+            # snapshot the refresher keeps current
+            await health_check.run_checks()
+        snapshot = health_check.snapshot()
+        ready = snapshot["healthy"]
+        return JSONResponse(
+            content={"status": "ready" if ready else "not ready", **snapshot},
+            status_code=200 if ready else 503,
+        )
+
+    def metrics_endpoint():
+        """Expose process metrics in the Prometheus text format"""
+        return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
 
     app.get("/")(redirect_root)
     app.get("/healthz")(healthz)
     app.get("/readyz")(readyz)
+    app.get("/metrics", include_in_schema=False)(metrics_endpoint)
     return app
@@ -1,33 +1,64 @@
+import asyncio
 import os
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Dict
 
+import httpx
 from pydantic import BaseModel
 
 
 class Service(BaseModel, ABC):
     name: str
+    # Seconds before a check counts as failed
+    timeout: float = 5.0
 
     @abstractmethod
-    async def run_check(self) -> bool:
+    async def run_check(self, client: httpx.AsyncClient) -> bool:
         pass
 
 
 class HuggingFaceService(Service):
     name: str = "huggingface"
 
-    async def run_check(self) -> bool:
+    async def run_check(self, client: httpx.AsyncClient) -> bool:
         try:
-            import httpx
-
-            async with httpx.AsyncClient() as client:
-                resp = await client.get("https://huggingface.co/api/health", timeout=5.0)
-                return resp.status_code == 200
+            resp = await client.get("https://huggingface.co/api/health", timeout=self.timeout)
+            return resp.status_code == 200
         except Exception:
             return False
 
 
+@dataclass(frozen=True, slots=True)
+class CheckResult:
+    healthy: bool
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency_ms, 1),
+            "staleness_s": round(now - self.checked_at, 1),
+            "error": self.error,
+        }
+
+
 class HealthCheck:
+    """Dependency checks run concurrently, each bounded by its service timeout.
+
+    `start` keeps refreshing the results in the background, so readiness probes read the
+    latest snapshot instead of waiting on the network; `stop` ends it and closes the client.
+    `ml.fastapilite.create_app` calls both from the app's lifespan.
+
+    Usage:
+        health = HealthCheck.get_instance()
+        health.start(interval=30)
+        health.snapshot()
+    """
+
     _instance = None
 
     def __init__(self, services_to_check=None):
@@ -43,6 +74,12 @@ class HealthCheck:
             }
         else:
             self.services = self.all_services
+        # Env vars do not change while the process runs, so they are read once
+        self._available = self.get_available_dependencies()
+        self._client: httpx.AsyncClient | None = None
+        self._results: Dict[str, CheckResult] = {}
+        self._refresher: asyncio.Task | None = None
+        self._running: asyncio.Task | None = None
 
     def get_available_dependencies(self) -> Dict[str, bool]:
         """Check available dependencies by looking at env variables."""
@@ -56,9 +93,77 @@ class HealthCheck:
             cls._instance = cls(services_to_check)
         return cls._instance
 
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient()
+        return self._client
+
+    async def _check(self, service: Service) -> CheckResult:
+        start = time.perf_counter()
+        error = None
+        try:
+            healthy = await asyncio.wait_for(service.run_check(self._get_client()), timeout=service.timeout)
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timed out after {service.timeout}s"
+        except Exception as e:
+            healthy, error = False, f"{type(e).__name__}: {e}"
+        return CheckResult(healthy, (time.perf_counter() - start) * 1000, time.time(), error)
+
     async def run_checks(self) -> dict:
-        results = {}
-        for service in self.services.values():
-            if self.get_available_dependencies().get(service.name):
-                results[service.name] = await service.run_check()
-        return results
+        """Run the checks and return health per dependency; concurrent callers share one run.
+
+        The first readiness probe and the refresher it starts therefore check only once.
+        """
+        if self._running is None:
+            self._running = asyncio.ensure_future(self._run_checks())
+            self._running.add_done_callback(self._finish_run)
+        return await asyncio.shield(self._running)
+
+    def _finish_run(self, task: asyncio.Task) -> None:
+        if self._running is task:
+            self._running = None
+
+    async def _run_checks(self) -> dict:
+        services = [service for service in self.services.values() if self._available.get(service.name)]
+        results = await asyncio.gather(*(self._check(service) for service in services))
+        self._results = {service.name: result for service, result in zip(services, results)}
+        return {name: result.healthy for name, result in self._results.items()}
+
+    @property
+    def checked(self) -> bool:
+        """Whether checks ran at least once (a probe with no dependencies counts as checked)."""
+        return bool(self._results) or not any(self._available.get(name) for name in self.services)
+
+    def snapshot(self) -> dict:
+        """Latest results with per-dependency latency and staleness, without running any check."""
+        now = time.time()
+        results = self._results
+        return {
+            "healthy": all(result.healthy for result in results.values()),
+            "dependencies": {name: result.to_dict(now) for name, result in results.items()},
+        }
+
+    def start(self, interval: float = 30.0) -> None:
+        """Refresh results every `interval` seconds on the running event loop."""
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.get_running_loop().create_task(self._refresh(interval))
+
+    async def _refresh(self, interval: float) -> None:
+        while True:
+            await self.run_checks()
+            await asyncio.sleep(interval)
+
+    async def stop(self) -> None:
+        """Cancel the refresher and any check in flight, and close the shared HTTP client."""
+        if self._running is not None:
+            self._running.cancel()
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -1,4 +1,5 @@
-from ml.hf.core import Client
-
-__all__ = ["Client"]
+from ml.hf.core import Client, assign_split, row_key
+from ml.hf.dedup import DedupIndex
+from ml.hf.local import LocalHub
 
+__all__ = ["Client", "DedupIndex", "LocalHub", "assign_split", "row_key"]
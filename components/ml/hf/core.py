@@ -1,20 +1,69 @@
 from __future__ import annotations
+
 import asyncio
+import hashlib
+import tempfile
+from array import array
+from collections.abc import Iterable
 from datetime import datetime, timezone
-from datasets import Dataset, DatasetDict, load_dataset
-from huggingface_hub import HfApi
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
 from ml.hate_speech import InstructionData
 from ml.http.core import Client as HttpClient
 from ml.llm import LLMMessage
 from ml.llm.interfaces import LLMClient
+from ml.logging import get_logger
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+    from ml.hf.dedup import DedupIndex
+
+# Cumulative percentage buckets: rows hashing below 80 go to train, below 90 to validation, the rest to test
+SPLIT_BUCKETS = (("train", 80), ("validation", 90), ("test", 100))
+SHARD_COMPRESSION = "zstd"
+STREAM_BATCH_SIZE = 1_000
+# Sorted uint64 row keys of each shard, committed next to it so uploaders can dedup without reading rows
+HASH_DIR = "hashes"
+
+logger = get_logger(__name__)
+
+
+def row_key(row: dict) -> bytes:
+    """Stable 8-byte content hash of an instruction row."""
+    content = "\x00".join((row["instruction"], row["input"], row["output"]))
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).digest()
+
+
+def assign_split(row: dict) -> str:
+    """Pick a split from the row content, so a row lands in the same split on every upload."""
+    return _split_for(row_key(row))
+
+
+def _instruction_schema() -> pa.Schema:
+    import pyarrow as pa  # pyarrow, datasets and huggingface_hub are only imported by the upload paths
+
+    return pa.schema([("instruction", pa.string()), ("input", pa.string()), ("output", pa.string())])
+
+
+def _split_for(key: bytes) -> str:
+    bucket = int.from_bytes(key, "big") % 100
+    for split, upper in SPLIT_BUCKETS:
+        if bucket < upper:
+            return split
+    return SPLIT_BUCKETS[-1][0]
+
 
 class Client(LLMClient):
     BASE_URL = "https://api-inference.huggingface.co"
 
-    def __init__(self, token: str, model: str, repo_id: str):
+    def __init__(self, token: str, model: str, repo_id: str, api: Any | None = None):
         self._token = token
         self._model = model
         self._repo_id = repo_id
+        # Anything exposing the HfApi methods used below, e.g. ml.hf.local.LocalHub in tests
+        self._api = api
         self._http: HttpClient | None = None
 
     async def __aenter__(self):
@@ -55,14 +104,121 @@ class Client(LLMClient):
         await loop.run_in_executor(None, self._upload_sync, new_data, version_tag)
         return f"https://huggingface.co/datasets/{self._repo_id}"
 
+    async def upload_incremental(self, data: Iterable[InstructionData] | Iterable[dict]) -> list[str]:
+        """Append rows as new Parquet shards, one per split, without touching published shards."""
+        rows = (item.model_dump() if isinstance(item, InstructionData) else item for item in data)
+        return await self.upload_stream(rows)
+
+    async def upload_stream(
+        self, rows: Iterable[dict], batch_size: int = STREAM_BATCH_SIZE, dedup: DedupIndex | None = None
+    ) -> list[str]:
+        """Stream plain dict rows into per-split Parquet shards and commit them.
+
+        Rows are written as Arrow record batches of `batch_size`, so peak memory depends on the
+        batch size rather than on how many rows the iterable yields. With `dedup`, the index is
+        synced from the repo first and rows it already holds are dropped before they are written.
+        """
+        version_tag = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._upload_stream_sync, rows, version_tag, batch_size, dedup)
+
+    def _get_api(self) -> Any:
+        if self._api is not None:
+            return self._api
+        from huggingface_hub import HfApi
+
+        return HfApi(token=self._token)
+
+    def _upload_stream_sync(
+        self, rows: Iterable[dict], version_tag: str, batch_size: int, dedup: DedupIndex | None = None
+    ) -> list[str]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        from huggingface_hub import CommitOperationAdd
+
+        api = self._get_api()
+        if dedup is not None:
+            dedup.sync(api, self._repo_id)
+            rows = dedup.filter(rows, batch_size)
+        schema = _instruction_schema()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            writers: dict[str, pq.ParquetWriter] = {}
+            batches: dict[str, list[dict]] = {}
+            counts: dict[str, int] = {}
+            keys: dict[str, array] = {}
+
+            def flush(split: str) -> None:
+                if split not in writers:
+                    writers[split] = pq.ParquetWriter(
+                        Path(tmp_dir) / f"{split}.parquet", schema, compression=SHARD_COMPRESSION
+                    )
+                writers[split].write_batch(pa.RecordBatch.from_pylist(batches[split], schema=schema))
+                counts[split] = counts.get(split, 0) + len(batches[split])
+                batches[split] = []
+
+            for row in rows:
+                key = row_key(row)
+                split = _split_for(key)
+                keys.setdefault(split, array("Q")).append(int.from_bytes(key, "big"))
+                batch = batches.setdefault(split, [])
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush(split)
+            for split, batch in batches.items():
+                if batch:
+                    flush(split)
+            for writer in writers.values():
+                writer.close()
+            if not writers:
+                return []
+
+            operations = []
+            hash_operations = []
+            for split in writers:
+                local_path = Path(tmp_dir) / f"{split}.parquet"
+                with local_path.open("rb") as f:
+                    digest = hashlib.file_digest(f, "sha256").hexdigest()[:8]
+                # data/<split>-* matches the split patterns of the push_to_hub dataset card
+                shard_name = f"{split}-{version_tag}-{digest}"
+                operations.append(
+                    CommitOperationAdd(path_in_repo=f"data/{shard_name}.parquet", path_or_fileobj=str(local_path))
+                )
+                hash_operations.append(
+                    CommitOperationAdd(
+                        path_in_repo=f"{HASH_DIR}/{shard_name}.u64",
+                        path_or_fileobj=array("Q", sorted(keys[split])).tobytes(),
+                    )
+                )
+
+            api.create_repo(repo_id=self._repo_id, repo_type="dataset", exist_ok=True)
+            api.create_commit(
+                repo_id=self._repo_id,
+                repo_type="dataset",
+                operations=operations + hash_operations,
+                commit_message=f"Add shards - {version_tag}",
+            )
+        if dedup is not None:
+            # Only published rows enter the index, so rows of a failed commit are uploaded on retry
+            dedup.update(value for split_keys in keys.values() for value in split_keys)
+            dedup.save()
+        logger.info("Uploaded incremental shards: %s", ", ".join(f"{split}={count}" for split, count in counts.items()))
+        return [operation.path_in_repo for operation in operations]
+
     def _upload_sync(self, new_data: list[dict], version_tag: str) -> None:
-        api = HfApi(token=self._token)
+        from datasets import Dataset, DatasetDict, load_dataset
+
+        api = self._get_api()
         api.create_repo(repo_id=self._repo_id, repo_type="dataset", exist_ok=True)
         
         # 기존 데이터셋 로드 시도 (존재하지 않으면 None)
         try:
             existing_dataset = load_dataset(self._repo_id, token=self._token)
-            print(f"Loaded existing dataset with {len(existing_dataset['train'])} train, {len(existing_dataset.get('validation', []))} validation, {len(existing_dataset.get('test', []))} test samples")
+            logger.info(
+                "Loaded existing dataset with %d train, %d validation, %d test samples",
+                len(existing_dataset["train"]),
+                len(existing_dataset.get("validation", [])),
+                len(existing_dataset.get("test", [])),
+            )
             
             # 기존 데이터를 리스트로 변환
             existing_train = existing_dataset["train"].to_list()
@@ -71,13 +227,24 @@ class Client(LLMClient):
             
             # 새 데이터를 기존 데이터에 추가
             all_data = existing_train + existing_val + existing_test + new_data
-            print(f"Total data after merge: {len(all_data)} samples (existing: {len(existing_train) + len(existing_val) + len(existing_test)}, new: {len(new_data)})")
+            logger.info(
+                "Total data after merge: %d samples (existing: %d, new: %d)",
+                len(all_data),
+                len(existing_train) + len(existing_val) + len(existing_test),
+                len(new_data),
+            )
         except Exception as e:
             # 데이터셋이 존재하지 않거나 로드 실패 시 새 데이터만 사용
-            print(f"Could not load existing dataset (may not exist yet): {e}")
+            logger.warning("Could not load existing dataset (may not exist yet): %s", e)
             all_data = new_data
-            print(f"Using only new data: {len(all_data)} samples")
+            logger.info("Using only new data: %d samples", len(all_data))
         
+        # Exact duplicates (same instruction, input and output) are kept once
+        unique_data = list({row_key(row): row for row in all_data}.values())
+        if len(unique_data) < len(all_data):
+            logger.info("Dropped %d duplicate samples", len(all_data) - len(unique_data))
+        all_data = unique_data
+
         # 전체 데이터를 train/val/test로 분할
         train_size = int(len(all_data) * 0.8)
         val_size = int(len(all_data) * 0.1)
@@ -91,5 +258,7 @@ class Client(LLMClient):
             "test": Dataset.from_list(test_data),
         })
         
-        print(f"Uploading dataset: train={len(train_data)}, validation={len(val_data)}, test={len(test_data)}")
+        logger.info(
+            "Uploading dataset: train=%d, validation=%d, test=%d", len(train_data), len(val_data), len(test_data)
+        )
         dataset_dict.push_to_hub(repo_id=self._repo_id, token=self._token, commit_message=f"Update dataset - {version_tag}")
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import heapq
+import json
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from ml.hf.core import HASH_DIR, STREAM_BATCH_SIZE, row_key
+from ml.logging import get_logger
+
+KEYS_NAME = "keys.bin"
+SYNCED_NAME = "synced.json"
+
+logger = get_logger(__name__)
+
+
+def _read_keys(path: Path) -> array:
+    keys = array("Q")
+    keys.frombytes(Path(path).read_bytes())
+    return keys
+
+
+def _merge(keys: array, new: Iterable[int]) -> array:
+    """Sorted union of the sorted unique `keys` and the sorted `new`, one key at a time."""
+    merged = array("Q")
+    last = None
+    for value in heapq.merge(keys, new):
+        if value != last:
+            merged.append(value)
+            last = value
+    return merged
+
+
+class DedupIndex:
+    """Compact on-disk set of row keys already published to a dataset repo.
+
+    Keys are the 8-byte `row_key` hashes of (instruction, input, output), kept as one sorted
+    uint64 array (8 bytes per row on disk and in memory). The index syncs from the per-shard
+    key files under `hashes/` that `Client.upload_stream` commits next to each Parquet shard,
+    so rows are never downloaded. Shards pushed without a key file can be seeded with `add_rows`.
+
+    Usage:
+        index = DedupIndex(Path("out/datalake/checkpoints/hf_dedup"))
+        index.sync(api, repo_id)
+        fresh = index.filter(rows)
+    """
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        keys_path = self._path / KEYS_NAME
+        self._keys = _read_keys(keys_path) if keys_path.exists() else array("Q")
+        synced_path = self._path / SYNCED_NAME
+        self._synced: set[str] = set(json.loads(synced_path.read_text())) if synced_path.exists() else set()
+        self._pending: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._pending)
+
+    def __contains__(self, key: bytes) -> bool:
+        value = int.from_bytes(key, "big")
+        if value in self._pending:
+            return True
+        i = bisect_left(self._keys, value)
+        return i < len(self._keys) and self._keys[i] == value
+
+    def add(self, key: bytes) -> None:
+        if key not in self:
+            self._pending.add(int.from_bytes(key, "big"))
+
+    def add_rows(self, rows: Iterable[dict]) -> None:
+        for row in rows:
+            self.add(row_key(row))
+
+    def update(self, keys: Iterable[int]) -> None:
+        """Add row keys as uint64 values, e.g. those of shards once their commit succeeded."""
+        self._pending.update(keys)
+
+    def filter(self, rows: Iterable[dict], batch_size: int = STREAM_BATCH_SIZE) -> Iterator[dict]:
+        """Yield only unseen rows, also dropping repeats within each batch of `batch_size` rows.
+
+        Only the keys of the current batch are held besides the index, so memory stays bounded
+        by the batch size however many rows stream through; repeats further apart than a batch
+        are not caught. The yielded rows are not added to the index, so a failed upload can be
+        retried; add their keys with `update` once they are published.
+        """
+        seen: set[int] = set()
+        for row in rows:
+            if len(seen) >= batch_size:
+                seen = set()
+            key = row_key(row)
+            value = int.from_bytes(key, "big")
+            if value in seen or key in self:
+                continue
+            seen.add(value)
+            yield row
+
+    def sync(self, api: Any, repo_id: str) -> int:
+        """Merge key files of shards published since the last sync. Returns the number merged."""
+        try:
+            files = api.list_repo_files(repo_id=repo_id, repo_type="dataset")
+        except Exception as e:
+            logger.warning("Could not list dataset files (may not exist yet): %s", e)
+            return 0
+        new_files = [f for f in files if f.startswith(f"{HASH_DIR}/") and f not in self._synced]
+        for filename in new_files:
+            local_path = api.hf_hub_download(repo_id=repo_id, filename=filename, repo_type="dataset")
+            self._pending.update(_read_keys(Path(local_path)))
+            self._synced.add(filename)
+        if new_files:
+            self.save()
+        return len(new_files)
+
+    def save(self) -> None:
+        if self._pending:
+            self._keys = _merge(self._keys, sorted(self._pending))
+            self._pending = set()
+        tmp_path = self._path / f"{KEYS_NAME}.tmp"
+        tmp_path.write_bytes(self._keys.tobytes())
+        tmp_path.replace(self._path / KEYS_NAME)
+        (self._path / SYNCED_NAME).write_text(json.dumps(sorted(self._synced)))
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Any
+
+
+class LocalHub:
+    """File-based stand-in for the subset of `HfApi` the uploader uses.
+
+    Repositories live under `root/<repo_id>/`, so commits can be inspected with plain file reads.
+
+    Usage:
+        hub = LocalHub(tmp_path)
+        client = Client(token="", model="", repo_id="org/dataset", api=hub)
+    """
+
+    def __init__(self, root: Path):
+        self._root = Path(root)
+        self.commits: list[dict[str, Any]] = []
+
+    def _repo(self, repo_id: str) -> Path:
+        return self._root / repo_id
+
+    def create_repo(self, repo_id: str, repo_type: str | None = None, exist_ok: bool = False, **kwargs) -> str:
+        repo = self._repo(repo_id)
+        if repo.exists() and not exist_ok:
+            raise FileExistsError(f"Repository {repo_id} already exists")
+        repo.mkdir(parents=True, exist_ok=True)
+        return str(repo)
+
+    def create_commit(self, repo_id: str, operations: list, commit_message: str, **kwargs) -> None:
+        repo = self._repo(repo_id)
+        for operation in operations:
+            target = repo / operation.path_in_repo
+            target.parent.mkdir(parents=True, exist_ok=True)
+            source = operation.path_or_fileobj
+            if isinstance(source, bytes):
+                target.write_bytes(source)
+            elif isinstance(source, (str, Path)):
+                shutil.copyfile(source, target)
+            else:
+                target.write_bytes(source.read())
+        self.commits.append({"message": commit_message, "files": [op.path_in_repo for op in operations]})
+
+    def list_repo_files(self, repo_id: str, **kwargs) -> list[str]:
+        repo = self._repo(repo_id)
+        if not repo.exists():
+            return []
+        return sorted(str(path.relative_to(repo)) for path in repo.rglob("*") if path.is_file())
+
+    def hf_hub_download(self, repo_id: str, filename: str, **kwargs) -> str:
+        path = self._repo(repo_id) / filename
+        if not path.exists():
+            raise FileNotFoundError(f"{filename} not found in {repo_id}")
+        return str(path)
@@ -1,7 +1,12 @@
 from __future__ import annotations
 import httpx
+from ml import metrics
 from ml.utils.retry import retry
 
+request_seconds = metrics.histogram(
+    "http_client_request_duration_seconds", "Outgoing HTTP request latency", ("host", "method")
+)
+
 class Client:
     def __init__(self, base_url: str, user_agent: str = ""):
         self._base_url = base_url.rstrip("/")
@@ -23,12 +28,14 @@ class Client:
 
     @retry(max_attempts=3, delay=5.0, exceptions=(httpx.HTTPError,))
     async def get(self, path: str, params: dict | None = None) -> httpx.Response:
-        resp = await self._client.get(path, params=params)
+        with request_seconds.time(host=self._client.base_url.host, method="GET"):
+            resp = await self._client.get(path, params=params)
         resp.raise_for_status()
         return resp
 
     @retry(max_attempts=3, delay=5.0, exceptions=(httpx.HTTPError,))
     async def post(self, path: str, json: dict | None = None, headers: dict | None = None) -> httpx.Response:
-        resp = await self._client.post(path, json=json, headers=headers)
+        with request_seconds.time(host=self._client.base_url.host, method="POST"):
+            resp = await self._client.post(path, json=json, headers=headers)
         resp.raise_for_status()
         return resp
@@ -1,4 +1,23 @@
 from ml.json.core import Json
+from ml.json.partition import (
+    PartitionWriter,
+    is_complete,
+    iter_partition,
+    list_parts,
+    mark_complete,
+    plan_reads,
+    read_manifest,
+)
+from ml.json.reader import JsonlReader
 
-__all__ = ["Json"]
-
+__all__ = [
+    "Json",
+    "JsonlReader",
+    "PartitionWriter",
+    "is_complete",
+    "iter_partition",
+    "list_parts",
+    "mark_complete",
+    "plan_reads",
+    "read_manifest",
+]
@@ -0,0 +1,198 @@
+import fcntl
+import hashlib
+import json
+from collections.abc import Callable, Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+
+from ml.json.reader import JsonlReader
+
+MANIFEST_NAME = "_manifest.json"
+LOCK_NAME = "_manifest.lock"
+PART_PATTERN = "part-*.jsonl"
+DEFAULT_MAX_RECORDS = 100_000
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+def read_manifest(partition_dir: Path) -> dict | None:
+    path = partition_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _describe_part(path: Path) -> dict:
+    data = path.read_bytes()
+    return {
+        "name": path.name,
+        "rows": data.count(b"\n"),
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+
+
+def _update_manifest(partition_dir: Path, update: Callable[[dict], None]) -> dict:
+    """Read-modify-write the manifest under an exclusive lock so concurrent workers can commit.
+
+    A partition written before manifests existed gets one listing its existing parts, so they
+    stay visible to readers once the manifest is created.
+    """
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    with (partition_dir / LOCK_NAME).open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = read_manifest(partition_dir) or {
+            "parts": [_describe_part(path) for path in sorted(partition_dir.glob(PART_PATTERN))],
+            "complete": False,
+        }
+        update(manifest)
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        tmp_path = partition_dir / f"{MANIFEST_NAME}.tmp"
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(partition_dir / MANIFEST_NAME)
+    return manifest
+
+
+def mark_complete(partition_dir: Path, flag: str = "complete") -> None:
+    """Flag a partition as fully written (or fully consumed by a later stage, e.g. "uploaded")."""
+    _update_manifest(partition_dir, lambda manifest: manifest.update({flag: True}))
+
+
+def is_complete(partition_dir: Path, flag: str = "complete") -> bool:
+    manifest = read_manifest(partition_dir)
+    return bool(manifest and manifest.get(flag))
+
+
+def list_parts(partition_dir: Path) -> list[Path]:
+    """Committed parts of a partition; falls back to globbing for partitions without a manifest."""
+    manifest = read_manifest(partition_dir)
+    if manifest is None:
+        return sorted(partition_dir.glob(PART_PATTERN))
+    return [partition_dir / part["name"] for part in manifest["parts"]]
+
+
+def plan_reads(partition_dir: Path, workers: int) -> list[list[Path]]:
+    """Assign committed parts to `workers` groups, balancing bytes (largest part first)."""
+    manifest = read_manifest(partition_dir)
+    if manifest is None:
+        sizes = {path: path.stat().st_size for path in list_parts(partition_dir)}
+    else:
+        sizes = {partition_dir / part["name"]: part["bytes"] for part in manifest["parts"]}
+    plans: list[list[Path]] = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for path, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+        target = loads.index(min(loads))
+        plans[target].append(path)
+        loads[target] += size
+    return [sorted(plan) for plan in plans]
+
+
+def iter_partition(partition_dir: Path) -> Iterator[dict]:
+    for part in list_parts(partition_dir):
+        with JsonlReader(part) as reader:
+            yield from reader
+
+
+class PartitionWriter:
+    """Write a dt= partition as rolling part-NNNN.jsonl files and commit them to `_manifest.json`.
+
+    Part numbers are claimed with exclusive file creation, so several worker processes can each
+    write their own parts into the same partition. Parts only become visible to manifest-aware
+    readers once `close()` commits them; leaving the `with` block on an exception removes them
+    instead.
+
+    Usage:
+        with PartitionWriter(clean_dir / f"dt={today}", max_records=10_000) as writer:
+            for record in records:
+                writer.append(record)
+        mark_complete(clean_dir / f"dt={today}")
+    """
+
+    def __init__(
+        self,
+        partition_dir: Path,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self._dir = partition_dir
+        # Create the manifest before writing any part, so a concurrent writer never mistakes
+        # uncommitted parts for those of a partition without a manifest
+        _update_manifest(self._dir, lambda manifest: None)
+        self._max_records = max_records
+        self._max_bytes = max_bytes
+        self._file: IO[bytes] | None = None
+        self._name = ""
+        self._rows = 0
+        self._bytes = 0
+        self._sha256 = hashlib.sha256()
+        self.parts: list[dict] = []
+
+    def __enter__(self) -> "PartitionWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def paths(self) -> list[Path]:
+        return [self._dir / part["name"] for part in self.parts]
+
+    def append(self, item: dict) -> None:
+        line = (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._file is not None and (
+            self._rows >= self._max_records or self._bytes + len(line) > self._max_bytes
+        ):
+            self._finish_part()
+        if self._file is None:
+            self._open_part()
+        self._file.write(line)
+        self._sha256.update(line)
+        self._rows += 1
+        self._bytes += len(line)
+
+    def close(self) -> None:
+        """Finish the open part and commit every part written by this writer to the manifest."""
+        if self._file is not None:
+            self._finish_part()
+        parts = self.parts
+
+        def commit(manifest: dict) -> None:
+            committed = {part["name"] for part in manifest["parts"]}
+            manifest["parts"].extend(part for part in parts if part["name"] not in committed)
+
+        _update_manifest(self._dir, commit)
+
+    def abort(self) -> None:
+        """Delete every part written by this writer without committing it."""
+        if self._file is not None:
+            self._finish_part()
+        for path in self.paths:
+            path.unlink(missing_ok=True)
+        self.parts = []
+
+    def _open_part(self) -> None:
+        number = 1
+        while True:
+            path = self._dir / f"part-{number:04d}.jsonl"
+            try:
+                self._file = path.open("xb")
+                break
+            except FileExistsError:
+                number += 1
+        self._name = path.name
+        self._rows = 0
+        self._bytes = 0
+        self._sha256 = hashlib.sha256()
+
+    def _finish_part(self) -> None:
+        self._file.close()
+        self._file = None
+        self.parts.append({
+            "name": self._name,
+            "rows": self._rows,
+            "bytes": self._bytes,
+            "sha256": self._sha256.hexdigest(),
+        })
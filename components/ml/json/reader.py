@@ -0,0 +1,164 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+from typing import overload
+
+_INDEX_MAGIC = b"JLI2"
+_INDEX_HEADER = struct.Struct("<4sQQQ")  # magic, file size, file mtime_ns, line count
+_OFFSET_SIZE = array("Q").itemsize
+
+
+class _MappedFile:
+    """Memory map of a JSONL file plus its line-offset index, shared by every reader view."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self._file = path.open("rb")
+        stat = path.stat()
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.starts, self.ends = self._load_index() or self._build_index()
+
+    def _load_index(self) -> tuple[array, array] | None:
+        try:
+            data = self.index_path.read_bytes()
+        except OSError:
+            return None
+        if len(data) < _INDEX_HEADER.size:
+            return None
+        magic, size, mtime_ns, count = _INDEX_HEADER.unpack_from(data)
+        if magic != _INDEX_MAGIC or size != self.size or mtime_ns != self.mtime_ns:
+            return None
+        payload = data[_INDEX_HEADER.size:]
+        # A foreign or damaged index is rebuilt rather than trusted
+        if len(payload) != 2 * count * _OFFSET_SIZE:
+            return None
+        offsets = array("Q")
+        offsets.frombytes(payload)
+        return offsets[:count], offsets[count:]
+
+    def _build_index(self) -> tuple[array, array]:
+        starts, ends = array("Q"), array("Q")
+        pos = 0
+        while pos < self.size:
+            end = self.mm.find(b"\n", pos)
+            if end == -1:
+                end = self.size
+            # Skip blank lines so every indexed line is one record
+            if self.mm[pos:end].strip():
+                starts.append(pos)
+                ends.append(end)
+            pos = end + 1
+        try:
+            self._save_index(starts, ends)
+        except OSError:
+            pass  # read-only partitions still work, the index is just rebuilt next time
+        return starts, ends
+
+    def _save_index(self, starts: array, ends: array) -> None:
+        """Write the index to a temp file and rename it, so concurrent readers never see a partial one."""
+        header = _INDEX_HEADER.pack(_INDEX_MAGIC, self.size, self.mtime_ns, len(starts))
+        fd, tmp_name = tempfile.mkstemp(prefix=self.index_path.name + ".", suffix=".tmp", dir=self.index_path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header + starts.tobytes() + ends.tobytes())
+            os.replace(tmp_name, self.index_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def close(self) -> None:
+        if self.mm is not None:
+            self.mm.close()
+        self._file.close()
+
+
+class JsonlReader:
+    """Lazy, memory-mapped reader over a JSONL partition.
+
+    A line-offset index is built on first open and saved next to the file as `<name>.idx`.
+    Slices and shards are views over the same map and index, so nothing is re-read or copied;
+    only the reader that opened the file closes the map, closing a view does nothing.
+
+    Usage:
+        with JsonlReader(path) as reader:
+            for record in reader.shard(worker_index, worker_count):
+                ...
+    """
+
+    def __init__(self, path: Path, *, _mapped: _MappedFile | None = None, _start: int = 0, _stop: int | None = None):
+        self._owner = _mapped is None
+        self._mapped = _mapped or _MappedFile(Path(path))
+        total = len(self._mapped.starts)
+        self._start = _start
+        self._stop = total if _stop is None else _stop
+
+    def __enter__(self) -> "JsonlReader":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owner:
+            self._mapped.close()
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, key: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> "JsonlReader": ...
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise ValueError("JsonlReader slices do not support steps")
+            return self._view(self._start + start, self._start + max(start, stop))
+        return json.loads(bytes(self.raw(key)))
+
+    def __iter__(self) -> Iterator[dict]:
+        mm, starts, ends = self._mapped.mm, self._mapped.starts, self._mapped.ends
+        for i in range(self._start, self._stop):
+            yield json.loads(mm[starts[i]:ends[i]])
+
+    def raw(self, index: int) -> memoryview:
+        """Return the bytes of one line as a zero-copy view into the map."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("JsonlReader index out of range")
+        i = self._start + index
+        return memoryview(self._mapped.mm)[self._mapped.starts[i]:self._mapped.ends[i]]
+
+    def byte_range(self, start: int, end: int) -> "JsonlReader":
+        """Return the lines of this view whose first byte falls in [start, end)."""
+        starts = self._mapped.starts
+        first = bisect_left(starts, start, self._start, self._stop)
+        last = bisect_left(starts, end, first, self._stop)
+        return self._view(first, last)
+
+    def shard(self, index: int, count: int) -> "JsonlReader":
+        """Split this view into `count` byte-balanced shards aligned on line boundaries."""
+        if not 0 <= index < count:
+            raise ValueError(f"shard index {index} out of range for {count} shards")
+        if not len(self):
+            return self._view(self._start, self._start)
+        lo = self._mapped.starts[self._start]
+        hi = self._mapped.ends[self._stop - 1] + 1
+        span = hi - lo
+        return self.byte_range(lo + span * index // count, lo + span * (index + 1) // count)
+
+    def _view(self, start: int, stop: int) -> "JsonlReader":
+        return JsonlReader(self._mapped.path, _mapped=self._mapped, _start=start, _stop=stop)
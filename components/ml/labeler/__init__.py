@@ -1,4 +1,4 @@
 from ml.labeler.classifier import Classifier
-from ml.labeler.core import Labeler
+from ml.labeler.core import Labeler, default_prompts
 
-__all__ = ["Labeler", "Classifier"]
+__all__ = ["Labeler", "Classifier", "default_prompts"]
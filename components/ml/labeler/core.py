@@ -1,8 +1,17 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
 from ml.hate_speech import LabelResult, RawPost
 from ml.labeler.classifier import Classifier
-from ml.labeler.parser import parse_label_response
 from ml.llm import LLMMessage, LLMRole
 from ml.llm.interfaces import LLMClient
+from ml.parser.label_parser import LabelResponse, parse_label
+
+if TYPE_CHECKING:
+    from ml.prompt import PromptManager
 
 HATE_PROMPT = """다음 텍스트를 분석하여 혐오표현 유형을 분류하세요.
 분류 가능한 유형: 성별혐오, 인종혐오, 종교혐오, 장애혐오, 기타혐오, 없음
@@ -10,30 +19,84 @@ HATE_PROMPT = """다음 텍스트를 분석하여 혐오표현 유형을 분류
 혐오표현 유형: [유형]
 설명: [설명]
 텍스트: {text}"""
+HATE_PROMPT_NAME = "hate"
+# LLM calls of one batch in flight at once
+DEFAULT_CONCURRENCY = 4
+
+
+def default_prompts() -> PromptManager:
+    """Prompt manager serving `HATE_PROMPT` as its default prompt."""
+    from ml.prompt import YAMLPromptClient  # langchain is only imported once prompts are rendered
+    from ml.prompt.defaults import DefaultPrompt
+
+    return YAMLPromptClient(
+        prompts_config=[{"name": HATE_PROMPT_NAME, "prompt": HATE_PROMPT}],
+        default_prompt=DefaultPrompt(name=HATE_PROMPT_NAME),
+    )
+
 
 class Labeler:
-    def __init__(self, llm: LLMClient, classifier: Classifier | None, threshold: float = 0.3):
+    def __init__(
+        self,
+        llm: LLMClient,
+        classifier: Classifier | None,
+        threshold: float = 0.3,
+        prompts: PromptManager | None = None,
+        prompt_name: str | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
         self._llm = llm
         self._classifier = classifier
         self._threshold = threshold
+        self._prompts = prompts
+        self._prompt_name = prompt_name
+        self._concurrency = concurrency
+
+    def render_prompts(self, texts: Sequence[str]) -> list[str]:
+        """Prompt for each text; a prompt manager's template is rendered once for the whole batch."""
+        if self._prompts is None:
+            return [HATE_PROMPT.format(text=text) for text in texts]
+        values = self._prompts.render_batch([{"text": text} for text in texts], name=self._prompt_name)
+        return [value.to_string() for value in values]
+
+    def _passes_classifier(self, post: RawPost) -> bool:
+        return not self._classifier or self._classifier.score(post.content) >= self._threshold
 
     async def label(self, post: RawPost) -> LabelResult | None:
-        if self._classifier:
-            score = self._classifier.score(post.content)
-            if score < self._threshold:
+        return (await self.label_batch([post]))[0]
+
+    async def label_batch(self, posts: Sequence[RawPost]) -> list[LabelResult | None]:
+        """Labels in the order of `posts`; None where the classifier filtered a post or parsing failed.
+
+        Up to `concurrency` LLM calls are in flight at once.
+        """
+        kept = [self._passes_classifier(post) for post in posts]
+        prompts = iter(self.render_prompts([post.content for post, keep in zip(posts, kept) if keep]))
+        limit = asyncio.Semaphore(self._concurrency)
+
+        async def label_one(prompt: str | None) -> LabelResult | None:
+            if prompt is None:
                 return None
-        result = await self._call_llm(HATE_PROMPT.format(text=post.content))
+            async with limit:
+                return await self._label_prompt(prompt)
+
+        return list(await asyncio.gather(*(label_one(next(prompts) if keep else None) for keep in kept)))
+
+    async def _label_prompt(self, prompt: str) -> LabelResult | None:
+        result = await self._call_llm(prompt)
         if not result:
             return None
+        # Detail fields are only reported together with a nuance or level, as before
+        detailed = result.nuance is not None or result.hate_level is not None
         return LabelResult(
-            hate_speech_type=result.get("type", "없음"),
-            hate_speech_description=result.get("description", ""),
-            nuance=result.get("nuance"),
-            hate_level=result.get("hate_level"),
-            reason=result.get("reason"),
+            hate_speech_type=result.type,
+            hate_speech_description=result.description,
+            nuance=result.nuance,
+            hate_level=result.hate_level,
+            reason=result.reason if detailed else None,
         )
 
-    async def _call_llm(self, prompt: str) -> dict | None:
+    async def _call_llm(self, prompt: str) -> LabelResponse | None:
         messages = [LLMMessage(role=LLMRole.USER, content=prompt)]
         response = await self._llm.generate(messages, model=self._llm.get_model(), temperature=0.3)
-        return parse_label_response(response)
+        return parse_label(response)
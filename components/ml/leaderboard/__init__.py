@@ -1,4 +1,36 @@
-from ml.leaderboard.core import Entry, add_entry, get_top_entries
-
-__all__ = ["Entry", "add_entry", "get_top_entries"]
+from ml.leaderboard.core import (
+    Entry,
+    Policy,
+    Snapshot,
+    add_entries,
+    add_entry,
+    clear,
+    get_entry,
+    get_neighbors,
+    get_rank,
+    get_snapshot,
+    get_top_entries,
+    set_policy,
+    set_storage,
+)
+from ml.leaderboard.index import RankedIndex
+from ml.leaderboard.storage import SQLiteStorage, Storage
 
+__all__ = [
+    "Entry",
+    "Policy",
+    "RankedIndex",
+    "SQLiteStorage",
+    "Snapshot",
+    "Storage",
+    "add_entries",
+    "add_entry",
+    "clear",
+    "get_entry",
+    "get_neighbors",
+    "get_rank",
+    "get_snapshot",
+    "get_top_entries",
+    "set_policy",
+    "set_storage",
+]
@@ -1,15 +1,39 @@
 """Leaderboard business logic."""
-from dataclasses import dataclass
+import gc
+import threading
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
 from datetime import datetime
-from collections.abc import Sequence
-from heapq import nlargest
+from typing import TYPE_CHECKING, ContextManager, Literal
 
-_entries: list["Entry"] = []
+from ml.leaderboard.index import RankedIndex
+from ml.logging import get_logger
 
+if TYPE_CHECKING:
+    from ml.leaderboard.storage import Storage
 
-@dataclass(slots=True, frozen=False)
+# How a new submission combines with the user's record: keep the higher score,
+# take the newest score, or add it to the running total
+Policy = Literal["best", "latest", "cumulative"]
+POLICIES: tuple[Policy, ...] = ("best", "latest", "cumulative")
+
+# Ranked copies kept in the read-side snapshot; covers every limit the API accepts
+SNAPSHOT_SIZE = 100
+# Seconds between checks for writes other workers made to the shared storage
+SYNC_INTERVAL = 0.05
+
+logger = get_logger("leaderboard")
+
+
+@dataclass(slots=True, frozen=True)
 class Entry:
-    """Leaderboard entry model with slots for performance."""
+    """Leaderboard entry model with slots for performance.
+
+    Entries are frozen: the index, the snapshot and every caller share the same instances,
+    so changes are made with `dataclasses.replace`.
+    """
 
     user_id: str
     username: str
@@ -17,29 +41,287 @@ class Entry:
     rank: int | None = None
     created_at: datetime | None = None
 
-    def __lt__(self, other: "LeaderboardEntry") -> bool:
+    def __lt__(self, other: "Entry") -> bool:
         """Enable sorting by score for heapq."""
         return self.score < other.score
 
 
-def get_top_entries(limit: int = 10) -> Sequence[Entry]:
-    """Get top leaderboard entries using heap for O(n log k) performance."""
-    if not _entries:
-        return []
-    
-    if limit >= len(_entries):
-        top_entries = sorted(_entries, reverse=True)
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Ranked copies of the top entries at one version of the top of the board.
+
+    A snapshot is never modified after it is built, so readers share it without locks.
+    """
+
+    version: int
+    entries: tuple[Entry, ...]
+
+
+# One record per user, highest score first; on a tie the earlier record ranks higher.
+# Writers hold _lock; stored records never carry a rank, ranks only exist on copies.
+_index: RankedIndex[tuple, Entry] = RankedIndex()
+_records: dict[str, tuple[tuple, Entry]] = {}
+_policy: Policy = "best"
+_lock = threading.Lock()
+# Bumped only by changes that reach the top SNAPSHOT_SIZE positions. Writers replace
+# _snapshot when they bump it, so readers take the reference without the lock.
+_version = 0
+_snapshot = Snapshot(0, ())
+# Optional shared storage; without it the board lives only in this process
+_storage: "Storage | None" = None
+_seq = 0
+_checked_at = 0.0
+# Stops the thread applying other workers' writes to the current storage
+_sync_stop: threading.Event | None = None
+
+
+def _sort_key(entry: Entry) -> tuple:
+    return (-entry.score, entry.created_at.timestamp(), entry.user_id)
+
+
+def _ranked(entries: Sequence[Entry], start: int = 1) -> tuple[Entry, ...]:
+    return tuple(replace(entry, rank=rank) for rank, entry in enumerate(entries, start=start))
+
+
+def _put(entry: Entry) -> int:
+    """Make `entry` the user's record and return the highest position it moved from or to."""
+    position = len(_index)
+    record = _records.get(entry.user_id)
+    if record is not None:
+        position = _index.rank(record[0])
+        _index.remove(record[0])
+    key = _sort_key(entry)
+    position = min(position, _index.insert(key, entry))
+    _records[entry.user_id] = (key, entry)
+    return position
+
+
+def _touch(position: int) -> None:
+    global _version
+    if position < SNAPSHOT_SIZE:
+        _version += 1
+
+
+def _publish() -> None:
+    """Replace the snapshot after the top of the board changed. Caller holds _lock."""
+    global _snapshot
+    if _snapshot.version != _version:
+        _snapshot = Snapshot(_version, _ranked(_index.slice(0, SNAPSHOT_SIZE)))
+
+
+def _load() -> None:
+    """Rebuild the index from storage in one pass over the records in rank order."""
+    global _index, _records, _seq, _version
+    records: dict[str, tuple[tuple, Entry]] = {}
+
+    def items(entries: list[Entry]) -> Iterator[tuple[tuple, Entry]]:
+        for entry in entries:
+            key = _sort_key(entry)
+            records[entry.user_id] = (key, entry)
+            yield key, entry
+
+    # Millions of new objects would otherwise trigger repeated full collections
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        entries, _seq = _storage.load()
+        _index = RankedIndex.from_sorted(items(entries))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    _records = records
+    _version += 1
+
+
+def _sync() -> None:
+    """Apply records other workers wrote to the shared storage. Caller holds _lock."""
+    global _seq, _checked_at
+    if _storage is None:
+        return
+    _checked_at = time.monotonic()
+    if not _storage.changed():
+        return
+    changes = _storage.changes_since(_seq)
+    if changes is None:
+        _load()
     else:
-        top_entries = list(reversed(nlargest(limit, _entries)))
-    
-    for i, entry in enumerate(top_entries, start=1):
-        entry.rank = i
-    
-    return top_entries
-
-
-def add_entry(entry: Entry) -> None:
-    """Add a new leaderboard entry."""
-    if entry.created_at is None:
-        entry.created_at = datetime.now()
-    _entries.append(entry)
+        entries, _seq = changes
+        for entry in entries:
+            _touch(_put(entry))
+    _publish()
+
+
+def _sync_loop(stop: threading.Event, interval: float) -> None:
+    while not stop.wait(interval):
+        try:
+            with _lock:
+                _sync()
+        except Exception as e:
+            logger.warning("Leaderboard sync failed: %s", e)
+
+
+def _sync_due() -> bool:
+    return _storage is not None and time.monotonic() - _checked_at >= SYNC_INTERVAL
+
+
+def _transaction() -> ContextManager[None]:
+    return _storage.transaction() if _storage is not None else nullcontext()
+
+
+def get_snapshot() -> Snapshot:
+    """The current top-N snapshot, without taking the lock or touching storage.
+
+    Writers build a new snapshot when they change the top of the board; writes of other
+    workers arrive through the sync thread started by `set_storage`.
+    """
+    return _snapshot
+
+
+def get_top_entries(limit: int = 10) -> Sequence[Entry]:
+    """Get top leaderboard entries; limits up to SNAPSHOT_SIZE are served from the snapshot."""
+    if limit <= SNAPSHOT_SIZE:
+        if _sync_due():
+            with _lock:
+                _sync()
+        return _snapshot.entries[:limit]
+    with _lock:
+        _sync()
+        return _ranked(_index.slice(0, limit))
+
+
+def get_entry(user_id: str) -> Entry | None:
+    """A ranked copy of the user's record, or None if the user has no record."""
+    with _lock:
+        if _sync_due():
+            _sync()
+        record = _records.get(user_id)
+        if record is None:
+            return None
+        key, entry = record
+        return replace(entry, rank=_index.rank(key) + 1)
+
+
+def get_rank(user_id: str) -> int | None:
+    """1-based rank of the user's record, or None if the user has no record."""
+    with _lock:
+        if _sync_due():
+            _sync()
+        record = _records.get(user_id)
+        if record is None:
+            return None
+        return _index.rank(record[0]) + 1
+
+
+def get_neighbors(user_id: str, count: int = 5) -> Sequence[Entry]:
+    """Ranked copies of the entries up to `count` places above and below the user's record."""
+    with _lock:
+        if _sync_due():
+            _sync()
+        record = _records.get(user_id)
+        if record is None:
+            return []
+        start, entries = _index.around(record[0], count)
+        return _ranked(entries, start=start + 1)
+
+
+def _merge(current: Entry, entry: Entry) -> Entry | None:
+    """The record that replaces `current` under the active policy, or None to keep it."""
+    if _policy == "best":
+        return entry if entry.score > current.score else None
+    if _policy == "cumulative":
+        return replace(entry, score=current.score + entry.score)
+    return entry
+
+
+def add_entry(entry: Entry) -> Entry:
+    """Upsert the user's record with a new submission and return the stored record, ranked.
+
+    The record is repositioned in the index in O(log n), so repeated submissions
+    never grow the leaderboard beyond one record per user. With shared storage the
+    merge runs inside a storage transaction, after catching up on other workers' writes.
+    The rank is taken under the same lock, so it always belongs to the returned record.
+    """
+    with _lock, _transaction():
+        stored = _apply([entry])[0]
+        return replace(stored, rank=_index.rank(_records[stored.user_id][0]) + 1)
+
+
+def add_entries(entries: Iterable[Entry]) -> list[Entry]:
+    """Upsert many submissions in one pass and return the stored record after each one.
+
+    The whole batch takes the lock and the storage transaction once and is written to
+    storage in a single save; submissions for the same user are merged in order.
+    """
+    with _lock, _transaction():
+        return _apply(entries)
+
+
+def _apply(entries: Iterable[Entry]) -> list[Entry]:
+    """Merge, save and index a batch of submissions. Caller holds _lock and the transaction."""
+    global _seq
+    results: list[Entry] = []
+    _sync()
+    pending: dict[str, Entry] = {}
+    for entry in entries:
+        if entry.created_at is None:
+            entry = replace(entry, created_at=datetime.now())
+        current = pending.get(entry.user_id)
+        if current is None and entry.user_id in _records:
+            current = _records[entry.user_id][1]
+        merged = entry if current is None else _merge(current, entry)
+        if merged is None:
+            results.append(current)
+            continue
+        merged = replace(merged, rank=None)
+        pending[merged.user_id] = merged
+        results.append(merged)
+    if pending and _storage is not None:
+        _seq = _storage.save(list(pending.values()))
+    for entry in pending.values():
+        _touch(_put(entry))
+    _publish()
+    return results
+
+
+def set_policy(policy: Policy) -> None:
+    """Choose how submissions update a user's record. Only allowed while the board is empty."""
+    global _policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown leaderboard policy: {policy}")
+    if _records and policy != _policy:
+        raise ValueError("Cannot change the leaderboard policy once it has entries")
+    _policy = policy
+
+
+def set_storage(storage: "Storage | None", sync_interval: float | None = SYNC_INTERVAL) -> None:
+    """Back the board with shared storage and rebuild the index from it.
+
+    A daemon thread applies other workers' writes every `sync_interval` seconds, so the
+    snapshot stays current without readers touching storage; None disables it.
+    """
+    global _storage, _sync_stop
+    if _sync_stop is not None:
+        _sync_stop.set()
+        _sync_stop = None
+    with _lock:
+        _storage = storage
+        if storage is not None:
+            _load()
+            _publish()
+    if storage is not None and sync_interval is not None:
+        _sync_stop = threading.Event()
+        threading.Thread(
+            target=_sync_loop, args=(_sync_stop, sync_interval), name="leaderboard-sync", daemon=True
+        ).start()
+
+
+def clear() -> None:
+    """Remove every entry."""
+    global _index, _version
+    with _lock, _transaction():
+        if _storage is not None:
+            _storage.clear()
+        _index = RankedIndex()
+        _records.clear()
+        _version += 1
+        _publish()
@@ -0,0 +1,178 @@
+"""Indexable skip list keeping leaderboard entries in rank order."""
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable, Iterator
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+# 2**24 entries before the top level saturates; lookups stay O(log n) well past that
+MAX_LEVEL = 24
+
+
+class _Node:
+    __slots__ = ("key", "value", "next", "width")
+
+    def __init__(self, key: Any, value: Any, level: int):
+        self.key = key
+        self.value = value
+        self.next: list[_Node | None] = [None] * level
+        # width[lvl] = number of level-0 steps to next[lvl]
+        self.width = [1] * level
+
+
+def _random_level() -> int:
+    bits = random.getrandbits(MAX_LEVEL)
+    if not bits:
+        return MAX_LEVEL
+    return (bits & -bits).bit_length()
+
+
+class RankedIndex(Generic[K, V]):
+    """Sorted map with O(log n) insert, remove, rank and positional lookup.
+
+    Keys must be unique and totally ordered; the smallest key has rank 0. Each skip list
+    link records how many entries it jumps over, which makes rank and index lookups
+    as cheap as a search.
+
+    Usage:
+        index = RankedIndex()
+        index.insert((-score, created_at, seq), entry)
+        index.rank((-score, created_at, seq))  # 0-based position
+        index.slice(0, 10)                     # top 10 values
+    """
+
+    def __init__(self):
+        self._head = _Node(None, None, MAX_LEVEL)
+        self._size = 0
+        # Highest level any node reached; levels above it only link head to the end
+        self._level = 1
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[tuple[K, V]]) -> RankedIndex[K, V]:
+        """Build an index from (key, value) pairs already in ascending key order, in O(n)."""
+        index = cls()
+        tails = [index._head] * MAX_LEVEL
+        tail_positions = [0] * MAX_LEVEL
+        position = 0
+        for key, value in items:
+            position += 1
+            level = _random_level()
+            node = _Node(key, value, level)
+            for lvl in range(level):
+                tail = tails[lvl]
+                tail.next[lvl] = node
+                tail.width[lvl] = position - tail_positions[lvl]
+                tails[lvl] = node
+                tail_positions[lvl] = position
+            index._level = max(index._level, level)
+        for lvl in range(MAX_LEVEL):
+            tails[lvl].width[lvl] = position + 1 - tail_positions[lvl]
+        index._size = position
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[V]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.value
+            node = node.next[0]
+
+    def __getitem__(self, index: int) -> V:
+        return self._node_at(index).value
+
+    def _node_at(self, index: int) -> _Node:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("RankedIndex index out of range")
+        node = self._head
+        remaining = index + 1
+        for lvl in reversed(range(self._level)):
+            while node.next[lvl] is not None and node.width[lvl] <= remaining:
+                remaining -= node.width[lvl]
+                node = node.next[lvl]
+        return node
+
+    def _search(self, key: K) -> tuple[list[_Node], list[int]]:
+        chain = [self._head] * MAX_LEVEL
+        steps_at = [0] * MAX_LEVEL
+        node = self._head
+        steps = 0
+        for lvl in reversed(range(self._level)):
+            following = node.next[lvl]
+            while following is not None and following.key < key:
+                steps += node.width[lvl]
+                node = following
+                following = node.next[lvl]
+            chain[lvl] = node
+            steps_at[lvl] = steps
+        return chain, steps_at
+
+    def insert(self, key: K, value: V) -> int:
+        """Add `key` and return its 0-based position."""
+        chain, steps_at = self._search(key)
+        following = chain[0].next[0]
+        if following is not None and following.key == key:
+            raise KeyError(f"Duplicate key: {key!r}")
+        steps = steps_at[0]
+        level = _random_level()
+        self._level = max(self._level, level)
+        node = _Node(key, value, level)
+        for lvl in range(level):
+            prev = chain[lvl]
+            skipped = steps - steps_at[lvl]
+            node.next[lvl] = prev.next[lvl]
+            prev.next[lvl] = node
+            node.width[lvl] = prev.width[lvl] - skipped
+            prev.width[lvl] = skipped + 1
+        for lvl in range(level, MAX_LEVEL):
+            chain[lvl].width[lvl] += 1
+        self._size += 1
+        return steps
+
+    def remove(self, key: K) -> V:
+        chain, _ = self._search(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        level = len(node.next)
+        for lvl in range(level):
+            prev = chain[lvl]
+            prev.width[lvl] += node.width[lvl] - 1
+            prev.next[lvl] = node.next[lvl]
+        for lvl in range(level, MAX_LEVEL):
+            chain[lvl].width[lvl] -= 1
+        self._size -= 1
+        return node.value
+
+    def rank(self, key: K) -> int:
+        """0-based position of `key`. Raises KeyError if it is not in the index."""
+        chain, steps_at = self._search(key)
+        node = chain[0].next[0]
+        if node is None or node.key != key:
+            raise KeyError(key)
+        return steps_at[0]
+
+    def slice(self, start: int, stop: int) -> list[V]:
+        """Values at positions [start, stop), found in O(log n + stop - start)."""
+        start = max(start, 0)
+        stop = min(stop, self._size)
+        if start >= stop:
+            return []
+        node = self._node_at(start)
+        values = []
+        for _ in range(stop - start):
+            values.append(node.value)
+            node = node.next[0]
+        return values
+
+    def around(self, key: K, count: int) -> tuple[int, list[V]]:
+        """Position of `key` and the values up to `count` places above and below it."""
+        position = self.rank(key)
+        start = max(position - count, 0)
+        return start, self.slice(start, position + count + 1)
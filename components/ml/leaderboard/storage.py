@@ -0,0 +1,158 @@
+"""Durable leaderboard storage shared by every worker process."""
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import ContextManager, Protocol
+
+from ml.leaderboard.core import Entry
+
+
+class Storage(Protocol):
+    """Backend holding one record per user.
+
+    Every write is tagged with an increasing sequence number, so a process can catch up on
+    writes made by other processes without reloading the whole board.
+    """
+
+    def load(self) -> tuple[list[Entry], int]:
+        """All records in rank order, and the sequence number they reflect."""
+        ...
+
+    def changed(self) -> bool:
+        """Cheap check whether another connection wrote since the last call."""
+        ...
+
+    def changes_since(self, seq: int) -> tuple[list[Entry], int] | None:
+        """Records written after `seq` and the new sequence number, or None if the board was reset."""
+        ...
+
+    def transaction(self) -> ContextManager[None]:
+        """Hold the write lock across reading changes and saving, so upserts never interleave."""
+        ...
+
+    def save(self, entries: Sequence[Entry]) -> int:
+        """Upsert records and return the sequence number of the write."""
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    created_ts REAL NOT NULL,
+    seq INTEGER NOT NULL
+);
+-- Covers every loaded column, so a warm start reads the index alone, already in rank order
+CREATE INDEX IF NOT EXISTS entries_rank ON entries (score DESC, created_ts, user_id, username, created_at);
+CREATE INDEX IF NOT EXISTS entries_seq ON entries (seq);
+CREATE TABLE IF NOT EXISTS meta (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    seq INTEGER NOT NULL,
+    generation INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta VALUES (0, 0, 0);
+"""
+
+_COLUMNS = "user_id, username, score, created_at"
+
+
+def _entry(row: tuple) -> Entry:
+    user_id, username, score, created_at = row
+    return Entry(user_id=user_id, username=username, score=score, created_at=datetime.fromisoformat(created_at))
+
+
+class SQLiteStorage:
+    """Embedded SQLite store in WAL mode with an index matching the leaderboard order.
+
+    Readers in other processes are never blocked by a writer, and `load` streams records
+    straight out of the rank index, so a warm start needs no sort.
+
+    Usage:
+        leaderboard.set_storage(SQLiteStorage(Path("out/leaderboard.db")))
+    """
+
+    def __init__(self, path: Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are opened explicitly in `transaction`.
+        # Callers serialize access (ml.leaderboard holds its lock around every call).
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._data_version = self._read_data_version()
+        self._generation = self._meta()[1]
+
+    def _read_data_version(self) -> int:
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _meta(self) -> tuple[int, int]:
+        return self._conn.execute("SELECT seq, generation FROM meta WHERE id = 0").fetchone()
+
+    def load(self) -> tuple[list[Entry], int]:
+        with self.transaction():
+            seq, self._generation = self._meta()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM entries ORDER BY score DESC, created_ts, user_id"
+            ).fetchall()
+        return [_entry(row) for row in rows], seq
+
+    def changed(self) -> bool:
+        data_version = self._read_data_version()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        return True
+
+    def changes_since(self, seq: int) -> tuple[list[Entry], int] | None:
+        latest, generation = self._meta()
+        if generation != self._generation:
+            return None
+        if latest <= seq:
+            return [], seq
+        rows = self._conn.execute(f"SELECT {_COLUMNS} FROM entries WHERE seq > ?", (seq,)).fetchall()
+        return [_entry(row) for row in rows], latest
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        if self._conn.in_transaction:
+            yield
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def save(self, entries: Sequence[Entry]) -> int:
+        with self.transaction():
+            seq = self._conn.execute("UPDATE meta SET seq = seq + 1 WHERE id = 0 RETURNING seq").fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+                "username = excluded.username, score = excluded.score, created_at = excluded.created_at, "
+                "created_ts = excluded.created_ts, seq = excluded.seq",
+                [
+                    (e.user_id, e.username, e.score, e.created_at.isoformat(), e.created_at.timestamp(), seq)
+                    for e in entries
+                ],
+            )
+        return seq
+
+    def clear(self) -> None:
+        with self.transaction():
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("UPDATE meta SET generation = generation + 1 WHERE id = 0")
+            self._generation = self._meta()[1]
+
+    def close(self) -> None:
+        self._conn.close()
@@ -1,4 +1,3 @@
-from ml.llm_labeler.core import LLMLabeler
-
-__all__ = ["LLMLabeler"]
+from ml.llm_labeler.core import LLMLabeler, default_prompts
 
+__all__ = ["LLMLabeler", "default_prompts"]
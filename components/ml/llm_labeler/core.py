@@ -1,19 +1,23 @@
 from __future__ import annotations
-import re
+
+import asyncio
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
 from ml.extractor.schema import LabeledRecord
 from ml.llm.interfaces import LLMClient, LLMMessage, LLMRole
+from ml.metrics import pipeline as pipeline_metrics
+from ml.parser.label_parser import parse_label
+
+if TYPE_CHECKING:
+    from ml.prompt import PromptManager
 
 
 def parse_label_response(response: str) -> dict | None:
-    type_match = re.search(r"혐오표현 유형:\s*([^\n]+)", response)
-    if not type_match:
+    parsed = parse_label(response)
+    if not parsed:
         return None
-    desc_match = re.search(r"설명:\s*([^\n]+(?:\n[^\n]+)*)", response)
-    result = {
-        "type": type_match.group(1).strip(),
-        "description": desc_match.group(1).strip() if desc_match else "",
-    }
-    return result
+    return {"type": parsed.type, "description": parsed.description}
 
 HATE_PROMPT = """다음 텍스트를 분석하여 혐오표현 유형을 분류하세요.
 분류 가능한 유형: 성별혐오, 인종혐오, 종교혐오, 장애혐오, 기타혐오, 없음
@@ -22,18 +26,85 @@ HATE_PROMPT = """다음 텍스트를 분석하여 혐오표현 유형을 분류
 설명: [설명]
 텍스트: {text}"""
 
+HATE_PROMPT_NAME = "hate"
 TEMPERATURE = 0.3
+# LLM calls of one batch in flight at once
+DEFAULT_CONCURRENCY = 4
+
+# langchain message types of rendered prompts
+_ROLES = {"human": LLMRole.USER, "ai": LLMRole.ASSISTANT, "system": LLMRole.SYSTEM}
+
+
+def default_prompts() -> PromptManager:
+    """Prompt manager serving `HATE_PROMPT` as its default prompt."""
+    from ml.prompt import YAMLPromptClient  # langchain is only imported once prompts are rendered
+    from ml.prompt.defaults import DefaultPrompt
+
+    return YAMLPromptClient(
+        prompts_config=[{"name": HATE_PROMPT_NAME, "prompt": HATE_PROMPT}],
+        default_prompt=DefaultPrompt(name=HATE_PROMPT_NAME),
+    )
 
 
 class LLMLabeler:
-    def __init__(self, llm: LLMClient, model_name: str):
+    """Label records with an LLM.
+
+    The prompt is `HATE_PROMPT` unless a prompt manager is given, in which case the prompt
+    named `prompt_name` (the manager's default if None) is rendered with a `text` variable.
+    A batch keeps up to `concurrency` LLM calls in flight.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        model_name: str,
+        prompts: PromptManager | None = None,
+        prompt_name: str | None = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
         self._llm = llm
         self._model_name = model_name
+        self._prompts = prompts
+        self._prompt_name = prompt_name
+        self._concurrency = concurrency
+
+    def render_messages(self, texts: Sequence[str]) -> list[list[LLMMessage]]:
+        """Prompt messages for each text, rendering the template once for the whole batch."""
+        if self._prompts is None:
+            return [[LLMMessage(role=LLMRole.USER, content=HATE_PROMPT.format(text=text))] for text in texts]
+        values = self._prompts.render_batch([{"text": text} for text in texts], name=self._prompt_name)
+        return [
+            [
+                LLMMessage(role=_ROLES.get(message.type, LLMRole.USER), content=message.content)
+                for message in value.to_messages()
+            ]
+            for value in values
+        ]
 
     async def label(self, record_id: str, text: str) -> LabeledRecord:
-        prompt = HATE_PROMPT.format(text=text)
-        messages = [LLMMessage(role=LLMRole.USER, content=prompt)]
-        response = await self._llm.generate(messages, model=self._model_name, temperature=TEMPERATURE)
+        return await self._label_messages(record_id, text, self.render_messages([text])[0])
+
+    async def label_batch(self, records: Sequence[tuple[str, str]]) -> list[LabeledRecord]:
+        """Label (record_id, text) pairs concurrently, rendering all prompts up front; results keep their order."""
+        messages = self.render_messages([text for _, text in records])
+        limit = asyncio.Semaphore(self._concurrency)
+
+        async def label_one(record_id: str, text: str, record_messages: list[LLMMessage]) -> LabeledRecord:
+            async with limit:
+                return await self._label_messages(record_id, text, record_messages)
+
+        return list(
+            await asyncio.gather(
+                *(
+                    label_one(record_id, text, record_messages)
+                    for (record_id, text), record_messages in zip(records, messages)
+                )
+            )
+        )
+
+    async def _label_messages(self, record_id: str, text: str, messages: list[LLMMessage]) -> LabeledRecord:
+        with pipeline_metrics.llm_seconds.time(model=self._model_name):
+            response = await self._llm.generate(messages, model=self._model_name, temperature=TEMPERATURE)
         parsed = parse_label_response(response)
         if not parsed:
             return LabeledRecord(
@@ -0,0 +1,208 @@
+"""
+Batched log shipping to CloudWatch Logs.
+
+Events are queued by the caller and sent by one background thread in PutLogEvents batches,
+so a log line costs a queue put instead of several API calls.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any
+
+# PutLogEvents limits: events per call, and bytes per call counting 26 bytes per event
+MAX_BATCH_EVENTS = 10_000
+MAX_BATCH_BYTES = 1_048_576
+EVENT_OVERHEAD = 26
+MAX_EVENT_BYTES = 256 * 1024 - EVENT_OVERHEAD
+# Events of one call must span less than 24 hours
+MAX_BATCH_SPAN_MS = 24 * 60 * 60 * 1000
+
+# Records of this logger are skipped by CloudWatchHandler, which would otherwise ship its own errors
+logger = logging.getLogger("ml.logging.cloudwatch")
+
+
+def _error_code(error: Exception) -> str:
+    """The AWS error code of a botocore ClientError, or the exception class name."""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") or type(error).__name__
+
+
+class CloudWatchShipper:
+    """Background thread batching log events into PutLogEvents calls.
+
+    A batch is sent when it reaches the count or size limit, when `flush_interval` passes,
+    on `flush()` and on `close()`. The log group and stream are created once; a failed
+    batch is retried with exponential backoff and counted in `failed` once retries run out.
+    When the queue is full new events are dropped rather than blocking the caller.
+
+    Usage:
+        shipper = CloudWatchShipper(boto3.client("logs"), "ml", "ingest")
+        shipper.put("message")
+        shipper.close()
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        log_group_name: str,
+        log_stream_name: str,
+        flush_interval: float = 5.0,
+        max_queue: int = 100_000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.client = client
+        self.log_group_name = log_group_name
+        self.log_stream_name = log_stream_name
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._ready = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=f"cloudwatch-{log_stream_name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, message: str, timestamp: int | None = None) -> bool:
+        """Queue one event; `timestamp` is in epoch milliseconds. False if it was dropped."""
+        if self._closed:
+            return False
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        encoded = message.encode("utf-8")
+        if len(encoded) > MAX_EVENT_BYTES:
+            message = encoded[:MAX_EVENT_BYTES].decode("utf-8", errors="ignore")
+        try:
+            self._queue.put_nowait((timestamp, message))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Send everything queued so far; False if the thread did not finish within `timeout`."""
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float | None = 10.0) -> None:
+        """Send the remaining events and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        batch: list[tuple[int, str]] = []
+        size = 0
+        # Oldest and newest timestamp of the batch; events may arrive out of order
+        first = last = 0
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = ()
+
+            if isinstance(item, tuple) and item:
+                timestamp, message = item
+                event_size = len(message.encode("utf-8")) + EVENT_OVERHEAD
+                if batch and (
+                    len(batch) >= MAX_BATCH_EVENTS
+                    or size + event_size > MAX_BATCH_BYTES
+                    or max(last, timestamp) - min(first, timestamp) >= MAX_BATCH_SPAN_MS
+                ):
+                    self._send(batch)
+                    batch, size = [], 0
+                if not batch:
+                    first = last = timestamp
+                first, last = min(first, timestamp), max(last, timestamp)
+                batch.append(item)
+                size += event_size
+                if time.monotonic() < deadline:
+                    continue
+
+            # Interval passed, flush requested or shutting down
+            if batch:
+                self._send(batch)
+                batch, size = [], 0
+            deadline = time.monotonic() + self.flush_interval
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _ensure_destination(self) -> None:
+        if self._ready:
+            return
+        for create, kwargs in (
+            (self.client.create_log_group, {"logGroupName": self.log_group_name}),
+            (
+                self.client.create_log_stream,
+                {"logGroupName": self.log_group_name, "logStreamName": self.log_stream_name},
+            ),
+        ):
+            try:
+                create(**kwargs)
+            except Exception as e:
+                if _error_code(e) != "ResourceAlreadyExistsException":
+                    raise
+        self._ready = True
+
+    def _send(self, batch: list[tuple[int, str]]) -> None:
+        # PutLogEvents needs chronological order; sequence tokens are no longer required
+        events = [{"timestamp": timestamp, "message": message} for timestamp, message in sorted(batch)]
+        for attempt in range(self.max_retries + 1):
+            try:
+                self._ensure_destination()
+                response = self.client.put_log_events(
+                    logGroupName=self.log_group_name, logStreamName=self.log_stream_name, logEvents=events
+                )
+                rejected = (response or {}).get("rejectedLogEventsInfo")
+                if rejected:
+                    logger.warning("CloudWatch rejected events of %s: %s", self.log_stream_name, rejected)
+                self.sent += len(events)
+                return
+            except Exception as e:
+                if _error_code(e) == "ResourceNotFoundException":
+                    # Group or stream was deleted, create it again on the next attempt
+                    self._ready = False
+                if attempt == self.max_retries:
+                    self.failed += len(events)
+                    logger.error("Dropping %d events for %s: %s", len(events), self.log_stream_name, e)
+                    return
+                time.sleep(self.retry_backoff * 2**attempt)
+
+
+class CloudWatchHandler(logging.Handler):
+    """Logging handler shipping formatted records through a `CloudWatchShipper`."""
+
+    def __init__(self, shipper: CloudWatchShipper, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.shipper = shipper
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.name == logger.name:
+            return
+        try:
+            self.shipper.put(self.format(record), int(record.created * 1000))
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.shipper.flush()
+
+    def close(self) -> None:
+        self.shipper.close()
+        super().close()
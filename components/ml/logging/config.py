@@ -2,10 +2,26 @@
 Logging configuration.
 
 This module provides centralized logging configuration for the Mercury platform.
+
+Two modes are available:
+
+- ``text`` (default): a synchronous ``StreamHandler`` with a human readable format.
+- ``structured``: one JSON object per line, written by a ``QueueListener`` thread so the
+  caller only enqueues the record. Repeated lines from one call site at INFO and below
+  are rate limited, so per-record logging cannot throttle a pipeline.
+
+The mode is read from the ``LOG_MODE`` env variable unless passed explicitly.
 """
 
+import atexit
+import copy
+import json
 import logging
 import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 fmt = "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
 datefmt = "%Y-%m-%d %H:%M:%S"
@@ -17,16 +33,144 @@ log_level = os.environ.get("LOG_LEVEL", default_log_level)
 if isinstance(log_level, str) and log_level in log_level_map:
     log_level = log_level_map.get(log_level, default_log_level)
 
+default_log_mode = os.environ.get("LOG_MODE", "text")
+# Lines per second allowed from one call site in structured mode; 0 disables the limit
+default_rate_limit = float(os.environ.get("LOG_RATE_LIMIT", 10))
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_handler: logging.Handler | None = None
+_listener: QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including fields passed via `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback apart from the message.
+
+    The stock `prepare` folds the formatted traceback into `msg`, so `JsonFormatter` could
+    never emit its `exc_info` field. Here the traceback is formatted into `exc_text`, which
+    survives the queue, and the message keeps only the merged arguments.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
 
-def configure_logging():
-    """Configure root logger with consistent formatting."""
+
+class RateLimitFilter(logging.Filter):
+    """Token bucket per call site (logger name and message template).
+
+    Records at WARNING and above always pass. The next record to pass after some were
+    dropped carries a `suppressed` count, so the volume is still visible.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        # Per call site: tokens left, last refill time, records dropped since the last pass
+        self._buckets: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = int(bucket[2])
+                bucket[2] = 0
+        return True
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(mode: str | None = None, rate_limit: float | None = None):
+    """Configure root logger with consistent formatting.
+
+    Calling it again switches mode: the handler installed by a previous call is replaced,
+    handlers added by others (e.g. pytest) are left alone. If such handlers exist, no handler
+    is installed, which structured mode reports with a warning.
+
+    Args:
+        mode: "text" or "structured"; defaults to the LOG_MODE env variable
+        rate_limit: Lines per second per call site in structured mode; defaults to LOG_RATE_LIMIT
+    """
+    global _handler, _listener
+    mode = mode or default_log_mode
+    if mode not in ("text", "structured"):
+        raise ValueError(f"Unknown log mode: {mode}")
     root_logger = logging.getLogger()
 
+    if _handler is not None:
+        root_logger.removeHandler(_handler)
+        _stop_listener()
+        _handler = None
+
     if not root_logger.handlers:
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter(fmt=fmt, datefmt=datefmt)
-        handler.setFormatter(formatter)
-        root_logger.addHandler(handler)
+        stream_handler = logging.StreamHandler()
+        if mode == "text":
+            stream_handler.setFormatter(logging.Formatter(fmt=fmt, datefmt=datefmt))
+            _handler = stream_handler
+        else:
+            stream_handler.setFormatter(JsonFormatter())
+            log_queue = queue.SimpleQueue()
+            _handler = StructuredQueueHandler(log_queue)
+            rate_limit = default_rate_limit if rate_limit is None else rate_limit
+            if rate_limit > 0:
+                # On the queue side, so dropped records are never formatted or enqueued
+                _handler.addFilter(RateLimitFilter(rate_limit))
+            _listener = QueueListener(log_queue, stream_handler)
+            _listener.start()
+        root_logger.addHandler(_handler)
+    elif mode == "structured":
+        logging.getLogger(__name__).warning(
+            "Structured logging not installed: the root logger already has handlers %s", root_logger.handlers
+        )
 
     root_logger.setLevel(log_level)
 
+
+# Flush queued records before the interpreter exits
+atexit.register(_stop_listener)
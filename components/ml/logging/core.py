@@ -5,9 +5,9 @@ This module provides consistent logging configuration across the Mercury platfor
 """
 
 import logging
-import time
 from datetime import datetime, timedelta
 
+from ml.logging.cloudwatch import CloudWatchShipper
 from ml.logging.config import configure_logging
 
 # Configure root logger on import
@@ -45,6 +45,8 @@ class CloudWatchLogger:
         if cls._instance is None:
             cls._instance = super(CloudWatchLogger, cls).__new__(cls)
             cls._instance.client = boto3.client("logs", *args, **kwargs)
+            # One batching shipper per (log group, log stream)
+            cls._instance._shippers = {}
         return cls._instance
 
     @property
@@ -63,52 +65,32 @@ class CloudWatchLogger:
     def log_stream_name(self, log_stream_name: str):
         self._log_stream_name = log_stream_name
 
-    def write(self, message: str):
+    def _get_shipper(self) -> CloudWatchShipper:
+        key = (self._log_group_name, self._log_stream_name)
+        if key not in self._shippers:
+            self._shippers[key] = CloudWatchShipper(self.client, *key)
+        return self._shippers[key]
+
+    def write(self, message: str) -> bool:
         """Write log to Cloud Watch
 
+        The event is queued and sent in a batch by a background thread; call `flush` to
+        wait until everything written so far has been shipped.
+
         Args:
             message (str): Log message
+
+        Returns:
+            bool: Whether the event was queued. Events are no longer sent synchronously, so the
+            `put_log_events` response earlier versions returned is not available; rejected
+            events are logged and failed batches are counted by the shipper.
         """
+        return self._get_shipper().put(message)
 
-        # Create log group if it doesn't exist
-        try:
-            self.client.create_log_group(logGroupName=self._log_group_name)
-        except self.client.exceptions.ResourceAlreadyExistsException:
-            pass
-
-        # Create log stream if it doesn't exist
-        try:
-            self.client.create_log_stream(logGroupName=self._log_group_name, logStreamName=self._log_stream_name)
-        except self.client.exceptions.ResourceAlreadyExistsException:
-            pass
-
-        # Prepare log event
-        log_event = {
-            "timestamp": int(time.time() * 1000),  # Current time in milliseconds
-            "message": message,
-        }
-
-        # Get the next sequence token
-        response = self.client.describe_log_streams(
-            logGroupName=self._log_group_name, logStreamNamePrefix=self._log_stream_name
-        )
-        log_streams = response["logStreams"]
-        if log_streams:
-            next_sequence_token = log_streams[0].get("uploadSequenceToken")
-        else:
-            next_sequence_token = None
-
-        # Send log event
-        kwargs = {
-            "logGroupName": self._log_group_name,
-            "logStreamName": self._log_stream_name,
-            "logEvents": [log_event],
-        }
-
-        if next_sequence_token:
-            kwargs["sequenceToken"] = next_sequence_token
-
-        return self.client.put_log_events(**kwargs)
+    def flush(self):
+        """Send all queued log events to Cloud Watch."""
+        for shipper in self._shippers.values():
+            shipper.flush()
 
     def read(self, query: str, start_time: datetime = None, end_time: datetime = None):
         """Read logs from Cloud Watch
@@ -0,0 +1,15 @@
+"""Metrics shared by the datalake pipeline stages."""
+from ml.metrics.core import counter, gauge, histogram
+
+records_total = counter("pipeline_records_total", "Records written by each pipeline stage", ("stage",))
+records_per_second = gauge(
+    "pipeline_records_per_second", "Throughput of the last completed run of each stage", ("stage",)
+)
+queue_depth = gauge("pipeline_queue_depth", "Records waiting in front of each streaming stage", ("stage",))
+inference_seconds = histogram("classifier_inference_seconds", "Classifier latency per record")
+llm_seconds = histogram("llm_request_duration_seconds", "LLM labeling latency per record", ("model",))
+
+
+def record_batch(stage: str, count: int, seconds: float) -> None:
+    """Publish the throughput of a finished batch run."""
+    records_per_second.set(count / seconds if seconds > 0 else 0.0, stage=stage)
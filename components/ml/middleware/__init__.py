@@ -1,4 +1,3 @@
-from ml.middleware.core import RequestID, Timing, setup_middleware
-
-__all__ = ["RequestID", "Timing", "setup_middleware"]
+from ml.middleware.core import RequestID, Timing, cors_settings, setup_middleware
 
+__all__ = ["RequestID", "Timing", "cors_settings", "setup_middleware"]
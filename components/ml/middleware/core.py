@@ -1,59 +1,111 @@
-"""FastAPI middleware setup."""
+"""FastAPI middleware setup.
+
+The middleware classes are plain ASGI apps: they only wrap `send`, so responses stream
+through untouched and no extra task or body buffering is added per request.
+"""
 import time
 import uuid
-from typing import Callable
 
-from fastapi import FastAPI, Request, Response
-from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import FastAPI
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from ml import config, log
+from ml import config, logging, metrics
 
 settings = config.get_settings()
-logger = log.get_logger("middleware")
+logger = logging.get_logger("middleware")
+request_seconds = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+)
+
+# CORS policy of the services using this middleware: any origin, with credentials.
+# Pass it to `ml.fastapilite.create_app` as `cors_override`.
+cors_settings = {
+    "allow_origins": ["*"],
+    "allow_credentials": True,
+    "allow_methods": ["*"],
+    "allow_headers": ["*"],
+}
+
+
+class RequestID:
+    """Add request ID to requests and responses.
+
+    An incoming X-Request-ID header is kept, so IDs can be traced across services.
+    """
 
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-class RequestID(BaseHTTPMiddleware):
-    """Add request ID to requests and responses."""
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
+        await self.app(scope, receive, send_with_request_id)
 
-class Timing(BaseHTTPMiddleware):
+
+class Timing:
     """Log request timing."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+            await send(message)
 
-        response.headers["X-Process-Time"] = str(process_time)
-        logger.info(
-            "%s %s - %s - %.3fs",
-            request.method,
-            request.url.path,
-            response.status_code,
-            process_time,
-            extra={"request_id": getattr(request.state, "request_id", None)},
-        )
-        return response
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # The route template keeps label cardinality bounded; unmatched paths share one label
+            route = getattr(scope.get("route"), "path", "unmatched")
+            elapsed = time.perf_counter() - start_time
+            request_seconds.observe(elapsed, method=scope["method"], route=route, status=str(status_code))
+            logger.info(
+                "%s %s - %s - %.3fs",
+                scope["method"],
+                scope["path"],
+                status_code,
+                elapsed,
+                extra={"request_id": scope.get("state", {}).get("request_id")},
+            )
 
 
 def setup_middleware(app: FastAPI) -> None:
-    """Setup all middleware for the FastAPI app."""
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-    app.add_middleware(RequestID)
-    app.add_middleware(Timing)
+    """Setup all middleware for the FastAPI app.
 
+    CORS is installed by `ml.fastapilite.create_app` (with `cors_override=cors_settings`
+    for the policy above), so it is not added again here. Calling this twice does not
+    stack the middleware.
+    """
+    installed = {middleware.cls for middleware in app.user_middleware}
+    # Added last runs first: RequestID sets the ID before Timing logs it
+    for middleware in (Timing, RequestID):
+        if middleware not in installed:
+            app.add_middleware(middleware)
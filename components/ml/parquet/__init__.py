@@ -0,0 +1,3 @@
+from ml.parquet.core import convert_jsonl, convert_layer, read_layer, schema_for, write_records
+
+__all__ = ["convert_jsonl", "convert_layer", "read_layer", "schema_for", "write_records"]
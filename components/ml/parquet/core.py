@@ -0,0 +1,115 @@
+"""Columnar Parquet storage for datalake partitions."""
+from __future__ import annotations
+
+import json
+import types
+import typing
+from collections.abc import Iterable
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from ml.json.partition import list_parts
+
+COMPRESSION = "zstd"
+BATCH_SIZE = 10_000
+
+_SCALAR_TYPES: dict[type, pa.DataType] = {
+    str: pa.string(),
+    float: pa.float64(),
+    int: pa.int64(),
+    bool: pa.bool_(),
+}
+_PARTITIONING = ds.partitioning(pa.schema([("dt", pa.string())]), flavor="hive")
+
+
+def _arrow_type(tp: typing.Any) -> pa.DataType:
+    origin = typing.get_origin(tp)
+    if origin in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+        return _arrow_type(args[0])
+    if origin is list:
+        return pa.list_(_arrow_type(typing.get_args(tp)[0]))
+    if tp is dict or origin is dict:
+        return pa.map_(pa.string(), pa.string())
+    return _SCALAR_TYPES[tp]
+
+
+def schema_for(record_type: type) -> pa.Schema:
+    """Derive an Arrow schema from a record TypedDict (CleanRecord, ClassifiedRecord, ...)."""
+    hints = typing.get_type_hints(record_type)
+    return pa.schema([pa.field(name, _arrow_type(tp)) for name, tp in hints.items()])
+
+
+def write_records(path: Path, records: Iterable[dict], record_type: type) -> int:
+    """Write records to a compressed Parquet file in bounded batches. Returns the row count."""
+    schema = schema_for(record_type)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    count = 0
+    batch: list[dict] = []
+    with pq.ParquetWriter(tmp_path, schema, compression=COMPRESSION) as writer:
+        for record in records:
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    tmp_path.replace(path)
+    return count
+
+
+def _iter_jsonl(path: Path) -> Iterable[dict]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def convert_jsonl(jsonl_path: Path, record_type: type) -> Path:
+    """Write a Parquet copy next to a JSONL part (part-0001.jsonl -> part-0001.parquet)."""
+    parquet_path = jsonl_path.with_suffix(".parquet")
+    write_records(parquet_path, _iter_jsonl(jsonl_path), record_type)
+    return parquet_path
+
+
+def _committed_parts(layer_dir: Path) -> list[Path]:
+    return [part for partition_dir in sorted(layer_dir.glob("dt=*")) for part in list_parts(partition_dir)]
+
+
+def convert_layer(layer_dir: Path, record_type: type, overwrite: bool = False) -> int:
+    """Convert the committed JSONL parts of every dt= partition under a layer. Returns the number of files written."""
+    converted = 0
+    for jsonl_path in _committed_parts(layer_dir):
+        parquet_path = jsonl_path.with_suffix(".parquet")
+        if (
+            not overwrite
+            and parquet_path.exists()
+            and parquet_path.stat().st_mtime >= jsonl_path.stat().st_mtime
+        ):
+            continue
+        convert_jsonl(jsonl_path, record_type)
+        converted += 1
+    return converted
+
+
+def read_layer(
+    layer_dir: Path,
+    columns: list[str] | None = None,
+    filter: ds.Expression | None = None,
+) -> pa.Table:
+    """Read Parquet partitions of a layer with column projection and predicate pushdown.
+
+    `dt` is exposed as a partition column, so `ds.field("dt") >= "2026-01-01"` prunes whole
+    directories and `ds.field("score") >= 0.5` is pushed down to row-group statistics.
+    """
+    files = [str(path) for path in (p.with_suffix(".parquet") for p in _committed_parts(layer_dir)) if path.exists()]
+    if not files:
+        return pa.table({})
+    dataset = ds.dataset(files, format="parquet", partitioning=_PARTITIONING, partition_base_dir=str(layer_dir))
+    return dataset.to_table(columns=columns, filter=filter)
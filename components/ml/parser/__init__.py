@@ -1,4 +1,5 @@
 from ml.parser.code_parser import CodeParser, parse_out_code
+from ml.parser.label_parser import LabelResponse, parse_label
 from ml.parser.stopword_parser import StopwordOutputParser
 
-__all__ = ["CodeParser", "StopwordOutputParser", "parse_out_code"]
+__all__ = ["CodeParser", "LabelResponse", "StopwordOutputParser", "parse_label", "parse_out_code"]
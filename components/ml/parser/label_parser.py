@@ -0,0 +1,77 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+TYPE_LABEL = "혐오표현 유형:"
+DESCRIPTION_LABEL = "설명:"
+NUANCE_LABEL = "뉘앙스:"
+LEVEL_LABEL = "혐오 수준:"
+REASON_LABEL = "이유:"
+
+_SPACE = re.compile(r"\s*")
+
+
+@dataclass(frozen=True, slots=True)
+class LabelResponse:
+    """Fields of an LLM labeling response; None where the label is absent."""
+
+    type: str
+    description: str = ""
+    nuance: Optional[str] = None
+    hate_level: Optional[str] = None
+    reason: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """The dict of `ml.labeler.parser.parse_label_response`: the detail fields only with a nuance or level."""
+        result = {"type": self.type, "description": self.description}
+        if self.nuance is not None or self.hate_level is not None:
+            result.update({"nuance": self.nuance, "hate_level": self.hate_level, "reason": self.reason})
+        return result
+
+
+def _value(text: str, start: int, multiline: bool) -> Optional[str]:
+    """Value after a label, like `\\s*([^\\n]+)` or, multiline, `\\s*([^\\n]+(?:\\n[^\\n]+)*)`."""
+    n = len(text)
+    i = _SPACE.match(text, start).end()
+    if i == n:
+        # Only whitespace follows: the pattern still matches a trailing non-newline space, which strips to ""
+        return "" if text.count("\n", start) < n - start else None
+    end = text.find("\n", i)
+    if end == -1:
+        return text[i:].strip()
+    if multiline:
+        # Continue over following lines until an empty line or the end
+        while end + 1 < n and text[end + 1] != "\n":
+            end = text.find("\n", end + 1)
+            if end == -1:
+                end = n
+                break
+    return text[i:end].strip()
+
+
+def parse_label(response: str) -> Optional[LabelResponse]:
+    """Parse a labeling response in time linear in its length, without backtracking.
+
+    Each field takes the first occurrence of its label, like `re.search`; labels are found by
+    literal search and every value is read with a single forward pass. The description and
+    reason run over the following lines up to the first empty line. Returns None without a
+    hate speech type.
+    """
+    start = response.find(TYPE_LABEL)
+    if start == -1:
+        return None
+    hate_type = _value(response, start + len(TYPE_LABEL), False)
+    if hate_type is None:
+        return None
+
+    def field(label: str, multiline: bool = False) -> Optional[str]:
+        start = response.find(label)
+        return None if start == -1 else _value(response, start + len(label), multiline)
+
+    return LabelResponse(
+        type=hate_type,
+        description=field(DESCRIPTION_LABEL, multiline=True) or "",
+        nuance=field(NUANCE_LABEL),
+        hate_level=field(LEVEL_LABEL),
+        reason=field(REASON_LABEL, multiline=True),
+    )
@@ -1,10 +1,6 @@
-from ml.prompt.core import (
-    ConfigurablePromptTemplate,
-    LangfusePromptClient,
-    PromptManager,
-    YAMLPromptClient,
-    get_prompt_client,
-)
+from typing import TYPE_CHECKING
+
+from ml.prompt.cache import TemplateCache
 
 from .constants import (
     PROMPT_NAME,
@@ -13,6 +9,35 @@ from .constants import (
     SYSTEM_MESSAGE_CLASSIFIER,
 )
 
+if TYPE_CHECKING:
+    from ml.prompt.core import (
+        ConfigurablePromptTemplate,
+        LangfusePromptClient,
+        PromptManager,
+        YAMLPromptClient,
+        compile_prompt,
+        get_prompt_client,
+    )
+
+# ml.prompt.core pulls in langchain and langfuse, so it is imported on first attribute access
+_CORE_NAMES = {
+    "ConfigurablePromptTemplate",
+    "LangfusePromptClient",
+    "PromptManager",
+    "YAMLPromptClient",
+    "compile_prompt",
+    "get_prompt_client",
+}
+
+
+def __getattr__(name: str):
+    if name in _CORE_NAMES:
+        from ml.prompt import core
+
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "YAMLPromptClient",
     "LangfusePromptClient",
@@ -23,4 +48,6 @@ __all__ = [
     "PROMPT_NAME",
     "SYSTEM_MESSAGE_CLASSIFIER",
     "get_prompt_client",
+    "compile_prompt",
+    "TemplateCache",
 ]
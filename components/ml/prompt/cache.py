@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from ml.logging import get_logger
+
+logger = get_logger("prompt-cache")
+
+
+class TemplateCache:
+    """Stale-while-revalidate cache of compiled prompt templates keyed by (name, version, label).
+
+    A fresh entry is returned as is. An entry older than `ttl` is still returned, while a
+    single background refresh per key replaces it; a failed refresh keeps serving the stale
+    entry for another `ttl`. Only a missing entry is loaded on the caller's thread, so after
+    the first use a prompt lookup never waits on the network. `ttl=None` never refreshes.
+
+    Usage:
+        cache = TemplateCache(ttl=60)
+        template = cache.get(("classifier", None, "production"), load)
+    """
+
+    def __init__(self, ttl: Optional[float] = 60.0, max_workers: int = 2):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        # Per key: compiled template and monotonic load time
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._refreshing: Set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, key: Hashable, load: Callable[[], Any], refresh: Optional[Callable[[], Any]] = None) -> Any:
+        """Cached value of `key`; `load` builds a missing entry, `refresh` (default `load`) a stale one."""
+        entry = self._entries.get(key)
+        if entry is None:
+            value = load()
+            self._entries[key] = (value, time.monotonic())
+            return value
+        value, loaded_at = entry
+        if self.ttl is not None and time.monotonic() - loaded_at >= self.ttl:
+            self._schedule_refresh(key, refresh or load)
+        return value
+
+    def _schedule_refresh(self, key: Hashable, load: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="prompt-refresh")
+        self._executor.submit(self._refresh, key, load)
+
+    def _refresh(self, key: Hashable, load: Callable[[], Any]) -> None:
+        try:
+            value = load()
+        except Exception as e:
+            logger.warning("Refreshing prompt %s failed, serving the cached version: %s", key, e)
+            entry = self._entries.get(key)
+            value = entry[0] if entry is not None else None
+        with self._lock:
+            if value is not None:
+                self._entries[key] = (value, time.monotonic())
+            self._refreshing.discard(key)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop `key`, or every entry, so the next lookup loads it again."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
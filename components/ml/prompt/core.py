@@ -1,19 +1,21 @@
 from abc import ABC, abstractmethod
 from functools import lru_cache
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
-from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
-from langchain_core.prompts.string import mustache_template_vars
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import BasePromptTemplate, ChatPromptTemplate, PromptTemplate
+from langchain_core.prompts.string import StringPromptTemplate, get_template_variables, mustache_template_vars
 from langchain_core.runnables import ConfigurableField, Runnable, RunnableConfig
 from langchain_core.runnables.configurable import RunnableConfigurableFields
 from langchain_core.runnables.utils import Input, Output
 from langfuse import Langfuse
 from langfuse.api import BasePrompt, TextPrompt
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 from starlette.exceptions import HTTPException
 
 from ml.config import BaseConfig, create_config
 from ml.logging import get_logger
+from ml.prompt.cache import TemplateCache
 from ml.prompt.constants import (
     MUSTACHE,
     PROMPT_NAME,
@@ -37,20 +39,73 @@ class ChatPrompt(BasePrompt):
 Prompt = Union[ChatPrompt, TextPrompt]
 
 
+def compile_prompt(prompt: Prompt) -> BasePromptTemplate:
+    """Build the langchain template of a prompt; chat prompts use mustache variables."""
+    if isinstance(prompt.prompt, List):
+        return ChatPromptTemplate.from_messages(messages=prompt.prompt, template_format="mustache")
+    return PromptTemplate.from_template(template=prompt.prompt)
+
+
 class PromptManager(BaseModel, Runnable, ABC):
+    _templates: Optional[TemplateCache] = PrivateAttr(default=None)
+
     @abstractmethod
     def get_prompt(self, name: str = None, version: int = None, **kwargs) -> Prompt:
         pass
 
+    def _template_ttl(self) -> Optional[float]:
+        """Seconds before a compiled template is refreshed in the background; None never refreshes."""
+        return None
+
+    def _fetch_prompt(self, name: str = None, version: int = None, label: str = None) -> Prompt:
+        """Fetch a prompt bypassing any client-side cache; used to refresh compiled templates."""
+        return self.get_prompt(name=name, version=version, label=label)
+
+    def get_template(self, name: str = None, version: int = None, label: str = None) -> BasePromptTemplate:
+        """Compiled template of a prompt, reused across invocations."""
+        if self._templates is None:
+            self._templates = TemplateCache(ttl=self._template_ttl())
+        return self._templates.get(
+            (name, version, label),
+            lambda: compile_prompt(self.get_prompt(name=name, version=version, label=label)),
+            refresh=lambda: compile_prompt(self._fetch_prompt(name=name, version=version, label=label)),
+        )
+
+    def render_batch(
+        self, inputs: Sequence[Dict[str, Any]], name: str = None, version: int = None, label: str = None
+    ) -> List[PromptValue]:
+        """Render one prompt for many inputs.
+
+        The prompt is resolved and compiled once and the variables are validated once for the
+        whole batch; each input is then formatted directly, without the per-call Runnable
+        machinery of `invoke`.
+
+        Raises:
+            ValueError: If a template variable is missing from any of the inputs, or an input
+                has a variable the template does not use.
+        """
+        template = self.get_template(name=name, version=version, label=label)
+        if not inputs:
+            return []
+        text, template_format = _template_source(template)
+        # The helpers are named from the template's point of view: "unsupported" template variables
+        # are those the inputs do not supply, "missing" ones are inputs the template does not use
+        missing = get_unsupported_variables(text, set(inputs[0]).intersection(*inputs[1:]), template_format)
+        if missing:
+            raise ValueError(f"Inputs for prompt '{name}' are missing variables: {sorted(missing)}")
+        unsupported = get_missing_variables(text, set().union(*inputs), template_format)
+        if unsupported:
+            raise ValueError(f"Inputs for prompt '{name}' have unsupported variables: {sorted(unsupported)}")
+        return [template.format_prompt(**input) for input in inputs]
+
+    def invalidate_templates(self) -> None:
+        """Drop compiled templates, e.g. after a prompt was updated."""
+        if self._templates is not None:
+            self._templates.invalidate()
+
     def invoke(self, input: Input, config: Optional[RunnableConfig] = None) -> Output:
         prompt_name = input.get("prompt_name")
-
-        prompt_template = self.get_prompt(name=prompt_name).prompt
-        if isinstance(prompt_template, List):
-            return ChatPromptTemplate.from_messages(messages=prompt_template, template_format="mustache").invoke(
-                input, config
-            )
-        return PromptTemplate.from_template(template=prompt_template).invoke(input, config)
+        return self.get_template(name=prompt_name).invoke(input, config)
 
 
 class YAMLPromptClient(PromptManager):
@@ -68,7 +123,12 @@ class YAMLPromptClient(PromptManager):
                 self.prompts[topic.name] = topic
             elif isinstance(topic.get("prompt"), List):
                 self.prompts[topic.get("name")] = ChatPrompt(
-                    name=topic.get("name"), prompt=topic.get("prompt"), labels=[], version=1, tags=[]
+                    name=topic.get("name"),
+                    prompt=topic.get("prompt"),
+                    config=topic.get("config", {}),
+                    labels=[],
+                    version=1,
+                    tags=[],
                 )
             elif isinstance(topic.get("prompt"), str):
                 name = topic["name"]
@@ -105,7 +165,7 @@ class LangfusePromptClient(PromptManager):
 
     def __init__(self, config: Optional[Any] = None, **data: Any):
         super().__init__(**data)
-        self.client = data.get("client", Langfuse())
+        self.client = data.get("client") or Langfuse()
         self.default_prompt = data.get("default_prompt")
 
         # Call create_config only once
@@ -129,19 +189,32 @@ class LangfusePromptClient(PromptManager):
             else:
                 self.cache_ttl_seconds = 60
 
+    def _template_ttl(self) -> Optional[float]:
+        return self.cache_ttl_seconds
+
+    def _fetch_prompt(self, name: str = None, version: int = None, label: str = None) -> Prompt:
+        # A zero TTL makes the Langfuse client fetch instead of returning its own stale copy
+        return self.get_prompt(name=name, version=version, label=label, cache_ttl_seconds=0)
+
     def get_prompt(self, name: str = None, version: int = None, **kwargs) -> Prompt:
+        label = kwargs.get("label")
         if self.default_prompt is not None:
             # Set default prompt name and version if not passed
             if name is None:
                 name = self.default_prompt.name
-            # Only use default version if name matches default
+            # Only use default version and label if name matches default
             if version is None and name == self.default_prompt.name:
                 version = self.default_prompt.version
+            if label is None and name == self.default_prompt.name:
+                label = self.default_prompt.label
+        cache_ttl_seconds = kwargs.get("cache_ttl_seconds")
         try:
             langfuse_prompt = self.client.get_prompt(
                 name,
                 version=version,
-                cache_ttl_seconds=kwargs.get("cache_ttl_seconds") or self.cache_ttl_seconds,
+                # Langfuse resolves either a version or a label
+                label=label if version is None else None,
+                cache_ttl_seconds=self.cache_ttl_seconds if cache_ttl_seconds is None else cache_ttl_seconds,
             )
         except Exception:
             raise HTTPException(status_code=400, detail=f"Topic not supported. Received: {name}")
@@ -166,7 +239,7 @@ def get_prompt_client(config: BaseConfig, prompt_index: int = None, prompt_name:
     default_prompt = get_default_prompt(config, index=prompt_index, name=prompt_name)
 
     if not config.prompt_client or config.prompt_client == "langfuse":
-        return LangfusePromptClient(default_prompt=default_prompt)
+        return LangfusePromptClient(config=config, default_prompt=default_prompt)
     elif config.prompt_client == "yaml":
         return YAMLPromptClient(prompts_config=config.prompt_templates, default_prompt=default_prompt)
     else:
@@ -240,11 +313,32 @@ def _mustache_template_vars(prompt: str):
     return mustache_template_vars(prompt)
 
 
-def get_unsupported_variables(prompt: str, input_variables):
-    variables_in_prompt = _mustache_template_vars(prompt)
+@lru_cache(maxsize=256)
+def _template_vars(prompt: str, template_format: str) -> frozenset:
+    if template_format == MUSTACHE:
+        return frozenset(_mustache_template_vars(prompt))
+    return frozenset(get_template_variables(prompt, template_format))
+
+
+def _template_source(template: BasePromptTemplate) -> Tuple[str, str]:
+    """Text and format of a compiled template; the messages of a chat template are joined."""
+    if isinstance(template, ChatPromptTemplate):
+        texts = [
+            message.prompt.template
+            for message in template.messages
+            if isinstance(getattr(message, "prompt", None), StringPromptTemplate)
+        ]
+        return "\n".join(texts), MUSTACHE
+    return template.template, template.template_format
+
+
+def get_unsupported_variables(prompt: str, input_variables, template_format: str = MUSTACHE):
+    """Variables of the prompt that `input_variables` does not provide."""
+    variables_in_prompt = _template_vars(prompt, template_format)
     return [v for v in variables_in_prompt if v not in input_variables]
 
 
-def get_missing_variables(prompt: str, input_variables):
-    variables_in_prompt = _mustache_template_vars(prompt)
+def get_missing_variables(prompt: str, input_variables, template_format: str = MUSTACHE):
+    """Input variables that the prompt does not use."""
+    variables_in_prompt = _template_vars(prompt, template_format)
     return [v for v in input_variables if v not in variables_in_prompt]
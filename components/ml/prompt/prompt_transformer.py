@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from typing import Any, Dict
 
 from langchain_core.prompts.string import PromptTemplateFormat, get_template_variables
@@ -6,6 +7,12 @@ from langchain_core.prompts.string import PromptTemplateFormat, get_template_var
 from ml.prompt.constants import MUSTACHE
 
 
+@lru_cache(maxsize=256)
+def _template_variables(template: str, template_format: PromptTemplateFormat) -> tuple[str, ...]:
+    # Bounded and shared by all transformers, so long-running jobs do not grow it with every template
+    return tuple(get_template_variables(template, template_format))
+
+
 class BasePromptTransformer(ABC):
     def __init__(self, template_format: PromptTemplateFormat = MUSTACHE, partial_variables: Dict[str, Any] = None):
         """Initialize the transformer with template format and partial variables.
@@ -16,13 +23,10 @@ class BasePromptTransformer(ABC):
         """
         self.template_format = template_format
         self.partial_variables = partial_variables or {}
-        self._cached_variables = {}  # Cache for parsed variables
 
     def get_variables(self, template: str) -> list[str]:
         """Get all variables from the template using LangChain's parser."""
-        if template not in self._cached_variables:
-            self._cached_variables[template] = get_template_variables(template, self.template_format)
-        return self._cached_variables[template]
+        return list(_template_variables(template, self.template_format))
 
     @abstractmethod
     def transform(self, template: str) -> str:
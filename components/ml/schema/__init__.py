@@ -1,4 +1,3 @@
-from ml.schema.leaderboard import LeaderboardEntry
-
-__all__ = ["LeaderboardEntry"]
+from ml.schema.leaderboard import BulkEntryResult, LeaderboardEntry
 
+__all__ = ["BulkEntryResult", "LeaderboardEntry"]
@@ -1,5 +1,6 @@
 """Leaderboard schema models."""
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -15,3 +16,12 @@ class LeaderboardEntry(BaseModel):
     rank: int | None = Field(None, ge=1, description="User rank")
     created_at: datetime | None = Field(None, description="Entry creation timestamp")
 
+
+
+class BulkEntryResult(BaseModel):
+    """Outcome of one item of a bulk submission."""
+
+    index: int = Field(..., ge=0, description="Position of the item in the request")
+    status: Literal["ok", "invalid"] = Field(..., description="Whether the item was applied")
+    entry: LeaderboardEntry | None = Field(None, description="The user's stored record after the item")
+    error: str | None = Field(None, description="Validation error for invalid items")
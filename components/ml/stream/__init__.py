@@ -0,0 +1,3 @@
+from ml.stream.core import Pipeline, Stage, StageStats
+
+__all__ = ["Pipeline", "Stage", "StageStats"]
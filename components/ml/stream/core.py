@@ -0,0 +1,141 @@
+"""In-process streaming of records through stages connected by bounded queues."""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from ml.logging import get_logger
+
+logger = get_logger("stream")
+
+_DONE = object()
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Counters for one stage. Throughput is records processed per second since the first record."""
+
+    name: str
+    processed: int = 0
+    emitted: int = 0
+    errors: int = 0
+    queue_depth: int = 0
+    queue_size: int = 0
+    started_at: float | None = None
+    finished_at: float | None = None
+
+    @property
+    def throughput(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size,
+            "throughput": round(self.throughput, 3),
+        }
+
+
+@dataclass(slots=True)
+class Stage:
+    """A step of the pipeline.
+
+    `fn` receives one record and returns the record to pass downstream, or None to drop it.
+    `concurrency` workers share the stage's input queue.
+    """
+
+    name: str
+    fn: Callable[[Any], Awaitable[Any | None]]
+    concurrency: int = 1
+    stats: StageStats = field(init=False)
+
+    def __post_init__(self):
+        self.stats = StageStats(self.name)
+
+
+class Pipeline:
+    """Connect stages with bounded asyncio queues so every stage runs concurrently with the source.
+
+    A full queue blocks the upstream stage, so memory stays bounded by `maxsize` per stage
+    no matter how fast the source produces.
+
+    Usage:
+        pipeline = Pipeline([Stage("clean", clean), Stage("label", label, concurrency=4)])
+        await pipeline.run(source())
+        logger.info("Stream stats", extra={"stats": pipeline.stats()})
+    """
+
+    def __init__(self, stages: list[Stage], maxsize: int = 100):
+        self._stages = stages
+        self._queues: list[asyncio.Queue] = [asyncio.Queue(maxsize) for _ in stages]
+        for stage, queue in zip(stages, self._queues):
+            stage.stats.queue_size = maxsize
+
+    def stats(self) -> dict[str, dict]:
+        for stage, queue in zip(self._stages, self._queues):
+            stage.stats.queue_depth = queue.qsize()
+        return {stage.name: stage.stats.to_dict() for stage in self._stages}
+
+    async def put(self, record: Any) -> None:
+        """Feed one record into the first stage, waiting while its queue is full."""
+        await self._queues[0].put(record)
+
+    async def run(self, source: AsyncIterator[Any] | None = None) -> None:
+        """Drain `source` (or records fed through `put` until `close`) through every stage."""
+        workers = [
+            [asyncio.create_task(self._work(index)) for _ in range(stage.concurrency)]
+            for index, stage in enumerate(self._stages)
+        ]
+        try:
+            if source is not None:
+                async for record in source:
+                    await self.put(record)
+                await self.close()
+            for index, stage_workers in enumerate(workers):
+                await asyncio.gather(*stage_workers)
+                self._stages[index].stats.finished_at = time.monotonic()
+                if index + 1 < len(self._stages):
+                    for _ in range(self._stages[index + 1].concurrency):
+                        await self._queues[index + 1].put(_DONE)
+        except BaseException:
+            for task in (task for stage_workers in workers for task in stage_workers):
+                task.cancel()
+            raise
+
+    async def close(self) -> None:
+        """Signal that no more records will be fed through `put`."""
+        for _ in range(self._stages[0].concurrency):
+            await self._queues[0].put(_DONE)
+
+    async def _work(self, index: int) -> None:
+        stage = self._stages[index]
+        queue = self._queues[index]
+        downstream = self._queues[index + 1] if index + 1 < len(self._stages) else None
+        while True:
+            record = await queue.get()
+            if record is _DONE:
+                return
+            if stage.stats.started_at is None:
+                stage.stats.started_at = time.monotonic()
+            try:
+                result = await stage.fn(record)
+            except Exception as e:
+                stage.stats.errors += 1
+                logger.exception("Stage %s failed on a record: %s: %s", stage.name, type(e).__name__, e)
+                continue
+            finally:
+                stage.stats.processed += 1
+            if result is None:
+                continue
+            stage.stats.emitted += 1
+            if downstream is not None:
+                await downstream.put(result)
@@ -1,3 +1,4 @@
+from ml.utils.dates import KST, date_range, yesterday
 from ml.utils.retry import retry
 
-__all__ = ["retry"]
+__all__ = ["KST", "date_range", "retry", "yesterday"]
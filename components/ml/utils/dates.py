@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone, tzinfo
+
+# Partitions are cut on Korea Standard Time, the timezone of the crawled galleries
+KST = timezone(timedelta(hours=9))
+
+
+def yesterday(tz: tzinfo = KST) -> str:
+    return (datetime.now(tz) - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def date_range(start: str, end: str) -> list[str]:
+    """Inclusive list of YYYY-MM-DD dates from start to end."""
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    if last < first:
+        raise ValueError(f"end date {end} is before start date {start}")
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
@@ -0,0 +1,51 @@
+"""POST /leaderboard throughput with and without the verified-token cache.
+
+Usage:
+    PYTHONPATH=components:bases python development/auth_cache_bench.py [requests]
+"""
+import asyncio
+import logging
+import os
+import sys
+import time
+
+import httpx
+from jose import jwt
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+
+from ml import auth, leaderboard  # noqa: E402
+from ml.leaderboard_api import core  # noqa: E402
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 3_000
+
+
+async def _measure(label: str, client: httpx.AsyncClient) -> None:
+    leaderboard.clear()
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        response = await client.post("/leaderboard", json={"user_id": f"user{i}", "username": "bench", "score": i})
+        assert response.status_code == 200, response.text
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {REQUESTS / elapsed:>8.0f} req/s  {auth.token_cache.stats()}")
+
+
+async def main() -> None:
+    for name in ("middleware", "httpx", "leaderboard-FastAPI-logger"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    token = jwt.encode(
+        {"sub": "bench", "exp": int(time.time()) + 3600}, os.environ["JWT_SECRET_KEY"], algorithm=core.settings.jwt_algorithm
+    )
+    transport = httpx.ASGITransport(app=core.app)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        maxsize = auth.token_cache.maxsize
+        auth.token_cache.maxsize = 0
+        await _measure("no cache", client)
+        auth.token_cache.maxsize = maxsize
+        auth.token_cache.clear()
+        await _measure("cache", client)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""Startup import time of each entry point, parsed from `python -X importtime`.
+
+Each entry module is imported in a fresh interpreter; the best of several runs is compared
+with its budget. Exits with status 1 when an entry point is over budget or imports one of
+the heavy dependencies at startup, which are meant to load on first use.
+
+Usage:
+    PYTHONPATH=components:bases python development/import_time_bench.py [runs]
+"""
+import os
+import re
+import subprocess
+import sys
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+# Milliseconds of cumulative import time, roughly twice the measured time to absorb noise
+ENTRY_POINTS = {
+    "ml.hate_speech_pipeline.core": 800,
+    "ml.hate_classification.core": 600,
+    "ml.hate_llm_labeling.core": 600,
+    "ml.ingest_dcinside.core": 800,
+    "ml.upload_hf_dataset.core": 600,
+    "ml.stream_pipeline.core": 900,
+    "ml.backfill.core": 900,
+    "ml.leaderboard_api.core": 1500,
+}
+HEAVY = ("torch", "transformers", "datasets", "langchain_core", "langfuse", "huggingface_hub")
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str) -> tuple[float, set[str], list[tuple[int, str]]]:
+    """Cumulative import time in ms, every imported module and the slowest third-party packages."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ,
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    total_us = 0
+    imported = set()
+    nested: list[tuple[int, str]] = []
+    direct: list[tuple[int, str]] = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        cumulative, depth, name = int(match.group(2)), len(match.group(3)), match.group(4)
+        imported.add(name)
+        # A module is reported after its own imports, one space of indent for top-level ones
+        if depth == 1:
+            total_us += cumulative
+            if name == module:
+                direct = nested
+            nested = []
+        elif "." not in name and name != "ml":
+            nested.append((cumulative, name))
+    return total_us / 1000, imported, sorted(direct, reverse=True)[:3]
+
+
+def main() -> int:
+    failures = 0
+    for module, budget in ENTRY_POINTS.items():
+        try:
+            runs = [measure(module) for _ in range(RUNS)]
+        except ImportError as e:
+            # A dependency missing from this environment, not a startup regression
+            print(f"{module:<32} skipped: {e}")
+            continue
+        elapsed, imported, slowest = min(runs, key=lambda run: run[0])
+        heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY and "." not in name)
+        status = "ok"
+        if elapsed > budget or heavy:
+            status = "FAIL"
+            failures += 1
+        print(f"{module:<32} {elapsed:8.1f}ms / {budget:5d}ms  {status}")
+        print("    slowest: " + ", ".join(f"{name} {us / 1000:.1f}ms" for us, name in slowest))
+        if heavy:
+            print(f"    imported at startup: {', '.join(heavy)}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""Label response parsing: five re.search calls vs. ml.parser.parse_label on large generations.
+
+Usage:
+    PYTHONPATH=components:bases python development/label_parser_bench.py [size_kb]
+"""
+import re
+import sys
+import time
+
+from ml.parser import parse_label
+
+SIZE_KB = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+ANSWER = "혐오표현 유형: 성별혐오\n설명: 특정 성별을 비하하는 표현\n뉘앙스: 조롱\n혐오 수준: 높음\n이유: 비하 표현을 반복함\n"
+
+
+def regex_parse(response: str) -> dict | None:
+    """ml.labeler.parser.parse_label_response before the single-pass parser."""
+    type_match = re.search(r"혐오표현 유형:\s*([^\n]+)", response)
+    if not type_match:
+        return None
+    desc_match = re.search(r"설명:\s*([^\n]+(?:\n[^\n]+)*)", response)
+    nuance_match = re.search(r"뉘앙스:\s*([^\n]+)", response)
+    level_match = re.search(r"혐오 수준:\s*([^\n]+)", response)
+    reason_match = re.search(r"이유:\s*([^\n]+(?:\n[^\n]+)*)", response)
+    return {
+        "type": type_match.group(1).strip(),
+        "description": desc_match.group(1).strip() if desc_match else "",
+        "nuance": nuance_match.group(1).strip() if nuance_match else None,
+        "hate_level": level_match.group(1).strip() if level_match else None,
+        "reason": reason_match.group(1).strip() if reason_match else None,
+    }
+
+
+def generations(size: int) -> dict[str, str]:
+    rambling = ("생각해 보면 이 글은 여러 의미로 읽힐 수 있다. " * 8 + "\n") * (size // 400 + 1)
+    return {
+        "answer after reasoning": rambling[:size] + "\n\n" + ANSWER,
+        "no labels": rambling[:size],
+        "only type label": "혐오표현 유형: 없음\n" + rambling[:size],
+        "one long description": ANSWER.replace("설명: ", "설명: " + "긴 설명 " * (size // 16)),
+        "whitespace tail": "혐오표현 유형:" + " \n" * (size // 2),
+    }
+
+
+def measure(parse, response: str) -> float:
+    runs = []
+    for _ in range(5):
+        start = time.perf_counter()
+        parse(response)
+        runs.append(time.perf_counter() - start)
+    return min(runs) * 1e3
+
+
+def main() -> None:
+    print(f"{SIZE_KB}KB generations, best of 5")
+    for label, response in generations(SIZE_KB * 1024).items():
+        before = measure(regex_parse, response)
+        after = measure(parse_label, response)
+        print(f"{label:<22} regex {before:8.2f}ms  parse_label {after:8.2f}ms  {before / after:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
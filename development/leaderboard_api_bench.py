@@ -0,0 +1,48 @@
+"""Requests per second of GET /leaderboard through the ASGI app, without a network hop.
+
+Usage:
+    PYTHONPATH=components:bases python development/leaderboard_api_bench.py [entries] [requests]
+"""
+import asyncio
+import random
+import sys
+import time
+
+import httpx
+
+from ml import leaderboard
+from ml.leaderboard_api import core
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+LIMIT = 100
+
+
+async def _measure(client: httpx.AsyncClient, label: str, headers: dict | None = None, before=None) -> None:
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        if before is not None:
+            before()
+        response = await client.get("/leaderboard", params={"limit": LIMIT}, headers=headers)
+        assert response.status_code in (200, 304)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {REQUESTS / elapsed:>10.0f} req/s  (status {response.status_code})")
+
+
+async def main() -> None:
+    rng = random.Random(0)
+    leaderboard.clear()
+    for i in range(ENTRIES):
+        leaderboard.add_entry(leaderboard.Entry(user_id=f"user{i}", username=f"user{i}", score=rng.randrange(10**6)))
+
+    transport = httpx.ASGITransport(app=core.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Rendering on every request is what the route did before the cache
+        await _measure(client, "render every request", before=core.response_cache.clear)
+        await _measure(client, "cached body")
+        etag = (await client.get("/leaderboard", params={"limit": LIMIT})).headers["etag"]
+        await _measure(client, "If-None-Match (304)", headers={"If-None-Match": etag})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""Entries per second through POST /leaderboard versus POST /leaderboard/bulk.
+
+Usage:
+    PYTHONPATH=components:bases python development/leaderboard_bulk_bench.py [entries] [batch size]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+from jose import jwt
+
+os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+
+from ml import leaderboard  # noqa: E402
+from ml.leaderboard_api import core  # noqa: E402
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+BATCH_SIZE = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+
+
+def _entry(i: int) -> dict:
+    return {"user_id": f"user{i}", "username": f"user{i}", "score": (i * 7919) % 100_000}
+
+
+async def main() -> None:
+    token = jwt.encode({"sub": "bench"}, os.environ["JWT_SECRET_KEY"], algorithm=core.settings.jwt_algorithm)
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=core.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        leaderboard.clear()
+        start = time.perf_counter()
+        for i in range(ENTRIES):
+            response = await client.post("/leaderboard", json=_entry(i))
+            assert response.status_code == 200, response.text
+        elapsed = time.perf_counter() - start
+        print(f"single        {ENTRIES / elapsed:>10.0f} entries/s")
+
+        for label, content_type, encode in (
+            ("bulk json", "application/json", lambda batch: json.dumps(batch)),
+            ("bulk ndjson", "application/x-ndjson", lambda batch: "\n".join(json.dumps(item) for item in batch)),
+        ):
+            leaderboard.clear()
+            start = time.perf_counter()
+            for offset in range(0, ENTRIES, BATCH_SIZE):
+                batch = [_entry(i) for i in range(offset, min(offset + BATCH_SIZE, ENTRIES))]
+                response = await client.post(
+                    "/leaderboard/bulk", content=encode(batch), headers={"Content-Type": content_type}
+                )
+                assert response.status_code == 200, response.text
+            elapsed = time.perf_counter() - start
+            print(f"{label:<13} {ENTRIES / elapsed:>10.0f} entries/s  (batches of {BATCH_SIZE})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Mixed read/write load against the leaderboard ranked index.
+
+Usage:
+    PYTHONPATH=components python development/leaderboard_index_bench.py [entries] [operations]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from heapq import nlargest
+
+from ml.leaderboard import core
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+OPERATIONS = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+
+def _entry(rng: random.Random, i: int) -> core.Entry:
+    created_at = datetime(2025, 1, 1) + timedelta(seconds=i)
+    return core.Entry(user_id=f"user{i}", username=f"user{i}", score=rng.randrange(1_000_000), created_at=created_at)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    core.clear()
+    core.set_policy("latest")  # every resubmission repositions the user's record
+
+    start = time.perf_counter()
+    for i in range(ENTRIES):
+        core.add_entry(_entry(rng, i))
+    elapsed = time.perf_counter() - start
+    print(f"load     {ENTRIES:>9} entries  {elapsed:8.2f}s  {ENTRIES / elapsed:>10.0f} ops/s")
+
+    # 80% top-10 reads, 10% rank lookups, 10% resubmissions that upsert an existing user
+    counts = {"top": 0, "rank": 0, "add": 0}
+    start = time.perf_counter()
+    for i in range(OPERATIONS):
+        roll = rng.random()
+        if roll < 0.8:
+            core.get_top_entries(10)
+            counts["top"] += 1
+        elif roll < 0.9:
+            core.get_rank(f"user{rng.randrange(ENTRIES)}")
+            counts["rank"] += 1
+        else:
+            core.add_entry(_entry(rng, rng.randrange(ENTRIES)))
+            counts["add"] += 1
+    elapsed = time.perf_counter() - start
+    print(f"mixed    {OPERATIONS:>9} ops      {elapsed:8.2f}s  {OPERATIONS / elapsed:>10.0f} ops/s  {counts}")
+
+    # Previous implementation: nlargest over the whole list on every read
+    entries = list(core._index)
+    reads = 20
+    start = time.perf_counter()
+    for _ in range(reads):
+        nlargest(10, entries)
+    elapsed = time.perf_counter() - start
+    print(f"nlargest {reads:>9} reads    {elapsed:8.2f}s  {reads / elapsed:>10.0f} ops/s  (baseline top-10)")
+
+
+if __name__ == "__main__":
+    main()
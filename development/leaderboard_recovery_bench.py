@@ -0,0 +1,53 @@
+"""Warm-start time of the leaderboard from SQLite storage.
+
+Usage:
+    PYTHONPATH=components python development/leaderboard_recovery_bench.py [entries] [db path]
+
+A given db path must not exist yet; the benchmark creates it and never touches an existing board.
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ml import leaderboard
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+CHUNK = 50_000
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and Path(sys.argv[2]).exists():
+        sys.exit(f"{sys.argv[2]} already exists; pass a new path so no real leaderboard is overwritten")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(sys.argv[2]) if len(sys.argv) > 2 else Path(tmp_dir) / "leaderboard.db"
+        storage = leaderboard.SQLiteStorage(path)
+        rng = random.Random(0)
+        base = datetime(2025, 1, 1)
+        start = time.perf_counter()
+        for offset in range(0, ENTRIES, CHUNK):
+            storage.save(
+                [
+                    leaderboard.Entry(
+                        user_id=f"user{i}",
+                        username=f"user{i}",
+                        score=rng.randrange(10**6),
+                        created_at=base + timedelta(seconds=i),
+                    )
+                    for i in range(offset, min(offset + CHUNK, ENTRIES))
+                ]
+            )
+        print(f"write    {ENTRIES:>9} entries  {time.perf_counter() - start:8.2f}s")
+        storage.close()
+
+        start = time.perf_counter()
+        leaderboard.set_storage(leaderboard.SQLiteStorage(path))
+        elapsed = time.perf_counter() - start
+        top = leaderboard.get_top_entries(1)[0]
+        print(f"recover  {ENTRIES:>9} entries  {elapsed:8.2f}s  top={top.user_id}:{top.score}")
+
+
+if __name__ == "__main__":
+    main()
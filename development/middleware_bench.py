@@ -0,0 +1,78 @@
+"""Per-request latency of GET /leaderboard with the old BaseHTTPMiddleware stack and the ASGI one.
+
+Usage:
+    PYTHONPATH=components:bases python development/middleware_bench.py [requests]
+"""
+import asyncio
+import logging
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from ml import leaderboard
+from ml.fastapilite import create_app
+from ml.leaderboard_api import core
+
+REQUESTS = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+
+class LegacyRequestID(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        request.state.request_id = str(uuid.uuid4())
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request.state.request_id
+        return response
+
+
+class LegacyTiming(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        logging.getLogger("middleware").info("%s %s", request.method, request.url.path)
+        return response
+
+
+def legacy_app():
+    """The leaderboard routes behind the previous middleware setup, CORS included twice."""
+    app = create_app(title="legacy")
+    app.include_router(core.app.router)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(LegacyRequestID)
+    app.add_middleware(LegacyTiming)
+    return app
+
+
+async def _measure(label: str, app) -> None:
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Origin": "http://localhost:3000"}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = await client.get("/leaderboard", params={"limit": 10})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"{label:<18} p50 {p50:8.1f}us  p99 {p99:8.1f}us  {REQUESTS / sum(latencies):>8.0f} req/s")
+
+
+async def main() -> None:
+    # Measure middleware overhead, not log formatting and I/O
+    logging.getLogger("middleware").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    for i in range(100):
+        leaderboard.add_entry(leaderboard.Entry(user_id=f"user{i}", username=f"user{i}", score=i))
+    await _measure("BaseHTTPMiddleware", legacy_app())
+    await _measure("pure ASGI", core.app)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
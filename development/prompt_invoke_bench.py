@@ -0,0 +1,82 @@
+"""Latency of PromptManager.invoke resolving and compiling the prompt per call vs. the compiled template cache.
+
+The Langfuse client is a local fake with its own TTL cache; a miss sleeps to simulate the
+network round trip. A short TTL shows what the request path pays whenever the prompt expires.
+
+Usage:
+    PYTHONPATH=components:bases python development/prompt_invoke_bench.py [invocations] [ttl_seconds]
+"""
+import statistics
+import sys
+import time
+from typing import List
+
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langfuse.api import TextPrompt
+
+from ml.config import BaseConfig
+from ml.prompt import LangfusePromptClient, YAMLPromptClient
+
+INVOCATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+TTL_SECONDS = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+NETWORK_SECONDS = 0.02
+TEMPLATE = "다음 게시글이 혐오 표현인지 분류하세요.\n제목: {title}\n본문: {text}\n형식: 유형: <유형>"
+
+
+class FakeLangfuse:
+    """Langfuse client stand-in: TTL cache per prompt, sleeping on a miss like a network fetch."""
+
+    def __init__(self):
+        self._cache = {}
+
+    def get_prompt(self, name, version=None, label=None, cache_ttl_seconds=None):
+        cached = self._cache.get(name)
+        if cached is not None and cache_ttl_seconds and time.monotonic() - cached[1] < cache_ttl_seconds:
+            return cached[0]
+        time.sleep(NETWORK_SECONDS)
+        prompt = TextPrompt(name=name, version=1, prompt=TEMPLATE, config={}, labels=[], tags=[])
+        self._cache[name] = (prompt, time.monotonic())
+        return prompt
+
+
+def legacy_invoke(manager, input):
+    """PromptManager.invoke before the compiled template cache."""
+    prompt_template = manager.get_prompt(name=input.get("prompt_name")).prompt
+    if isinstance(prompt_template, List):
+        return ChatPromptTemplate.from_messages(messages=prompt_template, template_format="mustache").invoke(input)
+    return PromptTemplate.from_template(template=prompt_template).invoke(input)
+
+
+def measure(label: str, invoke) -> None:
+    latencies = []
+    for i in range(INVOCATIONS):
+        input = {"prompt_name": "classify", "title": f"제목 {i}", "text": "본문 " * 50}
+        start = time.perf_counter()
+        invoke(input)
+        latencies.append(time.perf_counter() - start)
+        # Spread the run over a few TTLs so expiries hit the request path
+        time.sleep(0.001)
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"{label:<20} p50 {p50:9.1f}us  p99 {p99:9.1f}us  max {latencies[-1] * 1e3:7.1f}ms")
+
+
+def main() -> None:
+    def yaml_client():
+        return YAMLPromptClient(prompts_config=[{"name": "classify", "prompt": TEMPLATE}])
+
+    def langfuse_client():
+        return LangfusePromptClient(config=BaseConfig({}), client=FakeLangfuse(), cache_ttl_seconds=TTL_SECONDS)
+
+    print(f"{INVOCATIONS} invocations, Langfuse TTL {TTL_SECONDS}s, simulated fetch {NETWORK_SECONDS * 1e3:.0f}ms")
+    manager = yaml_client()
+    measure("yaml per-call", lambda input: legacy_invoke(manager, input))
+    measure("yaml cached", yaml_client().invoke)
+    manager = langfuse_client()
+    measure("langfuse per-call", lambda input: legacy_invoke(manager, input))
+    measure("langfuse cached", langfuse_client().invoke)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("cleantext")
+
+from ml.backfill import core  # noqa: E402
+from ml.json.partition import mark_complete  # noqa: E402
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    for name in ("RAW_DIR", "CLEAN_DIR", "CLASSIFIED_DIR", "LABELED_DIR"):
+        monkeypatch.setenv(name, str(tmp_path / name.lower()))
+    return tmp_path
+
+
+class RecordingBackfill(core.Backfill):
+    def __init__(self, settings: core.Settings, fail: str | None = None):
+        super().__init__(settings)
+        self.calls: list[tuple[str, str]] = []
+        self._fail = fail
+
+    async def run_stage(self, stage: str, today: str) -> None:
+        self.calls.append((today, stage))
+        await asyncio.sleep(0)
+        if stage == self._fail:
+            raise RuntimeError(f"{stage} failed")
+
+
+def test_stages_run_in_order_per_date(dirs):
+    """Test every date runs the selected stages in pipeline order."""
+    backfill = RecordingBackfill(core.Settings(STAGES=["label", "ingest", "clean"]))
+    asyncio.run(backfill.run(["2024-05-01", "2024-05-02"]))
+
+    for today in ("2024-05-01", "2024-05-02"):
+        assert [stage for day, stage in backfill.calls if day == today] == ["ingest", "clean", "label"]
+
+
+def test_is_done_tracks_each_stage(dirs):
+    """Test completion markers per stage, with ingest not rerun when only clean failed."""
+    backfill = core.Backfill(core.Settings())
+    today = "2024-05-01"
+    assert not any(backfill.is_done(stage, today) for stage in core.STAGES)
+
+    mark_complete(dirs / "raw_dir" / f"dt={today}")
+    assert backfill.is_done("ingest", today)
+    assert not backfill.is_done("clean", today)
+
+    mark_complete(dirs / "labeled_dir" / f"dt={today}")
+    assert backfill.is_done("label", today)
+    assert not backfill.is_done("upload", today)
+    mark_complete(dirs / "labeled_dir" / f"dt={today}", "uploaded")
+    assert backfill.is_done("upload", today)
+
+
+def test_is_done_accepts_clean_partitions_without_raw_marker(dirs):
+    """Test dates cleaned before raw partitions were marked are not crawled again."""
+    backfill = core.Backfill(core.Settings())
+    mark_complete(dirs / "clean_dir" / "dt=2024-05-01")
+    assert backfill.is_done("ingest", "2024-05-01")
+    assert backfill.is_done("clean", "2024-05-01")
+
+
+def test_failed_stage_stops_its_date_and_skips_done_stages(dirs):
+    """Test a failing stage stops later stages of that date and completed stages are skipped."""
+    mark_complete(dirs / "raw_dir" / "dt=2024-05-01")
+    backfill = RecordingBackfill(core.Settings(STAGES=["ingest", "clean", "label"]), fail="clean")
+    with pytest.raises(RuntimeError):
+        asyncio.run(backfill.run(["2024-05-01"]))
+    assert backfill.calls == [("2024-05-01", "clean")]
@@ -1,3 +1,5 @@
+import json
+
 from ml.leaderboard_api import core
 
 
@@ -6,3 +8,167 @@ def test_app_exists():
     assert core.app is not None
     assert core.app.title == "ml Leaderboard API"
 
+
+def test_leaderboard_etag_and_middleware_headers():
+    """Test cached responses revalidate with ETag and middleware headers are set once."""
+    from fastapi.testclient import TestClient
+
+    from ml import leaderboard
+
+    leaderboard.clear()
+    leaderboard.add_entry(leaderboard.Entry(user_id="user1", username="user1", score=10))
+    client = TestClient(core.app)
+
+    response = client.get("/leaderboard", headers={"X-Request-ID": "abc"})
+    assert response.status_code == 200
+    assert response.json()[0]["rank"] == 1
+    assert response.headers["x-request-id"] == "abc"
+    assert len(response.headers.get_list("x-process-time")) == 1
+
+    cached = client.get("/leaderboard", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+    leaderboard.clear()
+
+
+def test_readiness_uses_the_shared_health_check():
+    """Test /readyz answers from the HealthCheck the app refreshes during its lifespan."""
+    from fastapi.testclient import TestClient
+
+    from ml.health import HealthCheck
+
+    health = HealthCheck.get_instance()
+    with TestClient(core.app) as client:
+        assert health._refresher is not None
+        response = client.get("/readyz")
+        assert response.status_code in (200, 503)
+        assert "dependencies" in response.json()
+    assert health._refresher is None
+
+
+def test_metrics_endpoint_reports_request_latency():
+    """Test /metrics exposes the request latency histogram labelled by route template."""
+    from fastapi.testclient import TestClient
+
+    client = TestClient(core.app)
+    client.get("/leaderboard/users/nobody")
+    text = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/leaderboard/users/{user_id}",status="404"}' in text
+
+
+def _bulk_client():
+    from fastapi.testclient import TestClient
+
+    from ml import auth, leaderboard
+
+    leaderboard.clear()
+    core.app.dependency_overrides[auth.get_current_user] = lambda: {"sub": "tester"}
+    return TestClient(core.app)
+
+
+def test_bulk_accepts_json_array_and_ndjson_with_invalid_items():
+    """Test both bulk formats apply valid items in order and report invalid ones by index."""
+    from ml import leaderboard
+
+    client = _bulk_client()
+    try:
+        response = client.post(
+            "/leaderboard/bulk",
+            json=[
+                {"user_id": "a", "username": "a", "score": 5},
+                {"user_id": "b", "username": "", "score": 1},
+                {"user_id": "a", "username": "a", "score": 9},
+            ],
+        )
+        assert response.status_code == 200
+        results = response.json()
+        assert [result["status"] for result in results] == ["ok", "invalid", "ok"]
+        assert results[1]["error"].startswith("username")
+        assert [results[0]["entry"]["score"], results[2]["entry"]["score"]] == [5, 9]
+
+        body = '{"user_id": "c", "username": "c", "score": 20}\n\nnot json\n'
+        response = client.post("/leaderboard/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+        assert [result["status"] for result in response.json()] == ["ok", "invalid"]
+        assert [entry.user_id for entry in leaderboard.get_top_entries(limit=3)] == ["c", "a"]
+    finally:
+        core.app.dependency_overrides.clear()
+        leaderboard.clear()
+
+
+def test_add_entry_returns_the_stored_record(monkeypatch):
+    """Test POST answers with the record it stored, even if the user is removed right after."""
+    from ml import leaderboard
+
+    client = _bulk_client()
+    # A concurrent clear() between the write and a separate read used to turn into a 500
+    monkeypatch.setattr(leaderboard, "get_entry", lambda user_id: None)
+    try:
+        assert client.post("/leaderboard", json={"user_id": "u1", "username": "u1", "score": 50}).status_code == 200
+        response = client.post("/leaderboard", json={"user_id": "u1", "username": "u1", "score": 30})
+        assert response.status_code == 200
+        assert (response.json()["score"], response.json()["rank"]) == (50, 1)
+    finally:
+        core.app.dependency_overrides.clear()
+        leaderboard.clear()
+
+
+def test_bulk_refuses_oversized_requests_before_validation(monkeypatch):
+    """Test too many items or too many bytes are refused with 413 and nothing is validated or stored."""
+    from ml import leaderboard
+
+    client = _bulk_client()
+    monkeypatch.setattr(core, "MAX_BULK_ENTRIES", 2)
+    validated = []
+    monkeypatch.setattr(core.LeaderboardEntry, "model_validate", classmethod(lambda cls, item: validated.append(item)))
+    try:
+        items = [{"user_id": str(i), "username": str(i), "score": i} for i in range(3)]
+        assert client.post("/leaderboard/bulk", json=items).status_code == 413
+        ndjson = "\n".join(json.dumps(item) for item in items)
+        response = client.post("/leaderboard/bulk", content=ndjson, headers={"Content-Type": "application/x-ndjson"})
+        assert response.status_code == 413
+        assert validated == []
+
+        monkeypatch.setattr(core, "MAX_BULK_BYTES", 16)
+        assert client.post("/leaderboard/bulk", json=items[:1]).status_code == 413
+        assert leaderboard.get_top_entries(limit=10) == ()
+    finally:
+        core.app.dependency_overrides.clear()
+
+
+def test_revoked_token_is_rejected(monkeypatch):
+    """Test a client can revoke its own token and the token is refused afterwards."""
+    import time
+
+    from fastapi.testclient import TestClient
+    from jose import jwt
+
+    from ml import auth
+
+    monkeypatch.setattr(auth.core.settings, "jwt_secret_key", "test-secret")
+    token = jwt.encode({"sub": "tester", "exp": time.time() + 600}, "test-secret", algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(core.app)
+    try:
+        assert client.post("/auth/revoke", headers=headers).status_code == 204
+        response = client.post("/leaderboard", headers=headers, json={"user_id": "u", "username": "u", "score": 1})
+        assert response.status_code == 401
+    finally:
+        auth.token_cache.clear()
+
+
+def test_cors_preflight_allows_any_origin():
+    """Test browser clients on any origin pass the CORS preflight, as before CORS moved to create_app."""
+    from fastapi.testclient import TestClient
+
+    client = TestClient(core.app)
+    response = client.options(
+        "/leaderboard/bulk",
+        headers={
+            "Origin": "https://scores.example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization,content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "https://scores.example.com"
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert "POST" in response.headers["access-control-allow-methods"]
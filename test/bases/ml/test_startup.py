@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("torch", "transformers", "datasets", "langchain_core", "langfuse", "huggingface_hub")
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "ml.hate_speech_pipeline.core",
+        "ml.hate_classification.core",
+        "ml.hate_llm_labeling.core",
+        "ml.upload_hf_dataset.core",
+        "ml.stream_pipeline.core",
+    ],
+)
+def test_entry_points_import_heavy_dependencies_lazily(module):
+    """Test that importing an entry point does not load ML frameworks before they are used."""
+    code = f"import sys, {module}; print(','.join(name for name in {HEAVY!r} if name in sys.modules))"
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if "ModuleNotFoundError" in result.stderr:
+        pytest.skip(result.stderr.strip().splitlines()[-1])
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -0,0 +1,80 @@
+import time
+
+from ml import metrics
+from ml.auth.cache import TokenCache, _token_key, lookups_total
+from ml.auth.revocation import SQLiteRevocations
+
+
+def test_token_cache_hits_expiry_and_revocation():
+    """Test payloads are reused until the token's exp, evicted LRU, and revocation sticks."""
+    cache = TokenCache(maxsize=2, ttl=60)
+    now = time.time()
+    cache.put("a", {"sub": "a", "exp": now + 600})
+    cache.put("expired", {"sub": "b", "exp": now - 1})
+    assert cache.get("a") == {"sub": "a", "exp": now + 600}
+    assert cache.get("expired") is None
+
+    cache.put("b", {"sub": "b"})
+    assert cache.get("a") is not None
+    cache.put("c", {"sub": "c"})
+    assert cache.get("b") is None  # least recently used once "a" was read again
+    assert cache.get("c") == {"sub": "c"}
+
+    cache.revoke("a")
+    assert cache.get("a") is None
+    assert cache.is_revoked("a")
+    cache.put("a", {"sub": "a", "exp": now + 600})
+    assert cache.get("a") is None
+
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["hit_rate"] == 3 / 7
+
+
+def test_expired_revocations_are_dropped():
+    """Test revocations past their expiry are forgotten on the next revoke, others are kept."""
+    cache = TokenCache()
+    now = time.time()
+    cache.revoke("old", expires_at=now - 1)
+    cache.revoke("renewed", expires_at=now - 1)
+    cache.revoke("renewed", expires_at=now + 600)
+    cache.revoke("forever")
+
+    assert not cache.is_revoked("old")
+    assert cache.is_revoked("renewed")
+    assert cache.is_revoked("forever")
+    assert cache.stats()["revoked"] == 2
+
+
+def test_revocation_without_expiry_falls_back_to_ttl():
+    """Test a revocation with no known exp lapses after the cache TTL instead of living forever."""
+    cache = TokenCache(ttl=60)
+    before = time.time()
+    cache.revoke("unknown")
+
+    assert cache.is_revoked("unknown")
+    assert before + 60 <= cache._revoked[_token_key("unknown")] <= time.time() + 60
+
+
+def test_revocations_reach_other_workers_through_the_store(tmp_path):
+    """Test a token revoked by one worker's cache is rejected by another sharing the store."""
+    first = TokenCache(store=SQLiteRevocations(tmp_path / "revoked.db"), sync_interval=0)
+    second = TokenCache(store=SQLiteRevocations(tmp_path / "revoked.db"), sync_interval=0)
+    second.put("token", {"sub": "a", "exp": time.time() + 600})
+    assert second.get("token") is not None
+
+    first.revoke("token", expires_at=time.time() + 600)
+
+    assert second.get("token") is None
+    assert second.is_revoked("token")
+
+
+def test_lookups_are_exported_as_metrics():
+    """Test hits and misses are counted in the metrics registry, so the hit rate can be scraped."""
+    hits, misses = lookups_total.value(result="hit"), lookups_total.value(result="miss")
+    cache = TokenCache()
+    cache.put("a", {"sub": "a"})
+    cache.get("a")
+    cache.get("b")
+
+    assert (lookups_total.value(result="hit"), lookups_total.value(result="miss")) == (hits + 1, misses + 1)
+    assert 'auth_token_cache_lookups_total{result="hit"}' in metrics.REGISTRY.render()
@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from ml.config import ConfigRegistry, create_config
+
+
+def _write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_registry_caches_and_reloads(tmp_path):
+    """Test that a config is parsed once per file version and reloaded after it changes."""
+    path = tmp_path / "config.test.yml"
+    _write(path, "prompt_client: yaml\nretries: 3\n", 1_000_000_000)
+    registry = ConfigRegistry(check_interval=0)
+    changes = []
+    registry.on_change(lambda changed_path, config: changes.append(config.prompt_client))
+
+    config = registry.get(str(path))
+    assert registry.get(str(path)) is config
+    assert config.require("retries", int) == 3
+    assert config.get("timeout", 1.5, float) == 1.5
+    assert config.get("retries", type_=float) == 3.0
+    with pytest.raises(TypeError):
+        config.get("prompt_client", type_=int)
+    with pytest.raises(KeyError):
+        config.require("timeout")
+
+    _write(path, "prompt_client: langfuse\n", 2_000_000_000)
+    reloaded = registry.get(str(path))
+    assert reloaded is not config
+    assert reloaded.prompt_client == "langfuse"
+    assert changes == ["langfuse"]
+
+    registry.reload()
+    assert changes == ["langfuse", "langfuse"]
+
+
+def test_create_config_uses_registry(tmp_path):
+    path = tmp_path / "config.custom.yml"
+    path.write_text("service_info:\n  name: ml\n  description: null\n")
+    config = create_config(custom_path=str(path))
+    assert create_config(custom_path=str(path)) is config
+    assert config.service_info.name == "ml"
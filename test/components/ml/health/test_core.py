@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+
+from ml.health import HealthCheck, Service
+
+
+class SlowService(Service):
+    delay: float = 0.0
+    healthy: bool = True
+
+    async def run_check(self, client: httpx.AsyncClient) -> bool:
+        await asyncio.sleep(self.delay)
+        return self.healthy
+
+
+def test_checks_run_concurrently_with_timeouts():
+    """Test checks overlap, a hung check times out, and the snapshot reports each result."""
+    health = HealthCheck()
+    health.services = {
+        "a": SlowService(name="a", delay=0.2),
+        "b": SlowService(name="b", delay=0.2, healthy=False),
+        "hung": SlowService(name="hung", delay=10, timeout=0.3),
+    }
+    health._available = {name: True for name in health.services}
+
+    async def run():
+        start = time.perf_counter()
+        results = await health.run_checks()
+        elapsed = time.perf_counter() - start
+        await health.stop()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+    assert results == {"a": True, "b": False, "hung": False}
+    assert elapsed < 0.6
+    snapshot = health.snapshot()
+    assert snapshot["healthy"] is False
+    assert snapshot["dependencies"]["hung"]["error"] == "timed out after 0.3s"
+    assert snapshot["dependencies"]["a"]["latency_ms"] >= 200
+
+
+def test_first_readiness_probe_checks_once():
+    """Test the first /readyz answers from the refresher's first run, which lives as long as the app."""
+    from fastapi.testclient import TestClient
+
+    from ml.fastapilite import create_app
+
+    runs = []
+
+    class CountingService(Service):
+        async def run_check(self, client: httpx.AsyncClient) -> bool:
+            runs.append(self.name)
+            await asyncio.sleep(0.05)
+            return True
+
+    health = HealthCheck()
+    health.services = {"counted": CountingService(name="counted")}
+    health._available = {"counted": True}
+    app = create_app(title="test", health_check=health, health_interval=60)
+
+    with TestClient(app) as client:
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["dependencies"]["counted"]["healthy"] is True
+        time.sleep(0.1)
+    assert runs == ["counted"]
+    # Shutdown stops the refresher and closes its HTTP client
+    assert health._refresher is None and health._client is None
@@ -0,0 +1,94 @@
+import asyncio
+
+import pyarrow.parquet as pq
+import pytest
+
+from ml.hf import Client, DedupIndex, LocalHub, assign_split
+
+
+def _rows(start, stop):
+    return [{"instruction": "분류하세요", "input": f"텍스트 {i}", "output": "혐오표현 유형: 없음"} for i in range(start, stop)]
+
+
+def test_incremental_upload_commits_only_new_shards(tmp_path):
+    """Test each upload adds one shard per split and rows keep a stable split."""
+    hub = LocalHub(tmp_path)
+    client = Client(token="", model="", repo_id="org/hate-speech", api=hub)
+
+    first = asyncio.run(client.upload_incremental(_rows(0, 200)))
+    second = asyncio.run(client.upload_incremental(_rows(200, 300)))
+
+    assert len(hub.commits) == 2
+    assert set(second) <= set(hub.commits[1]["files"])
+    assert not set(first) & set(second)
+    files = [f for f in hub.list_repo_files("org/hate-speech") if f.startswith("data/")]
+    assert sorted(files) == sorted(first + second)
+    for path in first + second:
+        split = path.split("/")[1].split("-")[0]
+        rows = pq.read_table(tmp_path / "org/hate-speech" / path).to_pylist()
+        assert all(assign_split(row) == split for row in rows)
+    total = sum(pq.read_table(tmp_path / "org/hate-speech" / path).num_rows for path in files)
+    assert total == 300
+
+
+def test_upload_stream_consumes_rows_lazily(tmp_path):
+    """Test a row generator is written in small batches and every row reaches a shard."""
+    hub = LocalHub(tmp_path)
+    client = Client(token="", model="", repo_id="org/hate-speech", api=hub)
+
+    paths = asyncio.run(client.upload_stream((row for row in _rows(0, 95)), batch_size=10))
+
+    tables = [pq.read_table(tmp_path / "org/hate-speech" / path) for path in paths]
+    assert sum(table.num_rows for table in tables) == 95
+    assert all(table.schema.names == ["instruction", "input", "output"] for table in tables)
+
+
+def test_dedup_index_skips_published_rows(tmp_path):
+    """Test rows already published, or repeated in the batch, are not uploaded again."""
+    hub = LocalHub(tmp_path / "hub")
+    client = Client(token="", model="", repo_id="org/hate-speech", api=hub)
+    asyncio.run(client.upload_stream(_rows(0, 100), dedup=DedupIndex(tmp_path / "a")))
+
+    # A fresh index on another machine learns the published keys from the shard key files
+    index = DedupIndex(tmp_path / "b")
+    paths = asyncio.run(client.upload_stream(_rows(50, 150) + _rows(140, 150), dedup=index))
+
+    rows = [row for path in paths for row in pq.read_table(tmp_path / "hub/org/hate-speech" / path).to_pylist()]
+    assert sorted(row["input"] for row in rows) == sorted(f"텍스트 {i}" for i in range(100, 150))
+    assert len(DedupIndex(tmp_path / "b")) == 150
+    assert asyncio.run(client.upload_stream(_rows(0, 150), dedup=index)) == []
+
+
+def test_dedup_index_keeps_rows_of_failed_commit(tmp_path):
+    """Test rows of an upload whose commit failed are not treated as published on retry."""
+
+    class FailingHub(LocalHub):
+        fail = True
+
+        def create_commit(self, *args, **kwargs):
+            if self.fail:
+                self.fail = False
+                raise ConnectionError("commit failed")
+            return super().create_commit(*args, **kwargs)
+
+    hub = FailingHub(tmp_path / "hub")
+    client = Client(token="", model="", repo_id="org/hate-speech", api=hub)
+    index = DedupIndex(tmp_path / "index")
+    with pytest.raises(ConnectionError):
+        asyncio.run(client.upload_stream(_rows(0, 20), dedup=index))
+    assert len(index) == 0
+
+    paths = asyncio.run(client.upload_stream(_rows(0, 20), dedup=index))
+    assert sum(pq.read_table(tmp_path / "hub/org/hate-speech" / path).num_rows for path in paths) == 20
+    assert len(DedupIndex(tmp_path / "index")) == 20
+
+
+def test_dedup_filter_holds_only_the_current_batch(tmp_path):
+    """Test repeats are dropped within a batch and the batch's keys are released afterwards."""
+    index = DedupIndex(tmp_path / "index")
+    index.add_rows(_rows(0, 1))
+    rows = _rows(1, 2) * 2 + _rows(2, 5) + _rows(0, 2)
+
+    kept = [row["input"] for row in index.filter(rows, batch_size=2)]
+
+    assert kept == ["텍스트 1", "텍스트 2", "텍스트 3", "텍스트 4", "텍스트 1"]
@@ -0,0 +1,61 @@
+from multiprocessing import Pool
+
+from ml.json.partition import PartitionWriter, is_complete, iter_partition, list_parts, mark_complete, plan_reads
+
+
+def _write_worker(args):
+    partition_dir, worker = args
+    with PartitionWriter(partition_dir, max_records=5) as writer:
+        for i in range(12):
+            writer.append({"id": f"{worker}-{i}"})
+
+
+def test_rolls_parts_and_commits_manifest(tmp_path):
+    """Test parts roll by record count and only committed parts are listed."""
+    with PartitionWriter(tmp_path, max_records=4) as writer:
+        for i in range(10):
+            writer.append({"id": str(i)})
+    (tmp_path / "part-0099.jsonl").write_text('{"id": "orphan"}\n', encoding="utf-8")
+
+    assert [p.name for p in list_parts(tmp_path)] == ["part-0001.jsonl", "part-0002.jsonl", "part-0003.jsonl"]
+    assert [r["id"] for r in iter_partition(tmp_path)] == [str(i) for i in range(10)]
+    assert not is_complete(tmp_path)
+    mark_complete(tmp_path)
+    assert is_complete(tmp_path)
+
+
+def test_parallel_workers_write_distinct_parts(tmp_path):
+    """Test worker processes claim their own parts and plans cover every part once."""
+    with Pool(3) as pool:
+        pool.map(_write_worker, [(tmp_path, worker) for worker in range(3)])
+
+    parts = list_parts(tmp_path)
+    assert len(parts) == 9
+    assert sorted(r["id"] for r in iter_partition(tmp_path)) == sorted(f"{w}-{i}" for w in range(3) for i in range(12))
+    plans = plan_reads(tmp_path, 2)
+    assert sorted(p for plan in plans for p in plan) == sorted(parts)
+
+
+def test_failed_write_is_not_committed(tmp_path):
+    """Test parts of a writer left by an exception are removed instead of committed."""
+    try:
+        with PartitionWriter(tmp_path, max_records=2) as writer:
+            for i in range(3):
+                writer.append({"id": str(i)})
+            raise RuntimeError("stage failed")
+    except RuntimeError:
+        pass
+
+    assert list_parts(tmp_path) == []
+    assert list(tmp_path.glob("part-*.jsonl")) == []
+
+
+def test_manifest_keeps_legacy_parts(tmp_path):
+    """Test the manifest created for a partition without one lists its existing parts."""
+    (tmp_path / "part-0001.jsonl").write_text('{"id": "legacy"}\n', encoding="utf-8")
+    with PartitionWriter(tmp_path) as writer:
+        writer.append({"id": "new"})
+
+    assert [p.name for p in list_parts(tmp_path)] == ["part-0001.jsonl", "part-0002.jsonl"]
+    assert [r["id"] for r in iter_partition(tmp_path)] == ["legacy", "new"]
+    assert plan_reads(tmp_path, 1)[0] == list_parts(tmp_path)
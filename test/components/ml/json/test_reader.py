@@ -0,0 +1,68 @@
+import json
+
+from ml.json.reader import JsonlReader
+
+
+def _write_partition(path, count):
+    with path.open("w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({"id": str(i), "text": "가" * (i % 7)}, ensure_ascii=False) + "\n")
+        f.write("\n")
+
+
+def test_lazy_iteration_and_random_access(tmp_path):
+    """Test records are read lazily, by index and by slice, and the index is persisted."""
+    path = tmp_path / "part-0001.jsonl"
+    _write_partition(path, 50)
+
+    with JsonlReader(path) as reader:
+        assert len(reader) == 50
+        assert [r["id"] for r in reader][:3] == ["0", "1", "2"]
+        assert reader[-1]["id"] == "49"
+        assert [r["id"] for r in reader[10:13]] == ["10", "11", "12"]
+        assert bytes(reader.raw(3)).startswith(b'{"id": "3"')
+
+    assert (tmp_path / "part-0001.jsonl.idx").exists()
+    with JsonlReader(path) as reader:
+        assert reader[25]["id"] == "25"
+
+
+def test_shards_cover_partition_once(tmp_path):
+    """Test byte-range shards split a partition without gaps or overlaps."""
+    path = tmp_path / "part-0001.jsonl"
+    _write_partition(path, 101)
+
+    with JsonlReader(path) as reader:
+        ids = [r["id"] for i in range(4) for r in reader.shard(i, 4)]
+        assert ids == [str(i) for i in range(101)]
+        assert all(len(reader.shard(i, 4)) > 0 for i in range(4))
+
+
+def test_damaged_index_is_rebuilt(tmp_path):
+    """Test a truncated index, even by whole offsets, is rebuilt instead of misread."""
+    path = tmp_path / "part-0001.jsonl"
+    _write_partition(path, 20)
+    with JsonlReader(path):
+        pass
+    index_path = tmp_path / "part-0001.jsonl.idx"
+    data = index_path.read_bytes()
+
+    for cut in (3, 16):
+        index_path.write_bytes(data[:-cut])
+        with JsonlReader(path) as reader:
+            assert [r["id"] for r in reader] == [str(i) for i in range(20)]
+        assert index_path.read_bytes() == data
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".tmp"] == []
+
+
+def test_closing_a_view_keeps_the_parent_open(tmp_path):
+    """Test closing a shard leaves the parent reader and sibling shards usable."""
+    path = tmp_path / "part-0001.jsonl"
+    _write_partition(path, 10)
+
+    with JsonlReader(path) as reader:
+        sibling = reader.shard(1, 2)
+        with reader.shard(0, 2) as part:
+            assert len(part) > 0
+        assert reader[0]["id"] == "0"
+        assert len([r for r in sibling]) == len(sibling)
@@ -1,10 +1,17 @@
+import random
+from dataclasses import FrozenInstanceError
+
+import pytest
+
 from ml.leaderboard import core
+from ml.leaderboard.index import RankedIndex
 
 
 def test_sample():
     """Test leaderboard functionality."""
-    entry1 = core.LeaderboardEntry(user_id="user1", username="user1", score=100)
-    entry2 = core.LeaderboardEntry(user_id="user2", username="user2", score=200)
+    core.clear()
+    entry1 = core.Entry(user_id="user1", username="user1", score=100)
+    entry2 = core.Entry(user_id="user2", username="user2", score=200)
     
     core.add_entry(entry1)
     core.add_entry(entry2)
@@ -15,3 +22,116 @@ def test_sample():
     assert entries[0].score == 200
     assert entries[0].rank == 1
 
+
+def test_rank_and_neighbors():
+    """Test per-user rank and the entries around it."""
+    core.clear()
+    for i in range(10):
+        core.add_entry(core.Entry(user_id=f"user{i}", username=f"user{i}", score=i * 10))
+
+    assert core.get_rank("user9") == 1
+    assert core.get_rank("user0") == 10
+    assert core.get_rank("missing") is None
+    assert [entry.user_id for entry in core.get_neighbors("user5", count=1)] == ["user6", "user5", "user4"]
+    assert [entry.rank for entry in core.get_neighbors("user9", count=1)] == [1, 2]
+    assert [entry.score for entry in core.get_top_entries(limit=3)] == [90, 80, 70]
+
+
+def test_snapshot_is_immutable_and_versioned():
+    """Test reads never touch stored records and the snapshot is rebuilt only for top-N changes."""
+    core.clear()
+    for i in range(core.SNAPSHOT_SIZE + 10):
+        core.add_entry(core.Entry(user_id=f"user{i}", username=f"user{i}", score=1000 + i))
+    snapshot = core.get_snapshot()
+    assert core.get_top_entries(limit=5) == snapshot.entries[:5]
+    assert all(entry.rank is None for _, entry in core._records.values())
+
+    core.add_entry(core.Entry(user_id="low", username="low", score=1))
+    assert core.get_snapshot() is snapshot
+
+    core.add_entry(core.Entry(user_id="high", username="high", score=10_000))
+    refreshed = core.get_snapshot()
+    assert refreshed.version > snapshot.version
+    assert refreshed.entries[0].user_id == "high"
+    assert snapshot.entries[0].rank == 1 and snapshot.entries[0].user_id != "high"
+
+
+def test_snapshot_reads_do_not_take_the_lock():
+    """Test the snapshot is published by writers and read while a writer holds the lock."""
+    core.clear()
+    core.add_entry(core.Entry(user_id="top", username="top", score=10))
+    with core._lock:
+        assert core.get_snapshot().entries[0].user_id == "top"
+        assert core.get_top_entries(limit=1)[0].rank == 1
+
+
+def test_add_entries_merges_batch_in_order():
+    """Test a batch applies the policy per submission, including repeats of one user."""
+    core.clear()
+    core.add_entry(core.Entry(user_id="a", username="a", score=50))
+    stored = core.add_entries(
+        [
+            core.Entry(user_id="a", username="a", score=10),
+            core.Entry(user_id="b", username="b", score=30),
+            core.Entry(user_id="b", username="b", score=70),
+        ]
+    )
+
+    assert [entry.score for entry in stored] == [50, 30, 70]
+    assert all(entry.rank is None for entry in stored)
+    assert [(entry.user_id, entry.score, entry.rank) for entry in core.get_top_entries(limit=5)] == [
+        ("b", 70, 1),
+        ("a", 50, 2),
+    ]
+    assert core.add_entries([]) == []
+
+
+def test_upsert_policies():
+    """Test each policy keeps one record per user and repositions it."""
+    expected = {"best": 300, "latest": 50, "cumulative": 450}
+    for policy, score in expected.items():
+        core.clear()
+        core.set_policy(policy)
+        core.add_entry(core.Entry(user_id="other", username="other", score=200))
+        for submitted in (100, 300, 50):
+            core.add_entry(core.Entry(user_id="user1", username="user1", score=submitted))
+
+        assert len(core.get_top_entries(limit=10)) == 2
+        assert core.get_entry("user1").score == score
+        assert core.get_rank("user1") == (1 if score > 200 else 2)
+    core.clear()
+    core.set_policy("best")
+
+
+def test_ranked_index_matches_sorted_list():
+    """Test random inserts and removals keep ranks and slices identical to a sorted list."""
+    rng = random.Random(0)
+    index = RankedIndex()
+    expected = []
+    for _ in range(2000):
+        if expected and rng.random() < 0.3:
+            key = expected.pop(rng.randrange(len(expected)))
+            assert index.remove(key) == key
+        else:
+            key = rng.random()
+            index.insert(key, key)
+            expected.append(key)
+        expected.sort()
+    assert len(index) == len(expected)
+    assert list(index) == expected
+    for position in rng.sample(range(len(expected)), 50):
+        assert index.rank(expected[position]) == position
+        assert index[position] == expected[position]
+    assert index.slice(100, 120) == expected[100:120]
+
+
+def test_published_entries_are_read_only():
+    """Test readers cannot change the entries shared by the snapshot and the index."""
+    core.clear()
+    core.add_entry(core.Entry(user_id="a", username="a", score=10))
+
+    with pytest.raises(FrozenInstanceError):
+        core.get_snapshot().entries[0].score = 1_000
+    with pytest.raises(FrozenInstanceError):
+        core.get_top_entries(limit=1)[0].rank = 5
+    assert (core.get_entry("a").score, core.get_rank("a")) == (10, 1)
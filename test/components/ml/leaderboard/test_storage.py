@@ -0,0 +1,50 @@
+import time
+from datetime import datetime
+
+from ml.leaderboard import core
+from ml.leaderboard.storage import SQLiteStorage
+
+
+def test_sqlite_storage_recovers_and_shares_writes(tmp_path, monkeypatch):
+    """Test the board survives a restart and picks up writes made by another worker."""
+    monkeypatch.setattr(core, "SYNC_INTERVAL", 0.0)
+    path = tmp_path / "leaderboard.db"
+    core.set_storage(SQLiteStorage(path), sync_interval=None)
+    core.clear()
+    for i in range(50):
+        core.add_entry(core.Entry(user_id=f"user{i}", username=f"user{i}", score=i))
+    core.add_entry(core.Entry(user_id="user0", username="user0", score=100))
+
+    # Restart: a fresh index is rebuilt from the database
+    core.set_storage(SQLiteStorage(path), sync_interval=None)
+    assert core.get_rank("user0") == 1
+    assert [entry.score for entry in core.get_top_entries(limit=3)] == [100, 49, 48]
+
+    # Another worker writes through its own connection
+    other = SQLiteStorage(path)
+    with other.transaction():
+        other.save([core.Entry(user_id="remote", username="remote", score=1000, created_at=datetime.now())])
+    assert core.get_top_entries(limit=1)[0].user_id == "remote"
+    assert core.get_rank("user0") == 2
+
+    other.clear()
+    assert core.get_top_entries(limit=10) == ()
+    core.set_storage(None)
+    core.clear()
+
+
+def test_sync_thread_refreshes_snapshot(tmp_path):
+    """Test another worker's write reaches the lock-free snapshot without any local read or write."""
+    path = tmp_path / "leaderboard.db"
+    core.set_storage(SQLiteStorage(path), sync_interval=0.01)
+    core.clear()
+    other = SQLiteStorage(path)
+    with other.transaction():
+        other.save([core.Entry(user_id="remote", username="remote", score=5, created_at=datetime.now())])
+
+    deadline = time.monotonic() + 2
+    while not core.get_snapshot().entries and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [entry.user_id for entry in core.get_snapshot().entries] == ["remote"]
+    core.set_storage(None)
+    core.clear()
@@ -0,0 +1,71 @@
+import asyncio
+
+from ml.llm.interfaces import LLMRole
+from ml.llm_labeler import LLMLabeler, default_prompts
+from ml.llm_labeler.core import HATE_PROMPT
+from ml.metrics import pipeline as pipeline_metrics
+from ml.prompt import YAMLPromptClient
+
+
+class FakeLLM:
+    def __init__(self):
+        self.requests = []
+
+    async def generate(self, messages, *, model=None, temperature=None, max_tokens=None):
+        self.requests.append(messages)
+        hate_type = "성별혐오" if "여자" in messages[-1].content else "없음"
+        return f"혐오표현 유형: {hate_type}\n설명: 테스트"
+
+    def get_model(self):
+        return "fake"
+
+
+def test_label_batch_with_prompt_manager():
+    """Test that a batch is labeled in order from prompts rendered by the prompt manager."""
+    llm = FakeLLM()
+    prompts = YAMLPromptClient(
+        prompts_config=[{"name": "hate", "prompt": [["system", "혐오표현을 분류하세요."], ["human", "{{text}}"]]}]
+    )
+    labeler = LLMLabeler(llm, "fake", prompts=prompts, prompt_name="hate")
+    observed = pipeline_metrics.llm_seconds.count(model="fake")
+    records = asyncio.run(labeler.label_batch([("1", "여자는 안돼"), ("2", "좋은 하루")]))
+    assert pipeline_metrics.llm_seconds.count(model="fake") == observed + 2
+
+    assert [(record["id"], record["hate"], record["hate_type"]) for record in records] == [
+        ("1", True, ["성별혐오"]),
+        ("2", False, []),
+    ]
+    assert [message.role for message in llm.requests[0]] == [LLMRole.SYSTEM, LLMRole.USER]
+    assert llm.requests[1][-1].content == "좋은 하루"
+
+    default = LLMLabeler(llm, "fake")
+    record = asyncio.run(default.label("3", "여자"))
+    assert record["hate"] and "텍스트: 여자" in llm.requests[-1][0].content
+
+
+def test_label_batch_runs_bounded_concurrent_calls_in_order():
+    """Test a batch overlaps at most `concurrency` LLM calls and keeps the input order."""
+
+    class SlowLLM(FakeLLM):
+        def __init__(self):
+            super().__init__()
+            self.active = 0
+            self.peak = 0
+
+        async def generate(self, messages, **kwargs):
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01 if "여자" in messages[-1].content else 0.03)
+            self.active -= 1
+            return await super().generate(messages, **kwargs)
+
+    llm = SlowLLM()
+    labeler = LLMLabeler(llm, "fake", prompts=default_prompts(), concurrency=3)
+    texts = ["좋은 하루", "여자는 안돼"] * 4
+    records = asyncio.run(labeler.label_batch([(str(i), text) for i, text in enumerate(texts)]))
+
+    assert llm.peak == 3
+    assert [record["id"] for record in records] == [str(i) for i in range(8)]
+    assert [record["hate"] for record in records] == [False, True] * 4
+    # The default prompt manager renders the built-in prompt unchanged
+    assert sorted(request[0].content for request in llm.requests) == sorted(HATE_PROMPT.format(text=text) for text in texts)
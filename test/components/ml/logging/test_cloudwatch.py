@@ -0,0 +1,105 @@
+from ml.logging.cloudwatch import (
+    EVENT_OVERHEAD,
+    MAX_BATCH_BYTES,
+    MAX_BATCH_EVENTS,
+    MAX_BATCH_SPAN_MS,
+    CloudWatchShipper,
+)
+
+
+class ResourceAlreadyExistsException(Exception):
+    pass
+
+
+class ThrottlingException(Exception):
+    pass
+
+
+class FakeLogsClient:
+    """In-memory stand-in for the boto3 CloudWatch Logs client."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.groups = set()
+        self.streams = set()
+        self.calls = {"create_log_group": 0, "create_log_stream": 0, "put_log_events": 0}
+        self.batches = []
+
+    def create_log_group(self, logGroupName):
+        self.calls["create_log_group"] += 1
+        if logGroupName in self.groups:
+            raise ResourceAlreadyExistsException()
+        self.groups.add(logGroupName)
+
+    def create_log_stream(self, logGroupName, logStreamName):
+        self.calls["create_log_stream"] += 1
+        if (logGroupName, logStreamName) in self.streams:
+            raise ResourceAlreadyExistsException()
+        self.streams.add((logGroupName, logStreamName))
+
+    def put_log_events(self, logGroupName, logStreamName, logEvents):
+        self.calls["put_log_events"] += 1
+        assert (logGroupName, logStreamName) in self.streams
+        if self.failures:
+            self.failures -= 1
+            raise ThrottlingException()
+        self.batches.append(logEvents)
+        return {}
+
+
+def test_batches_respect_limits():
+    """Test that events are batched within the PutLogEvents limits and the stream is created once."""
+    client = FakeLogsClient()
+    client.groups.add("ml")
+    shipper = CloudWatchShipper(client, "ml", "ingest", flush_interval=60)
+    for i in range(MAX_BATCH_EVENTS + 5):
+        shipper.put(f"line {i}", timestamp=1_700_000_000_000 + i)
+    shipper.flush()
+    big = "x" * (200 * 1024)
+    for i in range(6):
+        shipper.put(big, timestamp=1_700_000_100_000 - i)
+    shipper.close()
+
+    assert [len(batch) for batch in client.batches] == [MAX_BATCH_EVENTS, 5, 5, 1]
+    for batch in client.batches:
+        assert sum(len(event["message"].encode()) + EVENT_OVERHEAD for event in batch) <= MAX_BATCH_BYTES
+        timestamps = [event["timestamp"] for event in batch]
+        assert timestamps == sorted(timestamps)
+    assert client.calls["create_log_group"] == 1
+    assert client.calls["create_log_stream"] == 1
+    assert shipper.sent == MAX_BATCH_EVENTS + 11
+    assert not shipper.put("after close")
+
+
+def test_retries_failed_batches():
+    """Test that a failed batch is retried and counted as failed only once retries run out."""
+    client = FakeLogsClient(failures=2)
+    shipper = CloudWatchShipper(client, "ml", "label", flush_interval=60, max_retries=2, retry_backoff=0)
+    shipper.put("first")
+    shipper.flush()
+    assert client.batches == [[{"timestamp": client.batches[0][0]["timestamp"], "message": "first"}]]
+    assert (shipper.sent, shipper.failed) == (1, 0)
+
+    client.failures = 3
+    shipper.put("second")
+    shipper.close()
+    assert len(client.batches) == 1
+    assert (shipper.sent, shipper.failed) == (1, 1)
+    assert client.calls["put_log_events"] == 6
+
+
+def test_batches_span_less_than_a_day_with_out_of_order_events():
+    """Test out-of-order timestamps never put events 24 hours or more apart in one batch."""
+    client = FakeLogsClient()
+    shipper = CloudWatchShipper(client, "ml", "upload", flush_interval=60)
+    start = 1_700_000_000_000
+    hour = 60 * 60 * 1000
+    # Each event is within a day of the first one, but the first and last are 25 hours apart
+    for timestamp in (start, start - 12 * hour, start + 13 * hour):
+        shipper.put("line", timestamp=timestamp)
+    shipper.close()
+
+    assert [len(batch) for batch in client.batches] == [2, 1]
+    for batch in client.batches:
+        timestamps = [event["timestamp"] for event in batch]
+        assert max(timestamps) - min(timestamps) < MAX_BATCH_SPAN_MS
@@ -0,0 +1,92 @@
+import json
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+from ml.logging import JsonFormatter, RateLimitFilter, StructuredQueueHandler, configure_logging
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def test_structured_queue_logging():
+    """Test that records pass through the queue as JSON and per-call-site lines are rate limited."""
+    sink = ListHandler()
+    sink.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = QueueHandler(log_queue)
+    handler.addFilter(RateLimitFilter(rate=0.001, burst=2))
+    listener = QueueListener(log_queue, sink)
+    logger = logging.getLogger("test.structured")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        for i in range(5):
+            logger.info("Collected post %d", i, extra={"gallery": "test"})
+        logger.warning("Request failed")
+        logger.info("Finished")
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+
+    entries = [json.loads(line) for line in sink.lines]
+    assert [entry["message"] for entry in entries] == [
+        "Collected post 0",
+        "Collected post 1",
+        "Request failed",
+        "Finished",
+    ]
+    assert entries[0]["level"] == "INFO"
+    assert entries[0]["logger"] == "test.structured"
+    assert entries[0]["gallery"] == "test"
+
+
+def test_rate_limit_reports_suppressed():
+    """Test that the first record passed after a drop carries the suppressed count."""
+    rate_limit = RateLimitFilter(rate=1000, burst=1)
+    records = [logging.LogRecord("test", logging.INFO, __file__, 0, "line %d", (i,), None) for i in range(3)]
+    assert rate_limit.filter(records[0])
+    assert not rate_limit.filter(records[1])
+    rate_limit._buckets[("test", "line %d")][0] = 1
+    assert rate_limit.filter(records[2])
+    assert records[2].suppressed == 1
+
+
+def test_structured_queue_keeps_exc_info():
+    """Test a logged exception reaches the JSON line as exc_info, not folded into the message."""
+    sink = ListHandler()
+    sink.setFormatter(JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue)
+    listener = QueueListener(log_queue, sink)
+    logger = logging.getLogger("test.structured.exc")
+    logger.propagate = False
+    logger.addHandler(handler)
+    listener.start()
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Stage %s failed", "label")
+    finally:
+        listener.stop()
+        logger.removeHandler(handler)
+
+    entry = json.loads(sink.lines[0])
+    assert entry["message"] == "Stage label failed"
+    assert entry["exc_info"].startswith("Traceback") and "ValueError: boom" in entry["exc_info"]
+
+
+def test_structured_mode_warns_when_not_installed(caplog):
+    """Test structured mode says so when existing root handlers keep it from being installed."""
+    with caplog.at_level(logging.WARNING):
+        configure_logging("structured")
+    assert "Structured logging not installed" in caplog.text
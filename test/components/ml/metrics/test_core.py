@@ -0,0 +1,72 @@
+from ml.metrics import Registry
+
+
+def test_render_and_textfile(tmp_path):
+    """Test the Prometheus text output of each metric type and the atomic textfile write."""
+    registry = Registry()
+    records = registry.counter("records_total", "Records", ("stage",))
+    depth = registry.gauge("queue_depth", "Queue depth")
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    records.inc(stage="clean")
+    records.inc(2, stage="clean")
+    depth.set(5)
+    depth.dec()
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert registry.counter("records_total", "Records", ("stage",)) is records
+    text = registry.render()
+    assert text.splitlines() == [
+        "# HELP records_total Records",
+        "# TYPE records_total counter",
+        'records_total{stage="clean"} 3',
+        "# HELP queue_depth Queue depth",
+        "# TYPE queue_depth gauge",
+        "queue_depth 4",
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 3.65",
+        "latency_seconds_count 4",
+    ]
+
+    path = tmp_path / "textfile" / "job.prom"
+    registry.write_textfile(path)
+    assert path.read_text() == text
+
+
+
+def test_samples_are_a_consistent_snapshot():
+    """Test observations made while samples are rendered do not leak into that rendering."""
+    registry = Registry()
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(1.0,))
+    latency.observe(0.5)
+
+    samples = latency.samples()
+    first = next(samples)
+    latency.observe(2.0)
+    latency.observe(0.5)
+    assert [first, *samples] == [
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+    ]
+
+
+def test_render_tolerates_concurrent_registration():
+    """Test a metric registered while /metrics renders does not break the render."""
+    registry = Registry()
+    first = registry.counter("first_total", "Registered up front")
+    render_first = first.render
+
+    def render_and_register() -> str:
+        registry.counter("late_total", "Registered during a render")
+        return render_first()
+
+    first.render = render_and_register
+    first.inc()
+    assert "first_total 1" in registry.render()
+    assert "# TYPE late_total counter" in registry.render()
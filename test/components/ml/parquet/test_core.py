@@ -0,0 +1,28 @@
+import json
+
+import pyarrow.dataset as ds
+
+from ml.extractor.schema import ClassifiedRecord
+from ml.parquet import core
+
+
+def test_convert_and_read_layer(tmp_path):
+    """Test JSONL partitions convert to Parquet and read back with projection and pushdown."""
+    for dt, scores in {"2026-01-01": [0.1, 0.9], "2026-01-02": [0.7]}.items():
+        part = tmp_path / f"dt={dt}" / "part-0001.jsonl"
+        part.parent.mkdir(parents=True)
+        with part.open("w", encoding="utf-8") as f:
+            for i, score in enumerate(scores):
+                record = {"id": f"{dt}_{i}", "text": "텍스트", "score": score, "label": "hate", "model": "m"}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    assert core.convert_layer(tmp_path, ClassifiedRecord) == 2
+    assert core.convert_layer(tmp_path, ClassifiedRecord) == 0
+
+    table = core.read_layer(tmp_path, columns=["dt", "score"], filter=ds.field("score") >= 0.5)
+
+    assert table.column_names == ["dt", "score"]
+    assert sorted(table.to_pylist(), key=lambda r: r["dt"]) == [
+        {"dt": "2026-01-01", "score": 0.9},
+        {"dt": "2026-01-02", "score": 0.7},
+    ]
@@ -0,0 +1,57 @@
+import random
+import re
+
+from ml.labeler.parser import parse_label_response
+from ml.llm_labeler.core import parse_label_response as parse_llm_label_response
+from ml.parser import parse_label
+
+
+def regex_parse_label_response(response: str) -> dict | None:
+    """The multi-search parser the single-pass one replaces, kept as the reference."""
+    type_match = re.search(r"혐오표현 유형:\s*([^\n]+)", response)
+    if not type_match:
+        return None
+
+    desc_match = re.search(r"설명:\s*([^\n]+(?:\n[^\n]+)*)", response)
+    nuance_match = re.search(r"뉘앙스:\s*([^\n]+)", response)
+    level_match = re.search(r"혐오 수준:\s*([^\n]+)", response)
+    reason_match = re.search(r"이유:\s*([^\n]+(?:\n[^\n]+)*)", response)
+
+    result = {
+        "type": type_match.group(1).strip(),
+        "description": desc_match.group(1).strip() if desc_match else "",
+    }
+    if nuance_match or level_match:
+        result.update({
+            "nuance": nuance_match.group(1).strip() if nuance_match else None,
+            "hate_level": level_match.group(1).strip() if level_match else None,
+            "reason": reason_match.group(1).strip() if reason_match else None,
+        })
+    return result
+
+
+FRAGMENTS = [
+    "혐오표현 유형:", "설명:", "뉘앙스:", "혐오 수준:", "이유:", "혐오표현 유형", "설명", ":",
+    "성별혐오", "없음", "높음", "조롱", "텍스트", "a", "b c",
+    " ", "  ", "\n", "\n\n", "\t", "\r\n", "　", "\x0b",
+]
+
+
+def test_matches_regex_parser_on_fuzzed_responses():
+    """Test the single-pass parser against the regex parser on random label-heavy responses."""
+    rng = random.Random(50)
+    for _ in range(20_000):
+        response = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30)))
+        expected = regex_parse_label_response(response)
+        assert parse_label_response(response) == expected, repr(response)
+        llm_expected = None if expected is None else {"type": expected["type"], "description": expected["description"]}
+        assert parse_llm_label_response(response) == llm_expected, repr(response)
+
+
+def test_parse_label_fields():
+    response = "혐오표현 유형: 성별혐오\n설명: 여성을 비하함\n여러 줄\n\n뉘앙스: 조롱\n혐오 수준: 높음\n이유: 비하 표현"
+    parsed = parse_label(response)
+    assert parsed.type == "성별혐오"
+    assert parsed.description == "여성을 비하함\n여러 줄"
+    assert (parsed.nuance, parsed.hate_level, parsed.reason) == ("조롱", "높음", "비하 표현")
+    assert parse_label("설명: 없음") is None
@@ -0,0 +1,49 @@
+import time
+
+from langfuse.api import TextPrompt
+
+from ml.config import BaseConfig
+from ml.prompt import LangfusePromptClient, YAMLPromptClient
+
+
+class FakeLangfuse:
+    """Stand-in for the Langfuse client serving versioned text prompts."""
+
+    def __init__(self):
+        self.template = "v1 {text}"
+        self.calls = []
+
+    def get_prompt(self, name, version=None, label=None, cache_ttl_seconds=None):
+        self.calls.append((name, version, label, cache_ttl_seconds))
+        return TextPrompt(name=name, version=1, prompt=self.template, config={}, labels=[], tags=[])
+
+
+def test_yaml_templates_are_compiled_once():
+    """Test that invoke reuses the compiled template instead of resolving the prompt again."""
+    client = YAMLPromptClient(prompts_config=[{"name": "classify", "prompt": "Classify {text}"}])
+    calls = []
+    get_prompt = client.get_prompt
+    object.__setattr__(client, "get_prompt", lambda **kwargs: calls.append(kwargs) or get_prompt(**kwargs))
+
+    for text in ("a", "b"):
+        result = client.invoke({"prompt_name": "classify", "text": text})
+        assert result.to_string() == f"Classify {text}"
+    assert len(calls) == 1
+
+
+def test_langfuse_stale_while_revalidate():
+    """Test that a stale template is served while a background refresh bypasses the client cache."""
+    fake = FakeLangfuse()
+    client = LangfusePromptClient(config=BaseConfig({}), client=fake, cache_ttl_seconds=1)
+    assert client.invoke({"prompt_name": "classify", "text": "x"}).to_string() == "v1 x"
+
+    fake.template = "v2 {text}"
+    time.sleep(1.05)
+    # Stale: still the old template while the refresh runs
+    assert client.invoke({"prompt_name": "classify", "text": "x"}).to_string() == "v1 x"
+    deadline = time.monotonic() + 2
+    while client.get_template("classify").invoke({"text": "x"}).to_string() != "v2 x":
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert fake.calls[0] == ("classify", None, None, 1)
+    assert fake.calls[1] == ("classify", None, None, 0)
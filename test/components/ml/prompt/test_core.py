@@ -0,0 +1,27 @@
+import pytest
+
+from ml.prompt import YAMLPromptClient
+
+
+def test_render_batch():
+    """Test that a batch is rendered from one compiled template and validated up front."""
+    client = YAMLPromptClient(
+        prompts_config=[
+            {"name": "text", "prompt": "Classify {text}"},
+            {"name": "chat", "prompt": [["system", "You label posts."], ["human", "Post: {{text}}"]]},
+        ]
+    )
+    values = client.render_batch([{"text": "a"}, {"text": "b"}], name="text")
+    assert [value.to_string() for value in values] == ["Classify a", "Classify b"]
+
+    messages = client.render_batch([{"text": "a"}], name="chat")[0].to_messages()
+    assert [(message.type, message.content) for message in messages] == [
+        ("system", "You label posts."),
+        ("human", "Post: a"),
+    ]
+
+    assert client.render_batch([], name="text") == []
+    with pytest.raises(ValueError, match="text"):
+        client.render_batch([{"text": "a"}, {"title": "b"}], name="text")
+    with pytest.raises(ValueError, match="unsupported variables: \\['title'\\]"):
+        client.render_batch([{"text": "a", "title": "b"}], name="chat")
@@ -0,0 +1,34 @@
+import asyncio
+
+from ml.stream.core import Pipeline, Stage
+
+
+def test_pipeline_streams_through_stages():
+    """Test records flow through every stage, dropped records stop early and stats are counted."""
+    seen = []
+
+    async def double(x):
+        await asyncio.sleep(0)
+        return x * 2
+
+    async def keep_multiples_of_four(x):
+        return x if x % 4 == 0 else None
+
+    async def sink(x):
+        seen.append(x)
+
+    async def source():
+        for i in range(20):
+            yield i
+
+    pipeline = Pipeline(
+        [Stage("double", double, concurrency=3), Stage("filter", keep_multiples_of_four), Stage("sink", sink, concurrency=2)],
+        maxsize=2,
+    )
+    asyncio.run(pipeline.run(source()))
+
+    assert sorted(seen) == [x * 2 for x in range(20) if (x * 2) % 4 == 0]
+    stats = pipeline.stats()
+    assert stats["double"]["processed"] == 20
+    assert stats["filter"]["emitted"] == 10
+    assert stats["sink"]["queue_depth"] == 0
@@ -0,0 +1,15 @@
+import pytest
+
+from ml.utils.dates import date_range
+
+
+def test_date_range_is_inclusive_across_months():
+    """Test the range includes both ends and crosses month boundaries."""
+    assert date_range("2024-02-28", "2024-03-01") == ["2024-02-28", "2024-02-29", "2024-03-01"]
+    assert date_range("2024-05-01", "2024-05-01") == ["2024-05-01"]
+
+
+def test_date_range_rejects_reversed_dates():
+    """Test an end date before the start date is an error."""
+    with pytest.raises(ValueError):
+        date_range("2024-05-02", "2024-05-01")